@@ -0,0 +1,58 @@
+from pathlib import Path
+import csv
+from constants import SCEN_START, TIME_FMT
+from datetime import timedelta
+from deployment import Tranche, load_schedule, simulate_deployment
+from scenario import Scenario
+
+BASE_DIR = Path(r"D:\PierSight_Maritime_Study")
+DATA_DIR = BASE_DIR / "32sat_data"
+
+N_SATS = 32
+
+SCENARIO = Scenario.walker(DATA_DIR, N_SATS)
+
+# Optional schedule file in the data directory (tranche, activate_utc,
+# satellites); without it, four launches of 8 satellites, 6 h apart.
+SCHEDULE_FILE = "Deployment_Schedule.csv"
+DEFAULT_SCHEDULE = [
+    Tranche(f"Launch {i + 1}", i * 6 * 3600.0, tuple(range(8 * i, 8 * i + 8)))
+    for i in range(4)
+]
+
+# Width of the time bins reported within each tranche period (s).
+STEP_S = 3 * 3600.0
+
+
+def run_deployment_32sat(scenario: Scenario = SCENARIO):
+    """
+    Revisit, detection- and delivery-latency curves as the 32-sat Walker
+    is built up tranche by tranche.
+    """
+    schedule_path = scenario.data_dir / SCHEDULE_FILE
+    schedule = load_schedule(schedule_path, scenario.n_sats) if schedule_path.exists() else DEFAULT_SCHEDULE
+
+    rows = simulate_deployment(scenario, schedule, step_s=STEP_S)
+
+    print("=== Phased deployment (32-sat Walker) ===")
+    for row in rows:
+        t0 = SCEN_START + timedelta(seconds=row["t_start_s"])
+        print(
+            f"{t0.strftime(TIME_FMT)[:-7]}  {row['tranche']:<10} "
+            f"{row['n_active']:2d} sats | "
+            f"West p95 revisit {row['EEZ_West_p95_revisit_s']:7.1f} s, "
+            f"East p95 revisit {row['EEZ_East_p95_revisit_s']:7.1f} s, "
+            f"mean delivery {row['mean_delivery_latency_s']:7.1f} s"
+        )
+
+    out_path = scenario.data_dir / "Deployment_32sat.csv"
+    with out_path.open("w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+        writer.writeheader()
+        for row in rows:
+            writer.writerow(row)
+    print(f"\n32-sat deployment curves saved to: {out_path}")
+
+
+if __name__ == "__main__":
+    run_deployment_32sat()
@@ -0,0 +1,76 @@
+from pathlib import Path
+import csv
+from outage import enumerate_outages, rank_outages
+from scenario import Scenario
+
+BASE_DIR = Path(r"D:\PierSight_Maritime_Study")
+DATA_DIR = BASE_DIR / "32sat_data"
+
+N_SATS = 32
+MAX_FAILED = 2
+TOP_N = 5
+
+SCENARIO = Scenario.walker(DATA_DIR, N_SATS)
+
+FIELDS = [
+    "eez",
+    "n_failed",
+    "failed",
+    "coverage_fraction",
+    "mean_revisit_s",
+    "p95_revisit_s",
+    "max_revisit_s",
+    "mean_detect_latency_s",
+    "p95_detect_latency_s",
+    "p_detect_over_10min",
+    "d_p95_revisit_s",
+    "d_max_revisit_s",
+    "d_mean_detect_latency_s",
+    "d_p_detect_over_10min",
+]
+
+
+def compute_outages(eez_name: str, scenario: Scenario = SCENARIO):
+    """
+    Revisit and detection-latency impact of every N-1 and N-2 satellite
+    failure for one EEZ, ranked by the increase in p95 revisit.
+    """
+    rows = enumerate_outages(scenario.eez_passes(eez_name), MAX_FAILED)
+    for row in rows:
+        row["eez"] = eez_name
+
+    base = rows[0]
+    print(f"=== {eez_name} outage analysis ({scenario.label} Walker) ===")
+    print(f"Full constellation p95 revisit (s): {base['p95_revisit_s']:.1f}")
+
+    for n_failed in range(1, MAX_FAILED + 1):
+        print(f"Most critical N-{n_failed} cases:")
+        for row in rank_outages(rows, "p95_revisit_s", n_failed)[:TOP_N]:
+            sats = ", ".join(str(s) for s in row["failed"])
+            print(
+                f"  sat {sats:<8} p95 revisit {row['p95_revisit_s']:7.1f} s "
+                f"(+{row['d_p95_revisit_s']:.1f}), max {row['max_revisit_s']:7.1f} s, "
+                f"P(latency > 10 min) {row['p_detect_over_10min']:.3f}"
+            )
+
+    return rows
+
+
+def run_outage_32sat(scenario: Scenario = SCENARIO):
+    results = []
+    for eez_name in ["EEZ_West", "EEZ_East"]:
+        results.extend(compute_outages(eez_name, scenario))
+
+    out_path = scenario.data_dir / "Outage_32sat.csv"
+    with out_path.open("w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDS, extrasaction="ignore")
+        writer.writeheader()
+        for row in results:
+            writer.writerow(
+                dict(row, failed=" ".join(str(s) for s in row["failed"]))
+            )
+    print(f"\n32-sat outage stats saved to: {out_path}")
+
+
+if __name__ == "__main__":
+    run_outage_32sat()
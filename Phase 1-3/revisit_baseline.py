@@ -1,43 +1,49 @@
 from pathlib import Path
 import csv
-from parsers import parse_blocked_access
+from streaming import eez_coverage
+from revisit import detection_latency_distribution, gap_stats
+from constants import DETECT_LATENCY_THRESHOLD_S
+from scenario import Scenario
 
 BASE_DIR = Path(r"D:\PierSight_Maritime_Study")
 DATA_DIR = BASE_DIR / "data"
 
 N_SATS = 6
 
+SCENARIO = Scenario.baseline(DATA_DIR, N_SATS)
 
-def compute_revisit_from_csv(eez_name: str, csv_file: Path):
+
+def compute_revisit_from_csv(eez_name: str, scenario: Scenario = SCENARIO,
+                             stream: bool = False):
     """
     Compute revisit statistics for an EEZ from its EEZ–All Satellite CSV.
 
     Approach:
-      - Parse all access intervals for all 6 satellites.
-      - Merge into a single list sorted by start time.
+      - Take the access intervals for all 6 satellites (stream=True reads
+        an oversized CSV chunk by chunk instead of through the scenario).
+      - Merge them into a coverage union.
       - Gaps between successive intervals (prev.stop -> next.start) are revisit times.
     Returns dict with mean, median, p95, max gap (seconds).
     """
-    entries = parse_blocked_access(csv_file, n_blocks=N_SATS)
+    coverage = eez_coverage(scenario, eez_name, stream)
 
-    if not entries:
-        print(f"No entries found in {csv_file}")
+    if coverage.n_passes == 0:
+        print(f"No entries found in {scenario.eez_file(eez_name)}")
         return None
 
-    # Sort by start time
-    entries_sorted = sorted(entries, key=lambda x: x["start_s"])
+    # Gaps between merged coverage intervals (only positive gaps)
+    stats = gap_stats(coverage.gaps(), n_passes=coverage.n_passes)
 
-    # Compute gaps between consecutive intervals (only positive gaps)
-    gaps = []
-    prev_stop = entries_sorted[0]["stop_s"]
-    for e in entries_sorted[1:]:
-        gap = e["start_s"] - prev_stop
-        if gap > 0:
-            gaps.append(gap)
-        # update prev_stop to the later of the two stops to handle overlaps
-        prev_stop = max(prev_stop, e["stop_s"])
+    # Detection latency for an entry time uniform over the scenario, so
+    # entries before the first pass and after the last one count too.
+    latency = detection_latency_distribution(
+        coverage.start_s, coverage.stop_s, *scenario.horizon
+    )
+    mean_latency = latency.mean_s
+    p95_latency = float(latency.percentile(95))
+    p_over = float(latency.sf(DETECT_LATENCY_THRESHOLD_S))
 
-    if not gaps:
+    if stats.n_gaps == 0:
         print(f"No positive gaps (continuous coverage) for {eez_name}")
         return {
             "eez": eez_name,
@@ -45,25 +51,24 @@ def compute_revisit_from_csv(eez_name: str, csv_file: Path):
             "median_revisit_s": 0.0,
             "p95_revisit_s": 0.0,
             "max_revisit_s": 0.0,
+            "mean_detect_latency_s": mean_latency,
+            "p95_detect_latency_s": p95_latency,
+            "p_detect_over_10min": p_over,
         }
 
-    gaps_sorted = sorted(gaps)
-    n = len(gaps_sorted)
-
-    def percentile(p):
-        idx = int(round((p / 100.0) * (n - 1)))
-        return gaps_sorted[idx]
-
-    mean_gap = sum(gaps_sorted) / n
-    median_gap = percentile(50)
-    p95_gap = percentile(95)
-    max_gap = max(gaps_sorted)
+    mean_gap = stats.mean_s
+    median_gap = stats.percentile(50)
+    p95_gap = stats.percentile(95)
+    max_gap = stats.max_s
 
     print(f"=== {eez_name} revisit stats (6-sat baseline) ===")
     print(f"Mean gap   (s): {mean_gap:.1f}")
     print(f"Median gap (s): {median_gap:.1f}")
     print(f"95% gap    (s): {p95_gap:.1f}")
     print(f"Max gap    (s): {max_gap:.1f}")
+    print(f"Mean detection latency (s): {mean_latency:.1f}")
+    print(f"95% detection latency  (s): {p95_latency:.1f}")
+    print(f"P(detection latency > 10 min): {p_over:.3f}")
 
     return {
         "eez": eez_name,
@@ -71,28 +76,28 @@ def compute_revisit_from_csv(eez_name: str, csv_file: Path):
         "median_revisit_s": median_gap,
         "p95_revisit_s": p95_gap,
         "max_revisit_s": max_gap,
+        "mean_detect_latency_s": mean_latency,
+        "p95_detect_latency_s": p95_latency,
+        "p_detect_over_10min": p_over,
     }
 
 
-def run_revisit_baseline():
+def run_revisit_baseline(scenario: Scenario = SCENARIO, stream: bool = False):
     """
     Compute revisit statistics for EEZ_West and EEZ_East
     and save to Baseline_Revisit.csv
     """
     results = []
 
-    west_file = DATA_DIR / "Acces_EEZ_West_All Satellite.csv"
-    east_file = DATA_DIR / "Acces_EEZ_East_All Satellite.csv"
-
-    west_stats = compute_revisit_from_csv("EEZ_West", west_file)
+    west_stats = compute_revisit_from_csv("EEZ_West", scenario, stream)
     if west_stats:
         results.append(west_stats)
 
-    east_stats = compute_revisit_from_csv("EEZ_East", east_file)
+    east_stats = compute_revisit_from_csv("EEZ_East", scenario, stream)
     if east_stats:
         results.append(east_stats)
 
-    out_path = DATA_DIR / "Baseline_Revisit.csv"
+    out_path = scenario.data_dir / "Baseline_Revisit.csv"
     if results:
         with out_path.open("w", newline="") as f:
             writer = csv.DictWriter(
@@ -103,6 +108,9 @@ def run_revisit_baseline():
                     "median_revisit_s",
                     "p95_revisit_s",
                     "max_revisit_s",
+                    "mean_detect_latency_s",
+                    "p95_detect_latency_s",
+                    "p_detect_over_10min",
                 ],
             )
             writer.writeheader()
@@ -0,0 +1,88 @@
+from pathlib import Path
+import csv
+import numpy as np
+from ingest import load_scenario_dir
+from revisit import revisit_profile, time_of_day_profile
+
+BASE_DIR = Path(r"D:\PierSight_Maritime_Study")
+# Directory holding the STK exports of every constellation (6/12/32-sat)
+DATA_DIR = BASE_DIR / "data" / "STK Exports"
+
+# Rolling windows (s) and the width of the time-of-day slots (s)
+WINDOWS_S = [3600.0, 6 * 3600.0]
+TIME_OF_DAY_BIN_S = 3600.0
+
+FIELDS = [
+    "constellation",
+    "eez",
+    "profile",
+    "window_s",
+    "t_s",
+    "n_gaps",
+    "mean_gap_s",
+    "max_gap_s",
+    "coverage_fraction",
+]
+
+
+def profile_rows(constellation: str, eez_name: str, profile_name: str, profile):
+    for i in range(len(profile)):
+        yield {
+            "constellation": constellation,
+            "eez": eez_name,
+            "profile": profile_name,
+            "window_s": profile.window_s,
+            "t_s": profile.t_s[i],
+            "n_gaps": int(profile.n_gaps[i]),
+            "mean_gap_s": profile.mean_gap_s[i],
+            "max_gap_s": profile.max_gap_s[i],
+            "coverage_fraction": profile.coverage_fraction[i],
+        }
+
+
+def run_revisit_profiles(data_dir: Path = DATA_DIR):
+    """
+    Rolling-window and time-of-day revisit profiles for every EEZ of every
+    constellation found in data_dir, in one run.
+    """
+    bundle = load_scenario_dir(data_dir)
+    rows = []
+
+    for label, scenario in bundle:
+        for eez_name in scenario.eez_files:
+            passes = scenario.eez_passes(eez_name)
+            print(f"=== {eez_name} revisit profile ({scenario.label}) ===")
+
+            for window_s in WINDOWS_S:
+                profile = revisit_profile(passes.start_s, passes.stop_s, window_s)
+                rows.extend(profile_rows(label, eez_name, "rolling", profile))
+                if len(profile):
+                    worst = int(np.argmax(profile.max_gap_s))
+                    print(
+                        f"{window_s / 3600:.0f} h windows: worst max gap "
+                        f"{profile.max_gap_s[worst]:.1f} s in window starting at "
+                        f"{profile.t_s[worst]:.0f} s"
+                    )
+
+            tod = time_of_day_profile(passes.start_s, passes.stop_s, TIME_OF_DAY_BIN_S)
+            rows.extend(profile_rows(label, eez_name, "time_of_day", tod))
+            worst = int(np.argmax(tod.max_gap_s))
+            print(
+                f"Time of day: worst hour {tod.t_s[worst] / 3600:02.0f}:00 UTC, "
+                f"max gap {tod.max_gap_s[worst]:.1f} s"
+            )
+
+    out_path = Path(data_dir) / "Revisit_Profiles.csv"
+    if rows:
+        with out_path.open("w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=FIELDS)
+            writer.writeheader()
+            for row in rows:
+                writer.writerow(row)
+        print(f"\nRevisit profiles saved to: {out_path}")
+    else:
+        print("No EEZ exports found; Revisit_Profiles.csv not written.")
+
+
+if __name__ == "__main__":
+    run_revisit_profiles()
@@ -0,0 +1,49 @@
+from pathlib import Path
+import csv
+from selection import OBJECTIVES, select_subsets
+from scenario import Scenario
+
+BASE_DIR = Path(r"D:\PierSight_Maritime_Study")
+DATA_DIR = BASE_DIR / "32sat_data"
+
+N_SATS = 32
+
+SCENARIO = Scenario.walker(DATA_DIR, N_SATS)
+
+
+def compute_pareto(objective: str, scenario: Scenario = SCENARIO):
+    """
+    Best K-satellite subset of the 32-sat Walker export for every K,
+    minimising the worst of EEZ_West / EEZ_East on one objective.
+    """
+    tables = {eez: scenario.eez_passes(eez) for eez in ["EEZ_West", "EEZ_East"]}
+    rows = select_subsets(tables, objective)
+
+    print(f"=== Best K-satellite subsets by {objective} (32-sat Walker) ===")
+    for row in rows:
+        if not row["pareto"]:
+            continue
+        flag = "" if row["exact"] else " (heuristic)"
+        print(f"K = {row['k']:2d}: {row['value']:9.1f} s{flag}")
+
+    return rows
+
+
+def run_subset_selection_32sat(scenario: Scenario = SCENARIO):
+    results = []
+    for objective in OBJECTIVES:
+        results.extend(compute_pareto(objective, scenario))
+
+    out_path = scenario.data_dir / "Subset_Pareto_32sat.csv"
+    with out_path.open("w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=list(results[0]))
+        writer.writeheader()
+        for row in results:
+            writer.writerow(
+                dict(row, satellites=" ".join(str(s) for s in row["satellites"]))
+            )
+    print(f"\n32-sat subset Pareto curves saved to: {out_path}")
+
+
+if __name__ == "__main__":
+    run_subset_selection_32sat()
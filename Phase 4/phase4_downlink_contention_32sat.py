@@ -0,0 +1,77 @@
+"""Phase 4: 32-sat ground-station contention (delivery latency under load)"""
+from pathlib import Path
+import csv
+from typing import List, Dict
+import numpy as np
+from scenario import Scenario
+from downlink_sim import simulate_downlink, sample_detections
+from phase4_sensor_params import DEFAULT_SENSOR
+
+BASE_DIR = Path(r"D:\PierSight_Maritime_Study")
+DATA_DIR_32 = BASE_DIR / "32sat_data"
+PHASE4_DIR = BASE_DIR / "phase4_analysis"
+PHASE4_DIR.mkdir(exist_ok=True)
+
+N_SATS = 32
+
+SCENARIO = Scenario.walker(DATA_DIR_32, N_SATS)
+
+# Detections per day per EEZ, spread over the EEZ passes.
+LOADS = [10, 100, 1000, 10000]
+SEED = 42
+
+def sample_mode_detections(mode: str, n_per_eez: int, sensor, scenario: Scenario = SCENARIO):
+    """Synthetic detections of one mode in every EEZ, merged in time order."""
+    delay = sensor.sar_processing_delay_s * (0.8 if mode == "TRACKING" else 1.0)
+    t, sat = [], []
+    for i, eez_name in enumerate(sorted(scenario.eez_files)):
+        t_e, sat_e = sample_detections(scenario.eez_passes(eez_name), n_per_eez, delay, SEED + i)
+        t.append(t_e)
+        sat.append(sat_e)
+    t, sat = np.concatenate(t), np.concatenate(sat)
+    order = np.argsort(t, kind="stable")
+    return t[order], sat[order]
+
+def run_downlink_contention_32sat(scenario: Scenario = SCENARIO) -> List[Dict]:
+    """Delivery latency with one antenna per station vs. no contention."""
+    sensor = DEFAULT_SENSOR
+    downlinks = scenario.downlink_index()
+    unlimited = {station: 10**6 for station in downlinks.stations}
+    results = []
+
+    for mode, params in sensor.modes.items():
+        volume = params["data_volume_per_pass_gb"]
+        for n in LOADS:
+            t_det, sat = sample_mode_detections(mode, n, sensor, scenario)
+            sim = simulate_downlink(downlinks, t_det, sat, volume)
+            free = simulate_downlink(downlinks, t_det, sat, volume, antennas=unlimited)
+            p50, p95 = sim.percentile([50, 95])
+            free_p50, free_p95 = free.percentile([50, 95])
+            lat = sim.latency_s[sim.delivered]
+            row = {
+                'mode': mode,
+                'detections': len(t_det),
+                'volume_gb': volume,
+                'delivered_fraction': float(sim.delivered.mean()),
+                'mean_delivery_latency_s': float(lat.mean()) if len(lat) else None,
+                'p50_delivery_latency_s': float(p50),
+                'p95_delivery_latency_s': float(p95),
+                'max_delivery_latency_s': float(lat.max()) if len(lat) else None,
+                'p50_no_contention_s': float(free_p50),
+                'p95_no_contention_s': float(free_p95),
+            }
+            for station, busy in sim.busy_s.items():
+                row[f'{station}_busy_s'] = busy
+            results.append(row)
+
+    out_path = PHASE4_DIR / "Phase4_Downlink_Contention_32sat.csv"
+    with out_path.open("w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=list(results[0].keys()))
+        writer.writeheader()
+        for row in results:
+            writer.writerow(row)
+
+    return results
+
+if __name__ == "__main__":
+    results = run_downlink_contention_32sat()
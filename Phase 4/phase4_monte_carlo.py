@@ -0,0 +1,117 @@
+"""Phase 4: Monte Carlo detection with per-pass Pd (6/12/32-sat)"""
+from pathlib import Path
+import csv
+from typing import List, Dict
+import numpy as np
+from scenario import Scenario
+from monte_carlo import detection_trials, seed_streams
+from phase4_sensor_params import DEFAULT_SENSOR
+
+BASE_DIR = Path(r"D:\PierSight_Maritime_Study")
+PHASE4_DIR = BASE_DIR / "phase4_analysis"
+PHASE4_DIR.mkdir(exist_ok=True)
+
+SCENARIOS = {
+    "6sat": Scenario.baseline(BASE_DIR / "data", 6),
+    "12sat": Scenario.walker(BASE_DIR / "12sat_data", 12),
+    "32sat": Scenario.walker(BASE_DIR / "32sat_data", 32),
+}
+
+# Constellations that route products over inter-satellite links and so
+# deliver on the next downlink of any satellite; the others deliver
+# through the detecting satellite, as in the deterministic Phase 4 runs.
+ISL_CONSTELLATIONS = {"32sat"}
+
+SHIPS = [("Ship1", "EEZ_West"), ("Ship3", "EEZ_West"), ("Ship2", "EEZ_East")]
+
+N_TRIALS = 10**6
+SEED = 2026
+
+# RCS at which a dark ship is detected with pd_nominal; smaller ships scale down.
+REFERENCE_RCS_M2 = 100.0
+
+def ship_on_known_route(ship_id: str) -> bool:
+    return ship_id in ["Ship1", "Ship2"]
+
+def pass_detection_prob(ship_id: str, mode: str, sensor) -> float:
+    """Pd of one pass: the mode's Pd on known routes, RCS-scaled pd_nominal for dark ships."""
+    if ship_on_known_route(ship_id):
+        return sensor.get_detection_prob(mode)
+    return sensor.pd_nominal * min(1.0, sensor.dark_ship_rcs_m2 / REFERENCE_RCS_M2)
+
+def run_monte_carlo(scenarios: Dict[str, Scenario] = SCENARIOS,
+                    n_trials: int = N_TRIALS, seed: int = SEED) -> List[Dict]:
+    """Miss rate and detection / total latency distributions per ship and mode."""
+    sensor = DEFAULT_SENSOR
+    cases = [
+        (label, ship_id, eez_name, mode)
+        for label in scenarios
+        for ship_id, eez_name in SHIPS
+        for mode in sensor.modes
+    ]
+    streams = seed_streams(seed, len(cases))
+    results = []
+
+    for (label, ship_id, eez_name, mode), rng in zip(cases, streams):
+        scenario = scenarios[label]
+        ship_ints = scenario.ship_intervals(ship_id, eez_name)
+        if not ship_ints:
+            continue
+        t_in, t_out = ship_ints[0]["start_s"], ship_ints[0]["stop_s"]
+
+        # Same pass rules as the deterministic Phase 4 detect functions.
+        delay = sensor.sar_processing_delay_s
+        sats = None
+        if mode == "TRACKING":
+            if ship_on_known_route(ship_id):
+                delay *= 0.8
+            else:
+                sats = range(0, scenario.n_sats, 3)
+
+        pd = pass_detection_prob(ship_id, mode, sensor)
+        trials = detection_trials(scenario.eez_passes(eez_name), t_in, t_out, pd,
+                                  n_trials, rng, sats)
+
+        # Delivery looked up once per candidate pass.
+        t_det = trials.t_image + delay
+        dl = scenario.downlink_index()
+        sat_block = None if label in ISL_CONSTELLATIONS else trials.sat_block
+        pos = dl.earliest_after_many(t_det, sat_block=sat_block)
+        t_down = np.where(pos >= 0, dl.g_start[np.maximum(pos, 0)], np.nan)
+        per_pass_total = np.append(t_down - t_in, np.nan)
+
+        detect = trials.times(delay)[trials.detected] - t_in
+        total = per_pass_total[trials.pass_idx]
+        total = total[~np.isnan(total)]
+        row = {
+            'constellation': label,
+            'ship_id': ship_id,
+            'eez': eez_name,
+            'mode': mode,
+            'pd_per_pass': pd,
+            'candidate_passes': len(trials.t_image),
+            'trials': n_trials,
+            'miss_rate': trials.miss_rate,
+            'exact_miss_rate': float(1.0 - trials.p_first.sum()),
+            'deterministic_detect_latency_s': float(t_det[0] - t_in) if len(t_det) else None,
+        }
+        for name, values in (('detect', detect), ('total', total)):
+            p50, p95 = np.percentile(values, [50, 95]) if len(values) else (None, None)
+            row.update({
+                f'mean_{name}_latency_s': float(values.mean()) if len(values) else None,
+                f'p50_{name}_latency_s': p50,
+                f'p95_{name}_latency_s': p95,
+            })
+        results.append(row)
+
+    out_path = PHASE4_DIR / "Phase4_Monte_Carlo_Detection.csv"
+    with out_path.open("w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=list(results[0].keys()))
+        writer.writeheader()
+        for row in results:
+            writer.writerow(row)
+
+    return results
+
+if __name__ == "__main__":
+    results = run_monte_carlo()
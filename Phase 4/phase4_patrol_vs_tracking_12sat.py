@@ -6,12 +6,8 @@ Compares operational surveillance modes (patrol vs tracking) for maritime SAR co
 from pathlib import Path
 import csv
 from typing import List, Dict, Tuple, Optional
-from parsers import (
-    parse_ship1_eez_west,
-    parse_ship2_eez_generic,
-    parse_ship1_ship3_eez_west,
-    parse_blocked_access,
-)
+from access_table import AccessTable
+from scenario import Scenario
 from phase4_sensor_params import SARSensorParams, SHIP_ROUTES, DEFAULT_SENSOR
 
 BASE_DIR = Path(r"D:\PierSight_Maritime_Study")
@@ -21,40 +17,19 @@ PHASE4_DIR.mkdir(exist_ok=True)
 
 N_SATS = 12
 
+SCENARIO = Scenario.walker(DATA_DIR, N_SATS)
+
 # ============================================================================
 # UTILITY FUNCTIONS
 # ============================================================================
 
-def get_ship_intervals(ship_id: str, eez_name: str) -> List[Dict]:
+def get_ship_intervals(ship_id: str, eez_name: str, scenario: Scenario = SCENARIO) -> List[Dict]:
     """Get ship EEZ entry/exit intervals."""
-    if ship_id in ["Ship1", "Ship3"] and eez_name != "EEZ_West":
-        raise ValueError(f"{ship_id} only in EEZ_West")
-    if ship_id == "Ship2" and eez_name != "EEZ_East":
-        raise ValueError("Ship2 only in EEZ_East")
-
-    if ship_id == "Ship1":
-        path = DATA_DIR / "Access_Ship1_EEZ_West.csv"
-        return parse_ship1_eez_west(path)
-    elif ship_id == "Ship3":
-        path = DATA_DIR / "Access_Ship1_Ship3_EEZ_West.csv"
-        all_ints = parse_ship1_ship3_eez_west(path)
-        return [x for x in all_ints if x["ship_id"] == "Ship3"]
-    elif ship_id == "Ship2":
-        path = DATA_DIR / "Access_Ship2_EEZ_East.csv"
-        return parse_ship2_eez_generic(path, ship_id="Ship2")
-
-    raise ValueError(f"Unknown ship: {ship_id}")
-
-def get_eez_sat_passes(eez_name: str) -> List[Dict]:
-    """Get all satellite passes over an EEZ."""
-    if eez_name == "EEZ_West":
-        eez_file = DATA_DIR / "Acess_EEZ_West-To-Satellite-Walker12.csv"
-    elif eez_name == "EEZ_East":
-        eez_file = DATA_DIR / "Acess_EEZ_East-To-Satellite-Walker12.csv"
-    else:
-        raise ValueError(f"Unknown EEZ: {eez_name}")
+    return scenario.ship_intervals(ship_id, eez_name)
 
-    return parse_blocked_access(eez_file, n_blocks=N_SATS)
+def get_eez_sat_passes(eez_name: str, scenario: Scenario = SCENARIO) -> AccessTable:
+    """Get all satellite passes over an EEZ."""
+    return scenario.eez_passes(eez_name)
 
 def ship_on_known_route(ship_id: str) -> bool:
     """Check if ship on known routes: commercial ships are, dark ships are not."""
@@ -64,9 +39,9 @@ def ship_on_known_route(ship_id: str) -> bool:
 # PATROL MODE: Wide-swath coverage
 # ============================================================================
 
-def detect_ship_patrol_mode(ship_id: str, eez_name: str, sensor: SARSensorParams) -> Optional[Tuple]:
+def detect_ship_patrol_mode(ship_id: str, eez_name: str, sensor: SARSensorParams, scenario: Scenario = SCENARIO) -> Optional[Tuple]:
     """PATROL MODE: Wide-swath coverage. Ship detected on first satellite pass."""
-    ship_ints = get_ship_intervals(ship_id, eez_name)
+    ship_ints = get_ship_intervals(ship_id, eez_name, scenario)
     if not ship_ints:
         return None
 
@@ -74,31 +49,14 @@ def detect_ship_patrol_mode(ship_id: str, eez_name: str, sensor: SARSensorParams
     t_in = ship_int["start_s"]
     t_out = ship_int["stop_s"]
 
-    eez_passes = get_eez_sat_passes(eez_name)
-
-    best_detection = None
-    best_sat_id = None
-
-    for sat_id in range(N_SATS):
-        sat_passes = [e for e in eez_passes if e["block_id"] == sat_id]
-        overlapping_passes = [
-            p for p in sat_passes
-            if p["start_s"] <= t_out and p["stop_s"] >= t_in
-        ]
-
-        if not overlapping_passes:
-            continue
-
-        first_pass = min(overlapping_passes, key=lambda x: x["start_s"])
-        t_detect = max(first_pass["start_s"], t_in) + sensor.sar_processing_delay_s
-
-        if best_detection is None or t_detect < best_detection:
-            best_detection = t_detect
-            best_sat_id = sat_id + 1
-
-    if best_detection is None:
+    # Satellite whose first overlapping pass starts imaging soonest
+    first_pass = scenario.eez_index(eez_name).earliest_overlap(t_in, t_out)
+    if first_pass is None:
         return None
 
+    best_detection = max(first_pass.start_s, t_in) + sensor.sar_processing_delay_s
+    best_sat_id = first_pass.sat_block + 1
+
     detect_latency = best_detection - t_in
     return (ship_id, eez_name, t_in, best_detection, best_sat_id, detect_latency, "PATROL")
 
@@ -106,9 +64,9 @@ def detect_ship_patrol_mode(ship_id: str, eez_name: str, sensor: SARSensorParams
 # TRACKING MODE: Focused coverage on known routes
 # ============================================================================
 
-def detect_ship_tracking_mode(ship_id: str, eez_name: str, sensor: SARSensorParams) -> Optional[Tuple]:
+def detect_ship_tracking_mode(ship_id: str, eez_name: str, sensor: SARSensorParams, scenario: Scenario = SCENARIO) -> Optional[Tuple]:
     """TRACKING MODE: Optimized for known routes. Dark ships may be missed."""
-    ship_ints = get_ship_intervals(ship_id, eez_name)
+    ship_ints = get_ship_intervals(ship_id, eez_name, scenario)
     if not ship_ints:
         return None
 
@@ -117,63 +75,31 @@ def detect_ship_tracking_mode(ship_id: str, eez_name: str, sensor: SARSensorPara
     t_out = ship_int["stop_s"]
 
     on_route = ship_on_known_route(ship_id)
-    eez_passes = get_eez_sat_passes(eez_name)
+    eez_index = scenario.eez_index(eez_name)
 
     if on_route:
-        best_detection = None
-        best_sat_id = None
-
-        for sat_id in range(N_SATS):
-            sat_passes = [e for e in eez_passes if e["block_id"] == sat_id]
-            overlapping_passes = [
-                p for p in sat_passes
-                if p["start_s"] <= t_out and p["stop_s"] >= t_in
-            ]
-
-            if not overlapping_passes:
-                continue
-
-            first_pass = min(overlapping_passes, key=lambda x: x["start_s"])
-            processing_delay = sensor.sar_processing_delay_s * 0.8
-            t_detect = max(first_pass["start_s"], t_in) + processing_delay
-
-            if best_detection is None or t_detect < best_detection:
-                best_detection = t_detect
-                best_sat_id = sat_id + 1
-
-        if best_detection is None:
+        first_pass = eez_index.earliest_overlap(t_in, t_out)
+        if first_pass is None:
             return None
 
+        processing_delay = sensor.sar_processing_delay_s * 0.8
+        best_detection = max(first_pass.start_s, t_in) + processing_delay
+        best_sat_id = first_pass.sat_block + 1
+
         detect_latency = best_detection - t_in
         return (ship_id, eez_name, t_in, best_detection, best_sat_id, detect_latency, "TRACKING")
 
     else:
-        best_detection = None
-        best_sat_id = None
-
-        for sat_id in range(N_SATS):
-            sat_passes = [e for e in eez_passes if e["block_id"] == sat_id]
-            overlapping_passes = [
-                p for p in sat_passes
-                if p["start_s"] <= t_out and p["stop_s"] >= t_in
-            ]
-
-            if not overlapping_passes:
-                continue
-
-            if (sat_id % 3) != 0:
-                continue
-
-            first_pass = overlapping_passes[0]
-            t_detect = max(first_pass["start_s"], t_in) + sensor.sar_processing_delay_s
-
-            if best_detection is None or t_detect < best_detection:
-                best_detection = t_detect
-                best_sat_id = sat_id + 1
-
-        if best_detection is None:
+        # Off-route dark ships are only imaged by every third satellite
+        first_pass = eez_index.earliest_overlap(
+            t_in, t_out, sats=range(0, scenario.n_sats, 3)
+        )
+        if first_pass is None:
             return None
 
+        best_detection = max(first_pass.start_s, t_in) + sensor.sar_processing_delay_s
+        best_sat_id = first_pass.sat_block + 1
+
         detect_latency = best_detection - t_in
         return (ship_id, eez_name, t_in, best_detection, best_sat_id, detect_latency, "TRACKING")
 
@@ -181,23 +107,13 @@ def detect_ship_tracking_mode(ship_id: str, eez_name: str, sensor: SARSensorPara
 # DELIVERY LATENCY
 # ============================================================================
 
-def compute_delivery_latency(sat_id: int, t_detect: float) -> Optional[Tuple]:
+def compute_delivery_latency(sat_id: int, t_detect: float, scenario: Scenario = SCENARIO) -> Optional[Tuple]:
     """Compute downlink latency for detected satellite."""
-    amd_file = DATA_DIR / "Acess_GS_Ahmedabad-To-Satellite-Walker12.csv"
-    sri_file = DATA_DIR / "Acess_GS_Sriharikota-To-Satellite-Walker12.csv"
-
-    amd = parse_blocked_access(amd_file, n_blocks=N_SATS)
-    sri = parse_blocked_access(sri_file, n_blocks=N_SATS)
-
-    sat_block = sat_id - 1
-    passes = [e for e in amd + sri if e["block_id"] == sat_block]
-    candidates = [p for p in passes if p["start_s"] >= t_detect]
-
-    if not candidates:
+    first_dl = scenario.downlink_index().earliest_after(t_detect, sat_block=sat_id - 1)
+    if first_dl is None:
         return None
 
-    first_dl = min(candidates, key=lambda x: x["start_s"])
-    t_down = first_dl["start_s"]
+    t_down = first_dl.start_s
     dl_latency = t_down - t_detect
 
     return sat_id, t_down, dl_latency
@@ -206,7 +122,7 @@ def compute_delivery_latency(sat_id: int, t_detect: float) -> Optional[Tuple]:
 # MAIN ANALYSIS
 # ============================================================================
 
-def run_phase4_patrol_vs_tracking():
+def run_phase4_patrol_vs_tracking(scenario: Scenario = SCENARIO):
     """Run Phase 4 analysis comparing patrol vs tracking modes."""
 
     sensor = DEFAULT_SENSOR
@@ -216,11 +132,11 @@ def run_phase4_patrol_vs_tracking():
 
     for ship_id, eez_name in ships:
         # PATROL MODE
-        patrol_result = detect_ship_patrol_mode(ship_id, eez_name, sensor)
+        patrol_result = detect_ship_patrol_mode(ship_id, eez_name, sensor, scenario)
 
         if patrol_result:
             _, _, t_in, t_det_p, sat_p, lat_p, _ = patrol_result
-            dl_info_p = compute_delivery_latency(sat_p, t_det_p)
+            dl_info_p = compute_delivery_latency(sat_p, t_det_p, scenario)
 
             if dl_info_p:
                 sat_dl_p, t_down_p, dl_lat_p = dl_info_p
@@ -253,11 +169,11 @@ def run_phase4_patrol_vs_tracking():
             })
 
         # TRACKING MODE
-        tracking_result = detect_ship_tracking_mode(ship_id, eez_name, sensor)
+        tracking_result = detect_ship_tracking_mode(ship_id, eez_name, sensor, scenario)
 
         if tracking_result:
             _, _, t_in, t_det_t, sat_t, lat_t, _ = tracking_result
-            dl_info_t = compute_delivery_latency(sat_t, t_det_t)
+            dl_info_t = compute_delivery_latency(sat_t, t_det_t, scenario)
 
             if dl_info_t:
                 sat_dl_t, t_down_t, dl_lat_t = dl_info_t
@@ -2,12 +2,8 @@
 from pathlib import Path
 import csv
 from typing import List, Dict, Tuple, Optional
-from parsers import (
-    parse_ship1_eez_west,
-    parse_ship2_eez_generic,
-    parse_ship1_ship3_eez_west,
-    parse_blocked_access,
-)
+from access_table import AccessTable
+from scenario import Scenario
 from phase4_sensor_params import DEFAULT_SENSOR
 
 BASE_DIR = Path(r"D:\PierSight_Maritime_Study")
@@ -17,136 +13,73 @@ PHASE4_DIR.mkdir(exist_ok=True)
 
 N_SATS = 32
 
-def get_ship_intervals(ship_id: str, eez_name: str) -> List[Dict]:
+SCENARIO = Scenario.walker(DATA_DIR_32, N_SATS)
+
+def get_ship_intervals(ship_id: str, eez_name: str, scenario: Scenario = SCENARIO) -> List[Dict]:
     """Get ship EEZ intervals."""
-    if ship_id in ["Ship1", "Ship3"] and eez_name != "EEZ_West":
-        raise ValueError(f"{ship_id} only in EEZ_West")
-    if ship_id == "Ship2" and eez_name != "EEZ_East":
-        raise ValueError("Ship2 only in EEZ_East")
-
-    if ship_id == "Ship1":
-        path = DATA_DIR_32 / "Access_Ship1_EEZ_West.csv"
-        return parse_ship1_eez_west(path)
-    elif ship_id == "Ship3":
-        path = DATA_DIR_32 / "Access_Ship1_Ship3_EEZ_West.csv"
-        all_ints = parse_ship1_ship3_eez_west(path)
-        return [x for x in all_ints if x["ship_id"] == "Ship3"]
-    elif ship_id == "Ship2":
-        path = DATA_DIR_32 / "Access_Ship2_EEZ_East.csv"
-        return parse_ship2_eez_generic(path, ship_id="Ship2")
-
-    raise ValueError(f"Unknown ship: {ship_id}")
-
-def get_eez_sat_passes(eez_name: str) -> List[Dict]:
+    return scenario.ship_intervals(ship_id, eez_name)
+
+def get_eez_sat_passes(eez_name: str, scenario: Scenario = SCENARIO) -> AccessTable:
     """Get satellite passes over EEZ."""
-    if eez_name == "EEZ_West":
-        eez_file = DATA_DIR_32 / "Acess_EEZ_West-To-Satellite-Walker32.csv"
-    elif eez_name == "EEZ_East":
-        eez_file = DATA_DIR_32 / "Acess_EEZ_East-To-Satellite-Walker32.csv"
-    else:
-        raise ValueError(f"Unknown EEZ: {eez_name}")
-    return parse_blocked_access(eez_file, n_blocks=N_SATS)
+    return scenario.eez_passes(eez_name)
 
 def ship_on_known_route(ship_id: str) -> bool:
     return ship_id in ["Ship1", "Ship2"]
 
-def detect_ship_patrol_mode(ship_id: str, eez_name: str, sensor) -> Optional[Tuple]:
+def detect_ship_patrol_mode(ship_id: str, eez_name: str, sensor, scenario: Scenario = SCENARIO) -> Optional[Tuple]:
     """PATROL MODE for 32-sat."""
-    ship_ints = get_ship_intervals(ship_id, eez_name)
+    ship_ints = get_ship_intervals(ship_id, eez_name, scenario)
     if not ship_ints:
         return None
 
     ship_int = ship_ints[0]
     t_in, t_out = ship_int["start_s"], ship_int["stop_s"]
-    eez_passes = get_eez_sat_passes(eez_name)
-
-    best_detection, best_sat_id = None, None
-    for sat_id in range(N_SATS):
-        sat_passes = [e for e in eez_passes if e["block_id"] == sat_id]
-        overlapping = [p for p in sat_passes if p["start_s"] <= t_out and p["stop_s"] >= t_in]
-
-        if not overlapping:
-            continue
-
-        first_pass = min(overlapping, key=lambda x: x["start_s"])
-        t_detect = max(first_pass["start_s"], t_in) + sensor.sar_processing_delay_s
-
-        if best_detection is None or t_detect < best_detection:
-            best_detection = t_detect
-            best_sat_id = sat_id + 1
-
-    if best_detection is None:
+    first_pass = scenario.eez_index(eez_name).earliest_overlap(t_in, t_out)
+    if first_pass is None:
         return None
+
+    best_detection = max(first_pass.start_s, t_in) + sensor.sar_processing_delay_s
+    best_sat_id = first_pass.sat_block + 1
     return (ship_id, eez_name, t_in, best_detection, best_sat_id, best_detection - t_in, "PATROL")
 
-def detect_ship_tracking_mode(ship_id: str, eez_name: str, sensor) -> Optional[Tuple]:
+def detect_ship_tracking_mode(ship_id: str, eez_name: str, sensor, scenario: Scenario = SCENARIO) -> Optional[Tuple]:
     """TRACKING MODE for 32-sat."""
-    ship_ints = get_ship_intervals(ship_id, eez_name)
+    ship_ints = get_ship_intervals(ship_id, eez_name, scenario)
     if not ship_ints:
         return None
 
     ship_int = ship_ints[0]
     t_in, t_out = ship_int["start_s"], ship_int["stop_s"]
     on_route = ship_on_known_route(ship_id)
-    eez_passes = get_eez_sat_passes(eez_name)
+    eez_index = scenario.eez_index(eez_name)
 
     if on_route:
-        best_detection, best_sat_id = None, None
-        for sat_id in range(N_SATS):
-            sat_passes = [e for e in eez_passes if e["block_id"] == sat_id]
-            overlapping = [p for p in sat_passes if p["start_s"] <= t_out and p["stop_s"] >= t_in]
-
-            if not overlapping:
-                continue
-
-            first_pass = min(overlapping, key=lambda x: x["start_s"])
-            processing_delay = sensor.sar_processing_delay_s * 0.8
-            t_detect = max(first_pass["start_s"], t_in) + processing_delay
-
-            if best_detection is None or t_detect < best_detection:
-                best_detection = t_detect
-                best_sat_id = sat_id + 1
-
-        if best_detection is None:
+        first_pass = eez_index.earliest_overlap(t_in, t_out)
+        if first_pass is None:
             return None
+
+        processing_delay = sensor.sar_processing_delay_s * 0.8
+        best_detection = max(first_pass.start_s, t_in) + processing_delay
+        best_sat_id = first_pass.sat_block + 1
         return (ship_id, eez_name, t_in, best_detection, best_sat_id, best_detection - t_in, "TRACKING")
     else:
-        best_detection, best_sat_id = None, None
-        for sat_id in range(N_SATS):
-            sat_passes = [e for e in eez_passes if e["block_id"] == sat_id]
-            overlapping = [p for p in sat_passes if p["start_s"] <= t_out and p["stop_s"] >= t_in]
-
-            if not overlapping or (sat_id % 3) != 0:
-                continue
-
-            first_pass = overlapping[0]
-            t_detect = max(first_pass["start_s"], t_in) + sensor.sar_processing_delay_s
-
-            if best_detection is None or t_detect < best_detection:
-                best_detection = t_detect
-                best_sat_id = sat_id + 1
-
-        if best_detection is None:
+        first_pass = eez_index.earliest_overlap(t_in, t_out, sats=range(0, scenario.n_sats, 3))
+        if first_pass is None:
             return None
+
+        best_detection = max(first_pass.start_s, t_in) + sensor.sar_processing_delay_s
+        best_sat_id = first_pass.sat_block + 1
         return (ship_id, eez_name, t_in, best_detection, best_sat_id, best_detection - t_in, "TRACKING")
 
-def compute_delivery_latency_any_sat(t_detect: float) -> Optional[Tuple]:
+def compute_delivery_latency_any_sat(t_detect: float, scenario: Scenario = SCENARIO) -> Optional[Tuple]:
     """Earliest downlink on ANY satellite (32-sat networked delivery)."""
-    amd_file = DATA_DIR_32 / "Acess_GS_Ahmedabad-To-Satellite-Walker32.csv"
-    sri_file = DATA_DIR_32 / "Acess_GS_Sriharikota-To-Satellite-Walker32.csv"
-
-    amd = parse_blocked_access(amd_file, n_blocks=N_SATS)
-    sri = parse_blocked_access(sri_file, n_blocks=N_SATS)
-    passes = amd + sri
-
-    candidates = [p for p in passes if p["start_s"] >= t_detect]
-    if not candidates:
+    first_dl = scenario.downlink_index().earliest_after(t_detect)
+    if first_dl is None:
         return None
 
-    first_dl = min(candidates, key=lambda x: x["start_s"])
-    return first_dl["block_id"] + 1, first_dl["start_s"], first_dl["start_s"] - t_detect
+    return first_dl.sat_block + 1, first_dl.start_s, first_dl.start_s - t_detect
 
-def run_phase4_32sat():
+def run_phase4_32sat(scenario: Scenario = SCENARIO):
     """Run Phase 4 for 32-sat constellation."""
     sensor = DEFAULT_SENSOR
     results = []
@@ -158,11 +91,11 @@ def run_phase4_32sat():
             (detect_ship_patrol_mode, "PATROL"),
             (detect_ship_tracking_mode, "TRACKING")
         ]:
-            result = mode_func(ship_id, eez_name, sensor)
+            result = mode_func(ship_id, eez_name, sensor, scenario)
 
             if result:
                 _, _, t_in, t_det, sat_detect, lat, _ = result
-                dl_info = compute_delivery_latency_any_sat(t_det)
+                dl_info = compute_delivery_latency_any_sat(t_det, scenario)
 
                 if dl_info:
                     sat_dl, t_down, dl_lat = dl_info
@@ -0,0 +1,219 @@
+"""Phase 4: Sensor-parameter sensitivity sweep (memoized, process pool)"""
+from pathlib import Path
+import csv
+import hashlib
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product
+from typing import List, Dict, Optional
+import numpy as np
+from scenario import Scenario
+from monte_carlo import candidate_passes, first_detection_probs, weighted_percentile
+
+BASE_DIR = Path(r"D:\PierSight_Maritime_Study")
+PHASE4_DIR = BASE_DIR / "phase4_analysis"
+PHASE4_DIR.mkdir(exist_ok=True)
+
+SCENARIOS = {
+    "12sat": Scenario.walker(BASE_DIR / "12sat_data", 12),
+    "32sat": Scenario.walker(BASE_DIR / "32sat_data", 32),
+}
+
+# Constellations that relay products over inter-satellite links and so
+# deliver on the next downlink of any satellite; the others deliver
+# through the detecting satellite, as in the deterministic Phase 4 runs.
+ISL_CONSTELLATIONS = {"32sat"}
+
+SHIPS = [("Ship1", "EEZ_West"), ("Ship3", "EEZ_West"), ("Ship2", "EEZ_East")]
+
+# Sweep axes. A point is one sensor configuration applied to both modes.
+GRID = {
+    "sar_processing_delay_s": [0.0, 15.0, 30.0, 60.0, 90.0, 120.0],
+    "tracking_delay_factor": [0.5, 0.6, 0.7, 0.8, 0.9, 1.0],
+    "swath_factor": [0.25, 0.5, 0.75, 1.0],
+    "pd": [0.7, 0.8, 0.9, 0.95, 0.99],
+}
+PARAMS = list(GRID)
+
+OUT_PATH = PHASE4_DIR / "Phase4_Sensitivity_Sweep.csv"
+POINTS_PER_TASK = 64
+
+# Bump whenever evaluate_mode changes what it computes: memoized rows of
+# another version are dropped and recomputed.
+MODEL_VERSION = 3
+
+def ship_on_known_route(ship_id: str) -> bool:
+    return ship_id in ["Ship1", "Ship2"]
+
+def build_intermediates(scenario: Scenario, isl: bool = False) -> Dict:
+    """
+    Everything that does not depend on the sensor parameters: each ship's
+    EEZ window and candidate passes as (t_image, sat_block) (all
+    satellites, and the every-third subset used for dark ships in
+    TRACKING), plus the sorted downlink starts: one merged list when
+    products cross inter-satellite links (isl), else one per satellite.
+    """
+    ships = {}
+    for ship_id, eez_name in SHIPS:
+        ship_ints = scenario.ship_intervals(ship_id, eez_name)
+        if not ship_ints:
+            continue
+        t_in, t_out = ship_ints[0]["start_s"], ship_ints[0]["stop_s"]
+        passes = scenario.eez_passes(eez_name)
+        ships[ship_id] = {
+            "eez": eez_name,
+            "t_in": t_in,
+            "all": candidate_passes(passes, t_in, t_out),
+            "dark": candidate_passes(passes, t_in, t_out, range(0, scenario.n_sats, 3)),
+        }
+    dl = scenario.downlink_index()
+    if isl:
+        downlink_starts = [dl.g_start]
+    else:
+        downlink_starts = [dl.g_start[dl.g_block == k] for k in range(scenario.n_sats)]
+
+    h = hashlib.sha1(f"v{MODEL_VERSION} isl={isl}".encode())
+    for starts in downlink_starts:
+        h.update(np.int64(len(starts)).tobytes())
+        h.update(starts.tobytes())
+    for ship_id, ship in sorted(ships.items()):
+        h.update(ship_id.encode())
+        h.update(np.float64(ship["t_in"]).tobytes())
+        for t_image, block in (ship["all"], ship["dark"]):
+            h.update(t_image.tobytes())
+            h.update(block.tobytes())
+    return {"ships": ships, "downlink_starts": downlink_starts, "key": h.hexdigest()[:16]}
+
+def next_downlink(downlink_starts: List[np.ndarray], t_det: np.ndarray,
+                  sat_block: np.ndarray) -> np.ndarray:
+    """Start of the first downlink at or after each t_det (NaN if none)."""
+    route = sat_block if len(downlink_starts) > 1 else np.zeros_like(sat_block)
+    t_down = np.full(len(t_det), np.nan)
+    for k in np.unique(route).tolist():
+        starts = downlink_starts[k]
+        sel = route == k
+        i = np.searchsorted(starts, t_det[sel], side="left")
+        t_down[sel] = np.where(i < len(starts), starts[np.minimum(i, len(starts) - 1)], np.nan)
+    return t_down
+
+def evaluate_mode(ship: Dict, downlink_starts: List[np.ndarray], mode: str,
+                  on_route: bool, point: Dict) -> Dict:
+    """Exact detection / delivery statistics of one ship and mode at one grid point."""
+    delay = point["sar_processing_delay_s"]
+    coverage = 1.0
+    t_image, block = ship["all"]
+    if mode == "TRACKING":
+        if on_route:
+            delay *= point["tracking_delay_factor"]
+        else:
+            # A narrowed beam not pointed at a known route sees the ship
+            # on a pass with probability swath_factor.
+            coverage = point["swath_factor"]
+            t_image, block = ship["dark"]
+
+    p_first = first_detection_probs(np.full(len(t_image), point["pd"] * coverage))
+    t_det = t_image + delay
+    t_down = next_downlink(downlink_starts, t_det, block)
+    delivered = ~np.isnan(t_down)
+
+    detect = t_det - ship["t_in"]
+    total = t_down - ship["t_in"]
+    p_detect = float(p_first.sum())
+    p_delivered = float(p_first[delivered].sum())
+    return {
+        "p_detect": p_detect,
+        "mean_detect_latency_s": float((p_first * detect).sum() / p_detect) if p_detect > 0 else None,
+        "p95_detect_latency_s": weighted_percentile(detect, p_first, 95),
+        "p_delivered": p_delivered,
+        "mean_total_latency_s": float((p_first[delivered] * total[delivered]).sum() / p_delivered)
+        if p_delivered > 0 else None,
+        "p95_total_latency_s": weighted_percentile(total[delivered], p_first[delivered], 95),
+    }
+
+_WORKER = {}
+
+def _init_worker(intermediates: Dict):
+    _WORKER.update(intermediates)
+
+def _evaluate_points(task):
+    label, points = task
+    inter = _WORKER[label]
+    rows = []
+    for values in points:
+        point = dict(zip(PARAMS, values))
+        for ship_id, ship in inter["ships"].items():
+            for mode in ("PATROL", "TRACKING"):
+                row = {"constellation": label, "model_version": MODEL_VERSION,
+                       "inputs_key": inter["key"], **point,
+                       "ship_id": ship_id, "eez": ship["eez"], "mode": mode}
+                row.update(evaluate_mode(ship, inter["downlink_starts"], mode,
+                                         ship_on_known_route(ship_id), point))
+                rows.append(row)
+    return rows
+
+def _point_key(label: str, inputs_key: str, values) -> tuple:
+    return (label, inputs_key) + tuple(float(v) for v in values)
+
+def load_memo(path: Path = OUT_PATH) -> List[Dict]:
+    if not path.exists():
+        return []
+    with path.open(newline="") as f:
+        return list(csv.DictReader(f))
+
+def run_sensitivity_sweep(scenarios: Dict[str, Scenario] = SCENARIOS, grid: Dict = GRID,
+                          out_path: Path = OUT_PATH,
+                          max_workers: Optional[int] = None) -> List[Dict]:
+    """
+    Evaluate every grid point not already in the result table and append it.
+
+    Rows of the table are keyed by constellation, a fingerprint of the
+    pass-level intermediates and MODEL_VERSION, and the parameter values,
+    so extending the grid only computes new points, while changed exports
+    or a changed model are recomputed.
+    """
+    intermediates = {
+        label: build_intermediates(s, label in ISL_CONSTELLATIONS)
+        for label, s in scenarios.items()
+    }
+
+    # Keep other constellations' rows; drop rows of another model version
+    # or computed from stale inputs.
+    old_rows = [
+        r for r in load_memo(out_path)
+        if r.get("model_version") == str(MODEL_VERSION)
+        and (r["constellation"] not in intermediates
+             or r["inputs_key"] == intermediates[r["constellation"]]["key"])
+    ]
+    done = {_point_key(r["constellation"], r["inputs_key"], [r[p] for p in PARAMS])
+            for r in old_rows}
+
+    points = list(product(*(grid[p] for p in PARAMS)))
+    tasks = []
+    for label, inter in intermediates.items():
+        todo = [v for v in points if _point_key(label, inter["key"], v) not in done]
+        for lo in range(0, len(todo), POINTS_PER_TASK):
+            tasks.append((label, todo[lo:lo + POINTS_PER_TASK]))
+
+    if max_workers is None:
+        max_workers = min(len(tasks), os.cpu_count() or 1)
+    if max_workers <= 1 or len(tasks) <= 1:
+        _init_worker(intermediates)
+        parts = [_evaluate_points(t) for t in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                                 initargs=(intermediates,)) as pool:
+            parts = list(pool.map(_evaluate_points, tasks))
+    new_rows = [row for part in parts for row in part]
+
+    rows = old_rows + new_rows
+    if rows:
+        with out_path.open("w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0].keys()))
+            writer.writeheader()
+            for row in rows:
+                writer.writerow(row)
+
+    return rows
+
+if __name__ == "__main__":
+    results = run_sensitivity_sweep()
@@ -0,0 +1,57 @@
+"""Phase 4: Onboard storage and downlink-rate sizing (12-sat and 32-sat)"""
+from pathlib import Path
+import csv
+from typing import List, Dict
+from scenario import Scenario
+from storage import storage_budget
+from phase4_sensor_params import DEFAULT_SENSOR
+
+BASE_DIR = Path(r"D:\PierSight_Maritime_Study")
+PHASE4_DIR = BASE_DIR / "phase4_analysis"
+PHASE4_DIR.mkdir(exist_ok=True)
+
+SCENARIOS = {
+    "12sat": Scenario.walker(BASE_DIR / "12sat_data", 12),
+    "32sat": Scenario.walker(BASE_DIR / "32sat_data", 32),
+}
+
+CAPACITIES_GB = [16.0, 64.0, 128.0]
+LINK_RATES_MBPS = [150.0, 300.0, 600.0]
+
+def run_storage_budget(scenarios: Dict[str, Scenario] = SCENARIOS) -> List[Dict]:
+    """Per-satellite buffer, backlog and latency inflation for each sizing option."""
+    sensor = DEFAULT_SENSOR
+    results = []
+
+    for label, scenario in scenarios.items():
+        imaging = [scenario.eez_passes(eez) for eez in sorted(scenario.eez_files)]
+        downlinks = list(scenario.all_gs_passes().values())
+        for mode, params in sensor.modes.items():
+            delay = sensor.sar_processing_delay_s * (0.8 if mode == "TRACKING" else 1.0)
+            for capacity in CAPACITIES_GB:
+                for rate in LINK_RATES_MBPS:
+                    budget = storage_budget(
+                        imaging, downlinks, params["data_volume_per_pass_gb"],
+                        capacity_gb=capacity, link_rate_mbps=rate, delay_s=delay,
+                        n_sats=scenario.n_sats,
+                    )
+                    for row in budget.rows():
+                        results.append({
+                            'constellation': label,
+                            'mode': mode,
+                            'capacity_gb': capacity,
+                            'link_rate_mbps': rate,
+                            **row,
+                        })
+
+    out_path = PHASE4_DIR / "Phase4_Storage_Budget.csv"
+    with out_path.open("w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=list(results[0].keys()))
+        writer.writeheader()
+        for row in results:
+            writer.writerow(row)
+
+    return results
+
+if __name__ == "__main__":
+    results = run_storage_budget()
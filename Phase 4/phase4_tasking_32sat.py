@@ -0,0 +1,123 @@
+"""Phase 4: 32-sat imaging tasking (dwell time, per-pass capacity, priorities)"""
+import csv
+from typing import List
+import numpy as np
+from scenario import Scenario
+from tasking import Target, patrol_targets, schedule_imaging
+from phase4_sensor_params import DEFAULT_SENSOR
+from phase4_patrol_vs_tracking_32sat import (
+    SCENARIO, PHASE4_DIR, ship_on_known_route, compute_delivery_latency_any_sat
+)
+
+SHIPS = [("Ship1", "EEZ_West"), ("Ship3", "EEZ_West"), ("Ship2", "EEZ_East")]
+
+# Background patrol load competing with the ships for imaging slots.
+PATROL_SECTORS = {"EEZ_West": 8, "EEZ_East": 8}
+PATROL_PERIOD_S = 3600.0
+
+def ship_priority(ship_id: str, mode: str) -> float:
+    """Ships outrank patrol sectors; in TRACKING, ships on known routes come first."""
+    if mode == "TRACKING" and ship_on_known_route(ship_id):
+        return 2.0
+    return 1.0
+
+def build_targets(mode: str, scenario: Scenario = SCENARIO) -> List[Target]:
+    targets = []
+    for ship_id, eez_name in SHIPS:
+        ship_ints = scenario.ship_intervals(ship_id, eez_name)
+        if ship_ints:
+            t_in, t_out = ship_ints[0]["start_s"], ship_ints[0]["stop_s"]
+            # Dark ships in TRACKING are only covered by every third satellite.
+            sats = None
+            if mode == "TRACKING" and not ship_on_known_route(ship_id):
+                sats = frozenset(range(0, scenario.n_sats, 3))
+            targets.append(Target(ship_id, eez_name, t_in, t_out,
+                                  ship_priority(ship_id, mode), sats))
+
+    for eez_name, n_sectors in PATROL_SECTORS.items():
+        table = scenario.eez_passes(eez_name)
+        if len(table):
+            t0, t1 = float(table.start_s.min()), float(table.stop_s.max())
+            targets += patrol_targets(eez_name, n_sectors, t0, t1, PATROL_PERIOD_S)
+    return targets
+
+def run_tasking_32sat(scenario: Scenario = SCENARIO):
+    """Schedule ships and patrol sectors per mode, then deliver the ship detections."""
+    sensor = DEFAULT_SENSOR
+    passes = {eez: scenario.eez_passes(eez) for eez in scenario.eez_files}
+    results = []
+    sectors = []
+
+    for mode in sensor.modes:
+        targets = build_targets(mode, scenario)
+        plan = schedule_imaging(passes, targets, sensor.dwell_time_s)
+
+        index = {t.name: i for i, t in enumerate(targets)}
+        for ship_id, eez_name in SHIPS:
+            delay = sensor.sar_processing_delay_s
+            if mode == "TRACKING" and ship_on_known_route(ship_id):
+                delay *= 0.8
+            i = index.get(ship_id)
+            row = {
+                'ship_id': ship_id,
+                'eez': eez_name,
+                'mode': mode,
+                'priority': ship_priority(ship_id, mode),
+                't_entry_s': targets[i].t_in if i is not None else None,
+                'slot_start_s': None,
+                't_detect_s': None,
+                'sat_detect': None,
+                'sat_downlink': None,
+                'detect_latency_s': None,
+                'delivery_latency_s': None,
+                'total_latency_s': None,
+                'detected': 0,
+            }
+            if i is not None and plan.scheduled[i]:
+                t_det = float(plan.detect_s(delay)[i])
+                row.update({
+                    'slot_start_s': float(plan.slot_start_s[i]),
+                    't_detect_s': t_det,
+                    'sat_detect': int(plan.sat_block[i]) + 1,
+                    'detect_latency_s': t_det - targets[i].t_in,
+                    'detected': 1,
+                })
+                dl_info = compute_delivery_latency_any_sat(t_det, scenario)
+                if dl_info:
+                    sat_dl, t_down, dl_lat = dl_info
+                    row.update({
+                        'sat_downlink': sat_dl,
+                        'delivery_latency_s': dl_lat,
+                        'total_latency_s': row['detect_latency_s'] + dl_lat,
+                    })
+            results.append(row)
+
+        is_sector = np.array([t.name not in dict(SHIPS) for t in targets], dtype=bool)
+        done = is_sector & plan.scheduled
+        wait = plan.slot_start_s[done] - np.array([t.t_in for t in targets])[done]
+        sectors.append({
+            'mode': mode,
+            'sector_targets': int(is_sector.sum()),
+            'sector_scheduled': int(done.sum()),
+            'mean_sector_wait_s': float(wait.mean()) if len(wait) else None,
+            'imaging_s': float(plan.scheduled.sum() * sensor.dwell_time_s),
+        })
+
+    out_path = PHASE4_DIR / "Phase4_Tasking_32sat.csv"
+    with out_path.open("w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=list(results[0].keys()))
+        writer.writeheader()
+        for row in results:
+            writer.writerow(row)
+
+    out_path = PHASE4_DIR / "Phase4_Tasking_Sectors_32sat.csv"
+    with out_path.open("w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=list(sectors[0].keys()))
+        writer.writeheader()
+        for row in sectors:
+            writer.writerow(row)
+
+    return results, sectors
+
+if __name__ == "__main__":
+    results, sectors = run_tasking_32sat()
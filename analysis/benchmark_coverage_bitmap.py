@@ -0,0 +1,99 @@
+from pathlib import Path
+import csv
+import time
+
+import numpy as np
+
+from bitmap import CoverageBitmap
+from intervals import merge_union
+from revisit import detection_latency_distribution, revisit_stats
+from scenario import Scenario
+
+BASE_DIR = Path(r"D:\PierSight_Maritime_Study")
+DATA_DIR = BASE_DIR / "32sat_data"
+OUT_DIR = BASE_DIR / "output"
+
+N_SATS = 32
+RESOLUTIONS_S = [1.0, 10.0]
+REPEATS = 5
+
+OUT_DIR.mkdir(exist_ok=True)
+
+
+def best_time(fn):
+    """Best wall time of REPEATS calls (seconds) and the last result."""
+    best = float("inf")
+    for _ in range(REPEATS):
+        t = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - t)
+    return best, out
+
+
+def interval_pipeline(table):
+    start, stop = merge_union(table.start_s, table.stop_s)
+    # Satellites 1 & 2 seeing the EEZ at the same time
+    a = merge_union(*table.block_arrays(0))
+    b = merge_union(*table.block_arrays(1))
+    ab = merge_union(np.concatenate([a[0], b[0]]), np.concatenate([a[1], b[1]]))
+    both_s = (a[1] - a[0]).sum() + (b[1] - b[0]).sum() - (ab[1] - ab[0]).sum()
+    stats = revisit_stats(table.start_s, table.stop_s)
+    latency = detection_latency_distribution(start, stop)
+    return stats.percentile(95), latency.mean_s, (stop - start).sum(), both_s
+
+
+def bitmap_pipeline(bm):
+    resolution_s = bm.resolution_s
+    union = bm.union()
+    both = bm[0] & bm[1]
+    start, stop = union.intervals()
+    stats = revisit_stats(start, stop)
+    latency = detection_latency_distribution(start, stop)
+    covered_s = union.count()[0] * resolution_s
+    both_s = both.count()[0] * resolution_s
+    return stats.percentile(95), latency.mean_s, covered_s, both_s
+
+
+def main():
+    scenario = Scenario.walker(DATA_DIR, N_SATS)
+    rows = []
+
+    for eez_name in ["EEZ_West", "EEZ_East"]:
+        table = scenario.eez_passes(eez_name)
+
+        t, (p95, lat, cov, both) = best_time(lambda: interval_pipeline(table))
+        rows.append({
+            "eez": eez_name, "representation": "intervals", "resolution_s": "",
+            "build_ms": 0.0, "query_ms": t * 1e3, "p95_revisit_s": p95, "mean_detect_latency_s": lat,
+            "covered_s": cov, "sat1_and_sat2_s": both,
+        })
+
+        for res in RESOLUTIONS_S:
+            t_build, bm = best_time(
+                lambda: CoverageBitmap.from_table(table, resolution_s=res)
+            )
+            t, (p95, lat, cov, both) = best_time(lambda: bitmap_pipeline(bm))
+            rows.append({
+                "eez": eez_name, "representation": "bitmap", "resolution_s": res,
+                "build_ms": t_build * 1e3, "query_ms": t * 1e3, "p95_revisit_s": p95, "mean_detect_latency_s": lat,
+                "covered_s": cov, "sat1_and_sat2_s": both,
+            })
+
+    print(f"{'EEZ':<9} {'repr':<10} {'res':>5} {'build ms':>9} {'query ms':>9} {'p95 gap':>9} "
+          f"{'mean lat':>9} {'covered':>10} {'1&2':>8}")
+    for r in rows:
+        print(f"{r['eez']:<9} {r['representation']:<10} {str(r['resolution_s']):>5} "
+              f"{r['build_ms']:9.2f} {r['query_ms']:9.2f} {r['p95_revisit_s']:9.1f} "
+              f"{r['mean_detect_latency_s']:9.1f} {r['covered_s']:10.0f} "
+              f"{r['sat1_and_sat2_s']:8.0f}")
+
+    out = OUT_DIR / "benchmark_coverage_bitmap.csv"
+    with out.open("w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+    print(f"\nBenchmark saved to {out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+
+from access_table import AccessTable
+from constants import STORE_SUFFIX
+from parsers import count_blocks, iter_blocked_access
+
+STORE_MAGIC = b"PSACCESS"
+STORE_VERSION = 1
+
+# 64-byte header: magic, version, n_rows, n_blocks, padding.
+_HEADER = np.dtype(
+    [
+        ("magic", "S8"),
+        ("version", "<i8"),
+        ("n_rows", "<i8"),
+        ("n_blocks", "<i8"),
+        ("pad", "<i8", (4,)),
+    ]
+)
+
+# One fixed-width record per pass, times in integer milliseconds since
+# SCEN_START (STK UTCG exports carry millisecond resolution).
+RECORD = np.dtype([("block_id", "<i8"), ("start_ms", "<i8"), ("stop_ms", "<i8")])
+
+
+def store_path_for(csv_path) -> Path:
+    csv_path = Path(csv_path)
+    return csv_path.with_name(csv_path.stem + STORE_SUFFIX)
+
+
+def convert_to_store(csv_path, store_path=None) -> Path:
+    """
+    Convert a stacked STK export into a memory-mappable .pstore file.
+
+    Layout: header | records (sorted by block_id, start) | block offsets
+    (n_blocks + 1 int64). The CSV is streamed, so conversion memory does
+    not grow with the export size. n_blocks is the number of block headers
+    in the CSV, so trailing satellites without passes are kept. Passes are
+    never re-sorted: a block whose rows are not in start order in the CSV,
+    within a chunk or across chunks, raises ValueError.
+    """
+    csv_path = Path(csv_path)
+    store_path = Path(store_path) if store_path else store_path_for(csv_path)
+
+    counts = []
+    n_rows = 0
+    with store_path.open("wb") as f:
+        f.write(np.zeros(1, dtype=_HEADER).tobytes())
+        last = None
+        for block_id, chunk in iter_blocked_access(csv_path):
+            rec = np.empty(len(chunk), dtype=RECORD)
+            rec["block_id"] = block_id
+            rec["start_ms"] = np.round(chunk.start_s * 1000.0)
+            rec["stop_ms"] = np.round(chunk.stop_s * 1000.0)
+
+            unordered = np.any(np.diff(rec["start_ms"]) < 0)
+            if last is not None and last[0] == block_id and rec["start_ms"][0] < last[1]:
+                unordered = True
+            if unordered:
+                raise ValueError(f"{csv_path}: block {block_id} is not time-ordered")
+            last = (block_id, int(rec["start_ms"][-1]))
+
+            counts.extend([0] * (block_id + 1 - len(counts)))
+            counts[block_id] += len(rec)
+            n_rows += len(rec)
+            f.write(rec.tobytes())
+
+        n_blocks = max(count_blocks(csv_path), len(counts))
+        counts.extend([0] * (n_blocks - len(counts)))
+        offsets = np.concatenate([[0], np.cumsum(counts, dtype=np.int64)])
+        f.write(offsets.astype("<i8").tobytes())
+
+        header = np.zeros(1, dtype=_HEADER)
+        header["magic"] = STORE_MAGIC
+        header["version"] = STORE_VERSION
+        header["n_rows"] = n_rows
+        header["n_blocks"] = n_blocks
+        f.seek(0)
+        f.write(header.tobytes())
+
+    return store_path
+
+
+class AccessStore:
+    """
+    Read-only, memory-mapped view of a .pstore file.
+
+    Nothing is loaded up front: block(), block_times() and window() return
+    views into the mapping, so worker processes that open the same store
+    share its pages through the OS cache instead of copying them. Pickling
+    an AccessStore only sends its path.
+
+    Passes of one satellite never overlap, so within a block both start_ms
+    and stop_ms are sorted and a time window is two binary searches.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        header = np.fromfile(self.path, dtype=_HEADER, count=1)
+        if len(header) == 0 or header["magic"][0] != STORE_MAGIC:
+            raise ValueError(f"Not an access store: {self.path}")
+        if header["version"][0] != STORE_VERSION:
+            raise ValueError(f"Unsupported store version in {self.path}")
+
+        self.n_rows = int(header["n_rows"][0])
+        self.n_blocks = int(header["n_blocks"][0])
+        if self.n_rows:
+            self.records = np.memmap(
+                self.path, dtype=RECORD, mode="r",
+                offset=_HEADER.itemsize, shape=(self.n_rows,),
+            )
+        else:
+            self.records = np.zeros(0, dtype=RECORD)
+        self.offsets = np.memmap(
+            self.path, dtype="<i8", mode="r",
+            offset=_HEADER.itemsize + RECORD.itemsize * self.n_rows,
+            shape=(self.n_blocks + 1,),
+        )
+
+    def __reduce__(self):
+        return (AccessStore, (str(self.path),))
+
+    def __len__(self):
+        return self.n_rows
+
+    def __repr__(self):
+        return f"AccessStore({str(self.path)!r}, {self.n_rows} passes, {self.n_blocks} blocks)"
+
+    def block(self, k: int) -> np.ndarray:
+        """Record view (block_id, start_ms, stop_ms) of block k."""
+        if not 0 <= k < self.n_blocks:
+            return self.records[:0]
+        return self.records[self.offsets[k]:self.offsets[k + 1]]
+
+    def block_times(self, k: int):
+        """(start_ms, stop_ms) strided views of block k."""
+        rec = self.block(k)
+        return rec["start_ms"], rec["stop_ms"]
+
+    def window(self, k: int, t0_s: float, t1_s: float) -> np.ndarray:
+        """Record view of block k's passes overlapping [t0_s, t1_s]."""
+        rec = self.block(k)
+        lo = np.searchsorted(rec["stop_ms"], int(np.ceil(t0_s * 1000.0)), side="left")
+        hi = np.searchsorted(rec["start_ms"], int(np.floor(t1_s * 1000.0)), side="right")
+        return rec[lo:max(lo, hi)]
+
+    def window_all(self, t0_s: float, t1_s: float) -> Dict[int, np.ndarray]:
+        """block_id -> record view, for blocks with passes in the window."""
+        out = {}
+        for k in range(self.n_blocks):
+            rec = self.window(k, t0_s, t1_s)
+            if len(rec):
+                out[k] = rec
+        return out
+
+    def to_table(self, n_blocks: Optional[int] = None) -> AccessTable:
+        """
+        Copy (the first n_blocks blocks of) the store into an AccessTable.
+
+        duration_s is stop - start: the STK duration column is not stored.
+        """
+        n_blocks = self.n_blocks if n_blocks is None else n_blocks
+        keep = int(self.offsets[min(n_blocks, self.n_blocks)])
+        rec = self.records[:keep]
+        start_s = rec["start_ms"] / 1e3
+        stop_s = rec["stop_ms"] / 1e3
+        return AccessTable(
+            rec["block_id"],
+            start_s,
+            stop_s,
+            (rec["stop_ms"] - rec["start_ms"]) / 1e3,
+            n_blocks=n_blocks,
+            presorted=True,
+        )
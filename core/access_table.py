@@ -0,0 +1,167 @@
+import numpy as np
+
+
+class AccessTable:
+    """
+    Columnar STK access passes.
+
+    Rows are held in contiguous arrays sorted by (block_id, start_s), and
+    offsets[k]:offsets[k + 1] is the slice of block k, so a per-satellite
+    view is O(1) and does not copy.
+
+    Iterating yields the same dicts parse_blocked_access used to return
+    ({"block_id", "start_s", "stop_s", "duration_s"}), so existing
+    list-comprehension code keeps working unchanged. Indexing with an int
+    gives one such dict and with a slice a table of those rows; a + b is
+    AccessTable.concat([a, b]).
+    """
+
+    __slots__ = ("block_id", "start_s", "stop_s", "duration_s", "offsets")
+
+    def __init__(self, block_id, start_s, stop_s, duration_s, n_blocks=None,
+                 presorted=False):
+        block_id = np.asarray(block_id, dtype=np.int32)
+        start_s = np.asarray(start_s, dtype=np.float64)
+        stop_s = np.asarray(stop_s, dtype=np.float64)
+        duration_s = np.asarray(duration_s, dtype=np.float64)
+
+        if not presorted and len(block_id) > 1:
+            order = np.lexsort((start_s, block_id))
+            if np.any(order[1:] < order[:-1]):
+                block_id = block_id[order]
+                start_s = start_s[order]
+                stop_s = stop_s[order]
+                duration_s = duration_s[order]
+
+        if n_blocks is None:
+            n_blocks = int(block_id[-1]) + 1 if len(block_id) else 0
+
+        self.block_id = block_id
+        self.start_s = start_s
+        self.stop_s = stop_s
+        self.duration_s = duration_s
+        self.offsets = np.searchsorted(block_id, np.arange(n_blocks + 1))
+
+    @classmethod
+    def empty(cls, n_blocks=0):
+        z = np.zeros(0)
+        return cls(z, z, z, z, n_blocks=n_blocks, presorted=True)
+
+    @classmethod
+    def concat(cls, tables):
+        """Merge several tables into one, re-sorted by (block_id, start_s)."""
+        tables = list(tables)
+        if not tables:
+            return cls.empty()
+        n_blocks = max(t.n_blocks for t in tables)
+        return cls(
+            np.concatenate([t.block_id for t in tables]),
+            np.concatenate([t.start_s for t in tables]),
+            np.concatenate([t.stop_s for t in tables]),
+            np.concatenate([t.duration_s for t in tables]),
+            n_blocks=n_blocks,
+        )
+
+    @property
+    def n_blocks(self) -> int:
+        return len(self.offsets) - 1
+
+    def __len__(self):
+        return len(self.block_id)
+
+    def __iter__(self):
+        return (
+            {
+                "block_id": b,
+                "start_s": start,
+                "stop_s": stop,
+                "duration_s": dur,
+            }
+            for b, start, stop, dur in zip(
+                self.block_id.tolist(),
+                self.start_s.tolist(),
+                self.stop_s.tolist(),
+                self.duration_s.tolist(),
+            )
+        )
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            if i.step is not None and i.step < 0:
+                raise ValueError("AccessTable slices cannot reverse the row order")
+            return AccessTable(
+                self.block_id[i],
+                self.start_s[i],
+                self.stop_s[i],
+                self.duration_s[i],
+                n_blocks=self.n_blocks,
+                presorted=True,
+            )
+        return {
+            "block_id": int(self.block_id[i]),
+            "start_s": float(self.start_s[i]),
+            "stop_s": float(self.stop_s[i]),
+            "duration_s": float(self.duration_s[i]),
+        }
+
+    def __add__(self, other):
+        # Re-sorted by (block_id, start_s); the sort is stable, so rows with
+        # equal keys keep operand order.
+        if not isinstance(other, AccessTable):
+            return NotImplemented
+        return AccessTable.concat([self, other])
+
+    def __repr__(self):
+        return f"AccessTable({len(self)} passes, {self.n_blocks} blocks)"
+
+    def _slice(self, lo, hi, n_blocks):
+        return AccessTable(
+            self.block_id[lo:hi],
+            self.start_s[lo:hi],
+            self.stop_s[lo:hi],
+            self.duration_s[lo:hi],
+            n_blocks=n_blocks,
+            presorted=True,
+        )
+
+    def block(self, k: int) -> "AccessTable":
+        """Zero-copy view of block k's passes (empty if k is out of range)."""
+        if not 0 <= k < self.n_blocks:
+            return AccessTable.empty(self.n_blocks)
+        return self._slice(self.offsets[k], self.offsets[k + 1], self.n_blocks)
+
+    def first_blocks(self, n_blocks: int) -> "AccessTable":
+        """View of blocks 0..n_blocks-1, reporting exactly n_blocks blocks."""
+        keep = int(self.offsets[min(n_blocks, self.n_blocks)])
+        return self._slice(0, keep, n_blocks)
+
+    def block_arrays(self, k: int):
+        """(start_s, stop_s) array views for block k."""
+        if not 0 <= k < self.n_blocks:
+            z = np.zeros(0)
+            return z, z
+        lo, hi = self.offsets[k], self.offsets[k + 1]
+        return self.start_s[lo:hi], self.stop_s[lo:hi]
+
+    def filter(self, mask) -> "AccessTable":
+        """Rows where the boolean mask is True; sort order is preserved."""
+        mask = np.asarray(mask, dtype=bool)
+        return AccessTable(
+            self.block_id[mask],
+            self.start_s[mask],
+            self.stop_s[mask],
+            self.duration_s[mask],
+            n_blocks=self.n_blocks,
+            presorted=True,
+        )
+
+    def starting_between(self, t0: float, t1: float) -> "AccessTable":
+        """Passes with t0 <= start_s <= t1."""
+        return self.filter((self.start_s >= t0) & (self.start_s <= t1))
+
+    def overlapping(self, t0: float, t1: float) -> "AccessTable":
+        """Passes with start_s <= t1 and stop_s >= t0."""
+        return self.filter((self.start_s <= t1) & (self.stop_s >= t0))
+
+    def to_dicts(self):
+        return list(self)
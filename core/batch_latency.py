@@ -0,0 +1,105 @@
+from dataclasses import dataclass
+from typing import Iterable, Optional, Union
+
+import numpy as np
+
+from scenario import Scenario
+
+# Delivery models of the latency scripts.
+SAME_SAT = "same_sat"  # no ISL: the detecting satellite must downlink
+ANY_SAT = "any_sat"  # networked: earliest downlink on any satellite
+
+
+@dataclass
+class LatencyBatch:
+    """
+    Per-event detection and delivery results, one array entry per vessel
+    entry event. Times are seconds since SCEN_START; satellite ids are
+    1-based. Missing values are NaN (times) and 0 / "" (ids, stations).
+    """
+
+    t_entry: np.ndarray
+    t_exit: np.ndarray
+    eez: np.ndarray
+    t_detect: np.ndarray
+    sat_detect: np.ndarray
+    detect_latency_s: np.ndarray
+    t_downlink: np.ndarray
+    sat_downlink: np.ndarray
+    station: np.ndarray
+    delivery_latency_s: np.ndarray
+
+    def __len__(self):
+        return len(self.t_entry)
+
+    @property
+    def detected(self) -> np.ndarray:
+        return self.sat_detect > 0
+
+    @property
+    def delivered(self) -> np.ndarray:
+        return self.sat_downlink > 0
+
+
+def batch_latency(scenario: Scenario, t_entry, t_exit,
+                  eez: Union[str, Iterable[str]],
+                  delivery: Optional[str] = SAME_SAT,
+                  stations: Optional[Iterable[str]] = None) -> LatencyBatch:
+    """
+    Detection and delivery latency for many EEZ entry events at once.
+
+    Detection follows the latency scripts: the earliest pass of any
+    satellite starting inside [t_entry, t_exit], ties to the lowest
+    satellite. Delivery is the first ground-station pass starting at or
+    after the detection time, on the detecting satellite (SAME_SAT) or on
+    any satellite (ANY_SAT); None skips it. Each EEZ costs one
+    searchsorted over its pass index, and delivery one per satellite.
+    """
+    t_entry = np.asarray(t_entry, dtype=np.float64)
+    t_exit = np.asarray(t_exit, dtype=np.float64)
+    n = len(t_entry)
+    if isinstance(eez, str):
+        eez = np.full(n, eez, dtype=object)
+    else:
+        eez = np.asarray(list(eez), dtype=object)
+    if len(t_exit) != n or len(eez) != n:
+        raise ValueError("t_entry, t_exit and eez must have the same length")
+    if delivery not in (SAME_SAT, ANY_SAT, None):
+        raise ValueError(f"Unknown delivery model: {delivery}")
+
+    t_detect = np.full(n, np.nan)
+    sat_detect = np.zeros(n, dtype=np.int64)
+    for name in np.unique(eez).tolist():
+        q = np.flatnonzero(eez == name)
+        index = scenario.eez_index(name)
+        pos = index.earliest_start_in_many(t_entry[q], t_exit[q])
+        hit = pos >= 0
+        t_detect[q[hit]] = index.g_start[pos[hit]]
+        sat_detect[q[hit]] = index.g_block[pos[hit]] + 1
+
+    t_downlink = np.full(n, np.nan)
+    sat_downlink = np.zeros(n, dtype=np.int64)
+    station = np.full(n, "", dtype=object)
+    if delivery is not None:
+        dl = scenario.downlink_index()
+        q = np.flatnonzero(sat_detect > 0)
+        sat_block = sat_detect[q] - 1 if delivery == SAME_SAT else None
+        pos = dl.earliest_after_many(t_detect[q], sat_block, stations)
+        hit = pos >= 0
+        q, pos = q[hit], pos[hit]
+        t_downlink[q] = dl.g_start[pos]
+        sat_downlink[q] = dl.g_block[pos] + 1
+        station[q] = np.asarray(dl.stations, dtype=object)[dl.g_rank[pos]]
+
+    return LatencyBatch(
+        t_entry=t_entry,
+        t_exit=t_exit,
+        eez=eez,
+        t_detect=t_detect,
+        sat_detect=sat_detect,
+        detect_latency_s=t_detect - t_entry,
+        t_downlink=t_downlink,
+        sat_downlink=sat_downlink,
+        station=station,
+        delivery_latency_s=t_downlink - t_detect,
+    )
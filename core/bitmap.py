@@ -0,0 +1,193 @@
+from typing import Optional
+
+import numpy as np
+
+from access_table import AccessTable
+from constants import BITMAP_RESOLUTION_S
+from intervals import merge_union
+
+_WORD_BITS = 64
+
+if hasattr(np, "bitwise_count"):
+    def _popcount(words):
+        return np.bitwise_count(words).sum(axis=-1, dtype=np.int64)
+else:  # numpy < 2.0
+    _BYTE_COUNTS = np.array([bin(i).count("1") for i in range(256)], dtype=np.int64)
+
+    def _popcount(words):
+        return _BYTE_COUNTS[words.view(np.uint8)].sum(axis=-1)
+
+
+def _pack(covered: np.ndarray) -> np.ndarray:
+    # Bool slots -> uint64 words, slot j in bit j % 64 of word j // 64.
+    n_words = -(-covered.shape[-1] // _WORD_BITS)
+    pad = n_words * _WORD_BITS - covered.shape[-1]
+    if pad:
+        widths = [(0, 0)] * (covered.ndim - 1) + [(0, pad)]
+        covered = np.pad(covered, widths)
+    packed = np.packbits(covered, axis=-1, bitorder="little")
+    return packed.view(np.uint64)
+
+
+class CoverageBitmap:
+    """
+    Coverage on a fixed time grid, packed 64 slots per uint64 word.
+
+    Slot j stands for [t0 + j*res, t0 + (j+1)*res) and is set when any
+    access interval touches it, so bitmap coverage errs on the covered
+    side by up to one slot at each edge. words has one row per satellite
+    (or a single row); union, intersection and counting work on whole
+    words.
+    """
+
+    def __init__(self, words: np.ndarray, n_slots: int, t0: float,
+                 resolution_s: float):
+        self.words = np.atleast_2d(words)
+        self.n_slots = int(n_slots)
+        self.t0 = float(t0)
+        self.resolution_s = float(resolution_s)
+
+    # ---------- build ----------
+
+    @classmethod
+    def from_intervals(cls, start_s, stop_s, t0: float, t1: float,
+                       resolution_s: float = BITMAP_RESOLUTION_S) -> "CoverageBitmap":
+        """Single-row bitmap of the union of [start_s, stop_s] on [t0, t1)."""
+        n_slots = max(int(np.ceil((t1 - t0) / resolution_s)), 0)
+        cov_start, cov_stop = merge_union(start_s, stop_s)
+        a = np.floor((cov_start - t0) / resolution_s).astype(np.int64)
+        b = np.ceil((cov_stop - t0) / resolution_s).astype(np.int64)
+        b = np.maximum(b, a + 1)  # zero-length passes still mark their slot
+        a, b = merge_union(np.clip(a, 0, n_slots), np.clip(b, 0, n_slots))
+        keep = b > a
+        a, b = a[keep].astype(np.int64), b[keep].astype(np.int64)
+
+        # Disjoint, non-touching slot ranges: one +1/-1 pair each.
+        diff = np.zeros(n_slots + 1, dtype=np.int8)
+        diff[a] = 1
+        diff[b] -= 1
+        covered = np.cumsum(diff[:-1], dtype=np.int8).astype(bool)
+        return cls(_pack(covered), n_slots, t0, resolution_s)
+
+    @classmethod
+    def from_table(cls, table: AccessTable, t0: Optional[float] = None,
+                   t1: Optional[float] = None,
+                   resolution_s: float = BITMAP_RESOLUTION_S) -> "CoverageBitmap":
+        """
+        One row per block (satellite) of a parse_blocked_access table. The
+        grid defaults to the whole-second span of the table.
+        """
+        if t0 is None:
+            t0 = float(np.floor(table.start_s.min())) if len(table) else 0.0
+        if t1 is None:
+            t1 = float(np.ceil(table.stop_s.max())) if len(table) else t0
+        rows = [
+            cls.from_intervals(*table.block_arrays(k), t0, t1, resolution_s).words[0]
+            for k in range(table.n_blocks)
+        ]
+        n_slots = max(int(np.ceil((t1 - t0) / resolution_s)), 0)
+        words = np.vstack(rows) if rows else np.zeros((0, -(-n_slots // _WORD_BITS)), np.uint64)
+        return cls(words, n_slots, t0, resolution_s)
+
+    def _like(self, words) -> "CoverageBitmap":
+        return CoverageBitmap(words, self.n_slots, self.t0, self.resolution_s)
+
+    def _check_grid(self, other: "CoverageBitmap"):
+        if (self.n_slots, self.t0, self.resolution_s) != (
+            other.n_slots, other.t0, other.resolution_s
+        ):
+            raise ValueError("Bitmaps are on different time grids")
+
+    # ---------- set algebra ----------
+
+    @property
+    def n_rows(self) -> int:
+        return self.words.shape[0]
+
+    def __len__(self):
+        return self.n_rows
+
+    def __repr__(self):
+        return (
+            f"CoverageBitmap({self.n_rows} rows, {self.n_slots} slots of "
+            f"{self.resolution_s:g} s)"
+        )
+
+    def __getitem__(self, k) -> "CoverageBitmap":
+        """Row(s) k, e.g. one satellite or a subset of satellites."""
+        return self._like(self.words[k])
+
+    def __or__(self, other: "CoverageBitmap") -> "CoverageBitmap":
+        self._check_grid(other)
+        return self._like(self.words | other.words)
+
+    def __and__(self, other: "CoverageBitmap") -> "CoverageBitmap":
+        self._check_grid(other)
+        return self._like(self.words & other.words)
+
+    def __invert__(self) -> "CoverageBitmap":
+        words = ~self.words
+        tail = self.n_slots % _WORD_BITS
+        if tail and words.shape[-1]:
+            words[:, -1] &= np.uint64((1 << tail) - 1)
+        return self._like(words)
+
+    def union(self) -> "CoverageBitmap":
+        """Slots covered by any row."""
+        if self.n_rows == 0:
+            return self._like(np.zeros((1, self.words.shape[-1]), np.uint64))
+        return self._like(np.bitwise_or.reduce(self.words, axis=0))
+
+    def intersection(self) -> "CoverageBitmap":
+        """Slots covered by every row."""
+        if self.n_rows == 0:
+            return ~self._like(np.zeros((1, self.words.shape[-1]), np.uint64))
+        return self._like(np.bitwise_and.reduce(self.words, axis=0))
+
+    # ---------- measures ----------
+
+    def count(self) -> np.ndarray:
+        """Covered slots per row."""
+        return _popcount(self.words)
+
+    def coverage_fraction(self) -> np.ndarray:
+        """Covered fraction of the grid, per row."""
+        return self.count() / self.n_slots if self.n_slots else np.zeros(self.n_rows)
+
+    def to_bool(self) -> np.ndarray:
+        bits = np.unpackbits(self.words.view(np.uint8), axis=-1, bitorder="little")
+        return bits[:, :self.n_slots].astype(bool)
+
+    def intervals(self, row: int = 0):
+        """
+        Covered runs of one row as (start_s, stop_s) arrays, so the interval
+        code (revisit_stats, detection_latency_distribution) runs on it.
+        """
+        bits = self.to_bool()[row].astype(np.int8)
+        edges = np.diff(bits, prepend=0, append=0)
+        first = np.flatnonzero(edges == 1)
+        last = np.flatnonzero(edges == -1)
+        return (
+            self.t0 + first * self.resolution_s,
+            self.t0 + last * self.resolution_s,
+        )
+
+    def gaps(self, row: int = 0) -> np.ndarray:
+        """Run-length gaps (seconds) between covered runs of one row."""
+        start_s, stop_s = self.intervals(row)
+        return start_s[1:] - stop_s[:-1]
+
+    def first_covered(self, t_in, t_out, row: int = 0) -> np.ndarray:
+        """
+        Earliest covered time in [t_in, t_out] (Phase 4 overlap rule at
+        grid resolution), vectorised; NaN where the window is never covered.
+        """
+        start_s, stop_s = self.intervals(row)
+        t_in = np.asarray(t_in, dtype=np.float64)
+        t_out = np.asarray(t_out, dtype=np.float64)
+        i = np.searchsorted(stop_s, t_in, side="right")
+        if len(start_s) == 0:
+            return np.full(t_in.shape, np.nan)
+        j = np.minimum(i, len(start_s) - 1)
+        t = np.maximum(start_s[j], t_in)
+        return np.where((i < len(start_s)) & (t <= t_out), t, np.nan)
@@ -0,0 +1,273 @@
+import csv
+from pathlib import Path
+from typing import Iterable, Optional
+
+import numpy as np
+
+from access_table import AccessTable
+from parsers import _decode_rows, _walk_blocks, count_blocks
+
+# Bump when the sidecar layout changes; older sidecars are rebuilt.
+INDEX_FORMAT = 2
+
+# Rows between seek checkpoints inside a block.
+INDEX_STRIDE = 256
+
+
+def index_path_for(path) -> Path:
+    """Sidecar location: "<export>.csv.blkidx.npz" next to the export."""
+    path = Path(path)
+    return path.with_name(path.name + ".blkidx.npz")
+
+
+class BlockIndex:
+    """
+    Byte-offset index of the stacked blocks in one STK export.
+
+    For each block k it records the byte range [offset[k], end[k]) of its
+    access rows, the row count and the time span [t_min[k], t_max[k]].
+    There is one block per "Access / Start Time" header, so satellites
+    without passes, trailing ones included, are counted (as in
+    parsers.count_blocks and access_store).
+    Every INDEX_STRIDE rows a checkpoint stores the byte offset plus the
+    running max stop time and the trailing min start time, so a time-window
+    read can seek past rows that cannot overlap the window.
+    """
+
+    def __init__(self, source_size, source_mtime_ns, stride, offset, end,
+                 n_rows, t_min, t_max, ck_ptr, ck_offset, ck_stop_max,
+                 ck_start_min):
+        self.source_size = int(source_size)
+        self.source_mtime_ns = int(source_mtime_ns)
+        self.stride = int(stride)
+        self.offset = np.asarray(offset, dtype=np.int64)
+        self.end = np.asarray(end, dtype=np.int64)
+        self.n_rows = np.asarray(n_rows, dtype=np.int64)
+        self.t_min = np.asarray(t_min, dtype=np.float64)
+        self.t_max = np.asarray(t_max, dtype=np.float64)
+        self.ck_ptr = np.asarray(ck_ptr, dtype=np.int64)
+        self.ck_offset = np.asarray(ck_offset, dtype=np.int64)
+        self.ck_stop_max = np.asarray(ck_stop_max, dtype=np.float64)
+        self.ck_start_min = np.asarray(ck_start_min, dtype=np.float64)
+
+    @property
+    def n_blocks(self) -> int:
+        return len(self.offset)
+
+    # ---------- build / persist ----------
+
+    @classmethod
+    def build(cls, path, stride: int = INDEX_STRIDE) -> "BlockIndex":
+        """Scan an export once, recording where each block's rows live."""
+        path = Path(path)
+        st = path.stat()
+        pos = 0
+        line_start = 0
+
+        def lines():
+            nonlocal pos, line_start
+            with path.open("rb") as f:
+                for raw in f:
+                    line_start = pos
+                    pos += len(raw)
+                    yield raw.decode("utf-8")
+
+        block_ids, row_offsets, row_ends, rows = [], [], [], []
+        for block_id, row in _walk_blocks(csv.reader(lines())):
+            block_ids.append(block_id)
+            row_offsets.append(line_start)
+            row_ends.append(pos)
+            rows.append(row)
+
+        block_ids = np.asarray(block_ids, dtype=np.int64)
+        row_offsets = np.asarray(row_offsets, dtype=np.int64)
+        row_ends = np.asarray(row_ends, dtype=np.int64)
+        starts, stops, _ = _decode_rows(rows)
+
+        n_blocks = count_blocks(path)
+        bounds = np.searchsorted(block_ids, np.arange(n_blocks + 1))
+
+        offset = np.zeros(n_blocks, dtype=np.int64)
+        end = np.zeros(n_blocks, dtype=np.int64)
+        t_min = np.full(n_blocks, np.inf)
+        t_max = np.full(n_blocks, -np.inf)
+        ck_ptr = [0]
+        ck_offset, ck_stop_max, ck_start_min = [], [], []
+
+        for k in range(n_blocks):
+            lo, hi = bounds[k], bounds[k + 1]
+            if lo == hi:
+                ck_ptr.append(ck_ptr[-1])
+                continue
+            offset[k] = row_offsets[lo]
+            end[k] = row_ends[hi - 1]
+            t_min[k] = starts[lo:hi].min()
+            t_max[k] = stops[lo:hi].max()
+
+            firsts = np.arange(lo, hi, stride)
+            ck_offset.append(row_offsets[firsts])
+            ck_stop_max.append(
+                np.maximum.accumulate(np.maximum.reduceat(stops[lo:hi], firsts - lo))
+            )
+            ck_start_min.append(
+                np.minimum.accumulate(
+                    np.minimum.reduceat(starts[lo:hi], firsts - lo)[::-1]
+                )[::-1]
+            )
+            ck_ptr.append(ck_ptr[-1] + len(firsts))
+
+        def cat(parts, dtype):
+            return np.concatenate(parts) if parts else np.zeros(0, dtype=dtype)
+
+        return cls(
+            st.st_size,
+            st.st_mtime_ns,
+            stride,
+            offset,
+            end,
+            np.diff(bounds),
+            t_min,
+            t_max,
+            ck_ptr,
+            cat(ck_offset, np.int64),
+            cat(ck_stop_max, np.float64),
+            cat(ck_start_min, np.float64),
+        )
+
+    def save(self, index_path):
+        meta = np.array(
+            [INDEX_FORMAT, self.source_size, self.source_mtime_ns, self.stride],
+            dtype=np.int64,
+        )
+        with open(index_path, "wb") as f:
+            np.savez(
+                f,
+                meta=meta,
+                offset=self.offset,
+                end=self.end,
+                n_rows=self.n_rows,
+                t_min=self.t_min,
+                t_max=self.t_max,
+                ck_ptr=self.ck_ptr,
+                ck_offset=self.ck_offset,
+                ck_stop_max=self.ck_stop_max,
+                ck_start_min=self.ck_start_min,
+            )
+
+    @classmethod
+    def load(cls, index_path) -> Optional["BlockIndex"]:
+        """Read a sidecar; None if it is missing, unreadable or outdated."""
+        try:
+            with np.load(index_path) as d:
+                fmt, size, mtime_ns, stride = d["meta"].tolist()
+                if fmt != INDEX_FORMAT:
+                    return None
+                return cls(
+                    size, mtime_ns, stride, d["offset"], d["end"], d["n_rows"],
+                    d["t_min"], d["t_max"], d["ck_ptr"], d["ck_offset"],
+                    d["ck_stop_max"], d["ck_start_min"],
+                )
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def is_stale(self, path) -> bool:
+        st = Path(path).stat()
+        return (
+            st.st_size != self.source_size or st.st_mtime_ns != self.source_mtime_ns
+        )
+
+    # ---------- byte ranges ----------
+
+    def window_range(self, block_id: int, t0: float, t1: float):
+        """
+        Byte range of block_id that can hold passes overlapping [t0, t1],
+        or None if the block has none.
+        """
+        if self.n_rows[block_id] == 0:
+            return None
+        if self.t_max[block_id] < t0 or self.t_min[block_id] > t1:
+            return None
+
+        lo, hi = self.ck_ptr[block_id], self.ck_ptr[block_id + 1]
+        stop_max = self.ck_stop_max[lo:hi]
+        start_min = self.ck_start_min[lo:hi]
+        # Chunks before j_lo end before t0; chunks after j_hi start after t1.
+        j_lo = int(np.searchsorted(stop_max, t0, side="left"))
+        j_hi = int(np.searchsorted(start_min, t1, side="right")) - 1
+        if j_lo >= hi - lo or j_hi < j_lo:
+            return None
+
+        start = self.ck_offset[lo + j_lo]
+        stop = (
+            self.ck_offset[lo + j_hi + 1]
+            if lo + j_hi + 1 < hi
+            else self.end[block_id]
+        )
+        return int(start), int(stop)
+
+
+def get_block_index(path, rebuild: bool = False) -> BlockIndex:
+    """
+    Load the sidecar index of an export, (re)building it when missing or
+    when the export's size or mtime no longer match.
+    """
+    path = Path(path)
+    index_path = index_path_for(path)
+    index = None if rebuild else BlockIndex.load(index_path)
+    if index is None or index.is_stale(path):
+        index = BlockIndex.build(path)
+        try:
+            index.save(index_path)
+        except OSError:
+            pass  # read-only data directory: keep the in-memory index
+    return index
+
+
+def _read_range(path: Path, start: int, stop: int, block_id: int,
+                n_blocks: int) -> AccessTable:
+    with path.open("rb") as f:
+        f.seek(start)
+        data = f.read(stop - start)
+    rows = [r for r in csv.reader(data.decode("utf-8").splitlines()) if r]
+    starts, stops, durs = _decode_rows(rows)
+    return AccessTable(
+        np.full(len(rows), block_id), starts, stops, durs, n_blocks=n_blocks
+    )
+
+
+def load_block(path, block_id: int, index: Optional[BlockIndex] = None) -> AccessTable:
+    """All passes of one block, read by seeking straight to its rows."""
+    path = Path(path)
+    index = index or get_block_index(path)
+    if not 0 <= block_id < index.n_blocks or index.n_rows[block_id] == 0:
+        return AccessTable.empty(index.n_blocks)
+    return _read_range(
+        path, index.offset[block_id], index.end[block_id], block_id, index.n_blocks
+    )
+
+
+def load_window(path, t0: float, t1: float,
+                block_ids: Optional[Iterable[int]] = None,
+                index: Optional[BlockIndex] = None) -> AccessTable:
+    """
+    Passes overlapping [t0, t1] (start_s <= t1 and stop_s >= t0), reading
+    only the checkpoint ranges of blocks whose time span meets the window.
+    """
+    path = Path(path)
+    index = index or get_block_index(path)
+    if block_ids is None:
+        block_ids = range(index.n_blocks)
+
+    parts = []
+    for k in block_ids:
+        if not 0 <= k < index.n_blocks:
+            continue
+        rng = index.window_range(k, t0, t1)
+        if rng is None:
+            continue
+        part = _read_range(path, rng[0], rng[1], k, index.n_blocks)
+        parts.append(part.overlapping(t0, t1))
+
+    if not parts:
+        return AccessTable.empty(index.n_blocks)
+    return AccessTable.concat(parts)
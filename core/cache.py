@@ -0,0 +1,120 @@
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+
+from constants import CACHE_DIR, CACHE_MAX_BYTES
+
+# Bump when the parsed layout changes so stale entries are never served.
+CACHE_FORMAT = 1
+
+
+class ParseCache:
+    """
+    On-disk cache of parsed STK exports.
+
+    Each entry is one .npz holding the arrays parsed from a CSV. Entries are
+    keyed by the resolved path plus either (size, mtime) or a SHA-1 of the
+    file contents, so edited exports are reparsed automatically. Entry file
+    mtimes double as LRU timestamps: hits touch the entry, and writes evict
+    the least recently used entries until the directory fits in max_bytes.
+    """
+
+    def __init__(self, root=CACHE_DIR, max_bytes: int = CACHE_MAX_BYTES,
+                 key_mode: str = "mtime"):
+        if key_mode not in ("mtime", "content"):
+            raise ValueError(f"Unknown key_mode: {key_mode}")
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.key_mode = key_mode
+
+    def key(self, path) -> str:
+        path = Path(path).resolve()
+        h = hashlib.sha1(f"{CACHE_FORMAT}|{path}".encode())
+        if self.key_mode == "content":
+            with path.open("rb") as f:
+                for chunk in iter(lambda: f.read(1 << 20), b""):
+                    h.update(chunk)
+        else:
+            st = path.stat()
+            h.update(f"|{st.st_size}|{st.st_mtime_ns}".encode())
+        return h.hexdigest()
+
+    def _entry(self, path) -> Path:
+        return self.root / f"{self.key(path)}.npz"
+
+    def get(self, path) -> Optional[Dict[str, np.ndarray]]:
+        entry = self._entry(path)
+        try:
+            with np.load(entry) as data:
+                arrays = {name: data[name] for name in data.files}
+        except (OSError, ValueError, KeyError):
+            return None
+        try:
+            os.utime(entry)
+        except OSError:
+            pass
+        return arrays
+
+    def put(self, path, arrays: Dict[str, np.ndarray]):
+        self.root.mkdir(parents=True, exist_ok=True)
+        entry = self._entry(path)
+        fd, tmp = tempfile.mkstemp(dir=self.root, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.savez(f, **arrays)
+            os.replace(tmp, entry)
+        except BaseException:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+            raise
+        self.evict()
+
+    def evict(self):
+        """Drop least recently used entries until the cache fits max_bytes."""
+        entries = []
+        for p in self.root.glob("*.npz"):
+            try:
+                st = p.stat()
+            except OSError:
+                continue
+            entries.append((st.st_mtime_ns, st.st_size, p))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, p in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                p.unlink()
+            except OSError:
+                continue
+            total -= size
+
+    def clear(self):
+        for p in self.root.glob("*.npz"):
+            p.unlink()
+
+
+def _cache_from_env() -> Optional[ParseCache]:
+    if os.environ.get("PIERSIGHT_CACHE", "1") == "0":
+        return None
+    root = os.environ.get("PIERSIGHT_CACHE_DIR", CACHE_DIR)
+    return ParseCache(root)
+
+
+_default_cache = _cache_from_env()
+
+
+def get_default_cache() -> Optional[ParseCache]:
+    return _default_cache
+
+
+def set_default_cache(cache: Optional[ParseCache]):
+    """Replace the cache used by core.parsers; None disables caching."""
+    global _default_cache
+    _default_cache = cache
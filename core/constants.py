@@ -1,7 +1,41 @@
 from datetime import datetime
+from pathlib import Path
 
 # Scenario start time (STK)
 SCEN_START = datetime(2026, 1, 1, 0, 0, 0)
 
+# Scenario length (STK analysis period 1 Jan 2026 00:00 - 2 Jan 2026 00:00)
+SCEN_DURATION_S = 86400.0
+
 # STK UTCG time format, e.g. "1 Jan 2026 08:42:10.037"
 TIME_FMT = "%d %b %Y %H:%M:%S.%f"
+
+# On-disk cache of parsed STK exports (core/cache.py); override with the
+# PIERSIGHT_CACHE_DIR environment variable, disable with PIERSIGHT_CACHE=0.
+CACHE_DIR = Path(__file__).resolve().parent.parent / ".piersight_cache"
+CACHE_MAX_BYTES = 512 * 1024**2
+
+# Rows per chunk yielded by parsers.iter_blocked_access.
+STREAM_CHUNK_ROWS = 65536
+
+# Memory-mappable binary access stores (core/access_store.py).
+STORE_SUFFIX = ".pstore"
+
+# Revisit gap histograms (core/revisit.py): fixed bin width in seconds.
+REVISIT_BIN_WIDTH_S = 600.0
+
+# Detection-latency threshold reported by the revisit scripts (10 min).
+DETECT_LATENCY_THRESHOLD_S = 600.0
+
+# Default slot width of coverage bitmaps (core/bitmap.py), seconds.
+BITMAP_RESOLUTION_S = 10.0
+
+# Step between rolling revisit windows (core/revisit.py), seconds.
+PROFILE_STEP_S = 600.0
+
+# Ground-station downlink model (core/downlink_sim.py).
+DOWNLINK_RATE_MBPS = 300.0
+ANTENNAS_PER_STATION = 1
+
+# Default onboard product storage per satellite (core/storage.py).
+ONBOARD_STORAGE_GB = 128.0
@@ -0,0 +1,163 @@
+import csv
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+import numpy as np
+
+from constants import DETECT_LATENCY_THRESHOLD_S
+from downlink_index import NextDownlink
+from outage import CoverageTimeline
+from parsers import _to_seconds
+from revisit import detection_latency_distribution, gap_stats
+from scenario import Scenario
+
+
+class Tranche(NamedTuple):
+    name: str
+    activate_s: float  # seconds since SCEN_START
+    sat_blocks: tuple  # 0-based block ids that become active
+
+
+def load_schedule(path, n_sats: int) -> List[Tranche]:
+    """
+    Read a deployment schedule CSV with columns
+
+        tranche, activate_utc, satellites
+
+    activate_utc in STK UTCG format ("1 Jan 2026 06:00:00.000") and
+    satellites as space-separated 1-based satellite numbers in 1..n_sats.
+    A satellite listed twice, in one tranche or across tranches, is
+    rejected with a ValueError naming the tranche.
+    """
+    tranches = []
+    seen = {}  # satellite number -> tranche that activates it
+    with Path(path).open(newline="") as f:
+        for row in csv.DictReader(f):
+            name = row["tranche"]
+            numbers = [int(s) for s in row["satellites"].split()]
+            for sat in numbers:
+                if not 1 <= sat <= n_sats:
+                    raise ValueError(
+                        f"tranche {name!r}: satellite {sat} outside 1..{n_sats}"
+                    )
+                if sat in seen:
+                    raise ValueError(
+                        f"tranche {name!r}: satellite {sat} already activated "
+                        f"by tranche {seen[sat]!r}"
+                    )
+                seen[sat] = name
+            sats = tuple(s - 1 for s in numbers)
+            tranches.append(
+                Tranche(name, _to_seconds(row["activate_utc"]), sats)
+            )
+    return sorted(tranches, key=lambda t: t.activate_s)
+
+
+class DeploymentTimeline:
+    """
+    Coverage and downlink opportunities of a constellation being built up.
+
+    EEZ timelines start empty; activate() folds one tranche's passes into
+    them (CoverageTimeline.add, only that tranche's segments) and merges
+    the tranche's ground-station pass starts into the downlink timeline,
+    so nothing is rebuilt from the full pass lists as tranches arrive.
+    """
+
+    def __init__(self, scenario: Scenario, eez_names: Optional[Iterable[str]] = None):
+        self.scenario = scenario
+        self.eez_names = list(eez_names or scenario.eez_files)
+        self.timelines = {
+            eez: CoverageTimeline(scenario.eez_passes(eez), active=False)
+            for eez in self.eez_names
+        }
+        dl = scenario.downlink_index()
+        order = np.argsort(dl.g_block, kind="stable")
+        bounds = np.searchsorted(dl.g_block[order], np.arange(scenario.n_sats + 1))
+        self._gs_starts = [
+            np.sort(dl.g_start[order[bounds[k]:bounds[k + 1]]])
+            for k in range(scenario.n_sats)
+        ]
+        self.downlink_starts = np.zeros(0)
+        self.active = set()
+
+    def activate(self, sat_blocks: Iterable[int]):
+        new = [k for k in sat_blocks if k not in self.active]
+        for k in new:
+            for tl in self.timelines.values():
+                if k < tl.n_sats:
+                    tl.add(k)
+        if new:
+            # Sorted merge of the new satellites' downlink starts.
+            self.downlink_starts = np.union1d(
+                self.downlink_starts,
+                np.concatenate([self._gs_starts[k] for k in new]),
+            )
+        self.active.update(new)
+
+    def window_metrics(self, t0: float, t1: float) -> Dict:
+        """
+        Revisit, detection latency (entry uniform on [t0, t1]) and delivery
+        latency (detection uniform on [t0, t1], any active satellite) for the
+        currently active satellites. Revisit gaps are the uncovered stretches
+        of the window, including those cut by its edges, so a window with no
+        coverage reports one gap of its full length.
+        """
+        row = {"t_start_s": t0, "t_stop_s": t1, "n_active": len(self.active)}
+        for eez, tl in self.timelines.items():
+            coverage = tl.coverage()
+            in_window = coverage.clip(t0, t1)
+            holes = in_window.complement(t0, t1)
+            stats = gap_stats(holes.stop_s - holes.start_s)
+            latency = detection_latency_distribution(
+                coverage.start_s, coverage.stop_s, t0, t1
+            )
+            row.update({
+                f"{eez}_coverage_fraction": in_window.measure() / (t1 - t0),
+                f"{eez}_mean_revisit_s": stats.mean_s,
+                f"{eez}_p95_revisit_s": stats.percentile(95),
+                f"{eez}_max_revisit_s": stats.max_s,
+                f"{eez}_mean_detect_latency_s": latency.mean_s,
+                f"{eez}_p95_detect_latency_s": float(latency.percentile(95)),
+                f"{eez}_p_detect_over_10min": float(
+                    latency.sf(DETECT_LATENCY_THRESHOLD_S)
+                ),
+            })
+
+        delivery = NextDownlink(self.downlink_starts).distribution(t0, t1)
+        row["mean_delivery_latency_s"] = delivery.mean_s
+        row["p95_delivery_latency_s"] = float(delivery.percentile(95))
+        return row
+
+
+def simulate_deployment(scenario: Scenario, schedule: List[Tranche],
+                        t_end: Optional[float] = None,
+                        step_s: Optional[float] = None) -> List[Dict]:
+    """
+    Metrics over time as the tranches of `schedule` come online.
+
+    Each tranche is active from its activate_s until the next tranche (the
+    last one until t_end, default the last EEZ pass stop). Rows cover one
+    tranche period each, or bins of step_s seconds within the periods.
+    """
+    schedule = sorted(schedule, key=lambda t: t.activate_s)
+    if t_end is None:
+        t_end = max(
+            float(scenario.eez_passes(eez).stop_s.max())
+            for eez in scenario.eez_files
+            if len(scenario.eez_passes(eez))
+        )
+
+    deployment = DeploymentTimeline(scenario)
+    rows = []
+    for i, tranche in enumerate(schedule):
+        deployment.activate(tranche.sat_blocks)
+        start = tranche.activate_s
+        stop = schedule[i + 1].activate_s if i + 1 < len(schedule) else t_end
+        if stop <= start:
+            continue
+        edges = [start, stop] if step_s is None else list(np.arange(start, stop, step_s)) + [stop]
+        for t0, t1 in zip(edges[:-1], edges[1:]):
+            row = {"tranche": tranche.name}
+            row.update(deployment.window_metrics(float(t0), float(t1)))
+            rows.append(row)
+    return rows
@@ -0,0 +1,214 @@
+from bisect import bisect_left
+from typing import Dict, Iterable, NamedTuple, Optional
+
+import numpy as np
+
+from access_table import AccessTable
+from revisit import LatencyDistribution, detection_latency_distribution
+
+
+class Downlink(NamedTuple):
+    station: str
+    sat_block: int  # 0-based block id (satellite index - 1)
+    start_s: float
+    stop_s: float
+
+
+class NextDownlink:
+    """
+    Time to the next downlink, W(t) = (first pass start >= t) - t.
+
+    W is piecewise linear with slope -1 between consecutive pass starts,
+    so it is stored as its sorted breakpoints. Evaluation is one
+    searchsorted over any array of times, and the distribution of W over
+    a time window (mean, max, exact percentiles) is closed form.
+    """
+
+    def __init__(self, start_s):
+        self.start_s = np.unique(np.asarray(start_s, dtype=np.float64))
+
+    def __len__(self):
+        return len(self.start_s)
+
+    def __call__(self, t) -> np.ndarray:
+        """W(t) for an array of times; inf after the last downlink."""
+        t = np.asarray(t, dtype=np.float64)
+        i = np.searchsorted(self.start_s, t, side="left")
+        nxt = np.append(self.start_s, np.inf)[i]
+        return nxt - t
+
+    def distribution(self, t0: Optional[float] = None,
+                     t1: Optional[float] = None) -> LatencyDistribution:
+        """
+        Distribution of W(t) for t uniform on [t0, t1] (default: first to
+        last downlink start).
+        """
+        return detection_latency_distribution(self.start_s, None, t0, t1)
+
+
+class DownlinkIndex:
+    """
+    All ground-station passes of a constellation, merged once by start time.
+
+    Answers "earliest downlink starting at or after t" for any satellite or
+    for one satellite, optionally restricted to a subset of stations, with
+    one bisect per station list. Equal start times resolve the way min()
+    over the scripts' "Ahmedabad + Sriharikota" concatenation does: station
+    order first, then lowest satellite.
+    """
+
+    def __init__(self, stations: Dict[str, AccessTable]):
+        self.stations = list(stations)
+        self.n_sats = max((t.n_blocks for t in stations.values()), default=0)
+
+        rank = np.concatenate(
+            [np.full(len(t), r) for r, t in enumerate(stations.values())]
+            or [np.zeros(0, dtype=int)]
+        )
+        block = np.concatenate(
+            [t.block_id for t in stations.values()] or [np.zeros(0, dtype=int)]
+        )
+        start = np.concatenate(
+            [t.start_s for t in stations.values()] or [np.zeros(0)]
+        )
+        stop = np.concatenate([t.stop_s for t in stations.values()] or [np.zeros(0)])
+
+        # Inputs are already in (station, block, start) order, so a stable
+        # sort on start alone keeps the script tie-breaking.
+        order = np.argsort(start, kind="stable")
+        self.g_rank = rank[order]
+        self.g_block = block[order]
+        self.g_start = start[order]
+        self.g_stop = stop[order]
+
+        self._next = {}
+        self._sat_pos = [np.flatnonzero(self.g_block == k) for k in range(self.n_sats)]
+        self._all = self._lists(np.ones(len(order), dtype=bool))
+        self._by_sat = [self._lists(self.g_block == k) for k in range(self.n_sats)]
+        self._by_station = [
+            self._lists(self.g_rank == r) for r in range(len(self.stations))
+        ]
+        self._by_station_sat = [
+            [self._lists((self.g_rank == r) & (self.g_block == k))
+             for k in range(self.n_sats)]
+            for r in range(len(self.stations))
+        ]
+
+    def _lists(self, mask):
+        # Plain lists: bisect on a list is several times faster than
+        # np.searchsorted for a single scalar query.
+        return (
+            self.g_start[mask].tolist(),
+            self.g_stop[mask].tolist(),
+            self.g_rank[mask].tolist(),
+            self.g_block[mask].tolist(),
+        )
+
+    def __len__(self):
+        return len(self.g_start)
+
+    def __repr__(self):
+        return (
+            f"DownlinkIndex({len(self)} passes, {self.n_sats} sats, "
+            f"stations={self.stations})"
+        )
+
+    def _check_stations(self, stations: Iterable[str]) -> set:
+        wanted = set(stations)
+        unknown = wanted.difference(self.stations)
+        if unknown:
+            raise ValueError(f"Unknown ground station: {sorted(unknown)[0]}")
+        return wanted
+
+    def _first(self, lists, t: float) -> Optional[Downlink]:
+        starts = lists[0]
+        i = bisect_left(starts, t)
+        if i == len(starts):
+            return None
+        return Downlink(self.stations[lists[2][i]], lists[3][i], starts[i], lists[1][i])
+
+    def earliest_after(self, t: float, sat_block: Optional[int] = None,
+                       stations: Optional[Iterable[str]] = None) -> Optional[Downlink]:
+        """
+        Earliest downlink with start_s >= t, for any satellite (sat_block
+        None) or one satellite, over all stations or only those listed.
+        """
+        if sat_block is not None and not 0 <= sat_block < self.n_sats:
+            return None
+
+        if stations is None:
+            lists = self._all if sat_block is None else self._by_sat[sat_block]
+            return self._first(lists, t)
+
+        wanted = self._check_stations(stations)
+        best = None
+        for r, name in enumerate(self.stations):
+            if name not in wanted:
+                continue
+            lists = (
+                self._by_station[r]
+                if sat_block is None
+                else self._by_station_sat[r][sat_block]
+            )
+            dl = self._first(lists, t)
+            if dl is not None and (best is None or dl.start_s < best.start_s):
+                best = dl
+        return best
+
+    def earliest_after_many(self, t, sat_block=None,
+                            stations: Optional[Iterable[str]] = None) -> np.ndarray:
+        """
+        Vectorised earliest_after over an array of times.
+
+        sat_block is None (any satellite) or one block id per query (or a
+        scalar). Returns positions into g_start/g_stop/g_rank/g_block, -1
+        where no downlink follows.
+        """
+        t = np.asarray(t, dtype=np.float64)
+        out = np.full(t.shape, -1, dtype=np.int64)
+
+        keep = None
+        if stations is not None:
+            wanted = self._check_stations(stations)
+            ranks = [r for r, name in enumerate(self.stations) if name in wanted]
+            keep = np.isin(self.g_rank, ranks)
+
+        def search(pos, q):
+            if keep is not None:
+                pos = pos[keep[pos]]
+            if len(pos) == 0:
+                return
+            i = np.searchsorted(self.g_start[pos], t[q], side="left")
+            hit = i < len(pos)
+            out[q] = np.where(hit, pos[np.minimum(i, len(pos) - 1)], -1)
+
+        if sat_block is None:
+            search(np.arange(len(self.g_start)), slice(None))
+            return out
+
+        sats = np.broadcast_to(np.asarray(sat_block, dtype=np.int64), t.shape)
+        # Group queries by satellite: one searchsorted per satellite.
+        order = np.argsort(sats, kind="stable")
+        ks, first = np.unique(sats[order], return_index=True)
+        bounds = np.append(first, len(order))
+        for j, k in enumerate(ks.tolist()):
+            if 0 <= k < self.n_sats:
+                search(self._sat_pos[k], order[bounds[j]:bounds[j + 1]])
+        return out
+
+    def time_to_next(self, sat_block: Optional[int] = None,
+                     stations: Optional[Iterable[str]] = None) -> NextDownlink:
+        """Time-to-next-downlink function for one or all satellites, built once."""
+        key = (sat_block, None if stations is None else frozenset(stations))
+        fn = self._next.get(key)
+        if fn is None:
+            keep = np.ones(len(self.g_start), dtype=bool)
+            if sat_block is not None:
+                keep &= self.g_block == sat_block
+            if stations is not None:
+                wanted = self._check_stations(stations)
+                ranks = [r for r, name in enumerate(self.stations) if name in wanted]
+                keep &= np.isin(self.g_rank, ranks)
+            fn = NextDownlink(self.g_start[keep])
+            self._next[key] = fn
+        return fn
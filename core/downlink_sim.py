@@ -0,0 +1,222 @@
+import heapq
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+import numpy as np
+
+from access_table import AccessTable
+from constants import ANTENNAS_PER_STATION, DOWNLINK_RATE_MBPS
+from downlink_index import DownlinkIndex
+
+# Event kinds; at equal times a transfer finishing at the end of a pass
+# still counts, and passes close before new passes and products arrive.
+_TRANSFER_DONE, _PASS_END, _PASS_START, _DETECTION = range(4)
+
+
+@dataclass
+class DownlinkSimResult:
+    """Per-product outcome of a contention run (times in seconds)."""
+
+    t_detect: np.ndarray
+    sat_block: np.ndarray
+    volume_gb: np.ndarray
+    t_delivered: np.ndarray  # NaN if still onboard when the passes run out
+    station: np.ndarray  # station that delivered the last byte, "" if none
+    busy_s: Dict[str, float] = field(default_factory=dict)  # antenna time used
+    n_events: int = 0
+
+    def __len__(self):
+        return len(self.t_detect)
+
+    @property
+    def delivered(self) -> np.ndarray:
+        return ~np.isnan(self.t_delivered)
+
+    @property
+    def latency_s(self) -> np.ndarray:
+        return self.t_delivered - self.t_detect
+
+    def percentile(self, p) -> np.ndarray:
+        """Delivery-latency percentiles of the delivered products."""
+        lat = self.latency_s[self.delivered]
+        return np.percentile(lat, p) if len(lat) else np.full(np.shape(p), np.nan)
+
+
+class _Sat:
+    __slots__ = ("queue", "in_view", "link", "token", "started")
+
+    def __init__(self):
+        self.queue = deque()  # [remaining_gb, product index]
+        self.in_view = {}  # station -> pass stop
+        self.link = None  # station currently downlinking to
+        self.token = 0  # invalidates stale transfer events
+        self.started = 0.0  # start of the current transfer stretch
+
+
+def simulate_downlink(downlinks: DownlinkIndex, t_detect, sat_block, volume_gb,
+                      link_rate_mbps: float = DOWNLINK_RATE_MBPS,
+                      antennas: Optional[Dict[str, int]] = None) -> DownlinkSimResult:
+    """
+    Discrete-event simulation of product delivery through shared stations.
+
+    Products wait onboard the detecting satellite (FIFO). A satellite can
+    downlink while one of its ground-station passes is in progress and the
+    station has a free antenna (ANTENNAS_PER_STATION each unless given);
+    stations hand free antennas to waiting satellites in pass-start order.
+    A satellite with several stations in view takes the free one whose
+    pass ends first (ties by station name), using the closing window
+    before the longer ones.
+    A pass ending mid-product leaves the remainder for a later pass.
+    Events are kept in a binary heap.
+    """
+    t_detect = np.asarray(t_detect, dtype=np.float64)
+    sat_block = np.asarray(sat_block, dtype=np.int64)
+    volume_gb = np.broadcast_to(np.asarray(volume_gb, dtype=np.float64), t_detect.shape)
+    n = len(t_detect)
+    rate_gbps = link_rate_mbps / 8000.0
+
+    stations = downlinks.stations
+    free = {s: (antennas or {}).get(s, ANTENNAS_PER_STATION) for s in stations}
+    waiting = {s: [] for s in stations}  # satellites in view, pass-start order
+    busy = {s: 0.0 for s in stations}
+    sats = {}
+
+    t_delivered = np.full(n, np.nan)
+    delivered_by = np.full(n, "", dtype=object)
+
+    # Passes and detections are known up front: heapify them in one go.
+    events = [
+        (float(t), _PASS_START, i, (stations[r], int(k), float(stop)))
+        for i, (t, stop, r, k) in enumerate(
+            zip(downlinks.g_start.tolist(), downlinks.g_stop.tolist(),
+                downlinks.g_rank.tolist(), downlinks.g_block.tolist())
+        )
+    ]
+    events += [
+        (t, _DETECTION, i, None) for i, t in enumerate(t_detect.tolist())
+    ]
+    heapq.heapify(events)
+    seq = len(events)
+    n_events = 0
+
+    def sat_state(k):
+        s = sats.get(k)
+        if s is None:
+            s = sats[k] = _Sat()
+        return s
+
+    def start_transfer(now, k, sat, station):
+        nonlocal seq
+        free[station] -= 1
+        sat.link = station
+        sat.started = now
+        sat.token += 1
+        remaining, _ = sat.queue[0]
+        seq += 1
+        heapq.heappush(events, (now + remaining / rate_gbps, _TRANSFER_DONE, seq, (k, sat.token)))
+
+    def stop_transfer(now, sat):
+        # Account for the bytes sent since the transfer (re)started.
+        station = sat.link
+        sent = (now - sat.started) * rate_gbps
+        if sat.queue:
+            sat.queue[0][0] = max(sat.queue[0][0] - sent, 0.0)
+        busy[station] += now - sat.started
+        free[station] += 1
+        sat.link = None
+        sat.token += 1
+        return station
+
+    def assign(now, station):
+        # Hand free antennas of a station to idle satellites with data.
+        if free[station] <= 0:
+            return
+        for k in waiting[station]:
+            sat = sats[k]
+            if sat.link is None and sat.queue:
+                start_transfer(now, k, sat, station)
+                if free[station] <= 0:
+                    return
+
+    def try_any_station(now, k, sat):
+        # Visible pass ending first with a free antenna, ties by station name.
+        for station in sorted(sat.in_view, key=lambda s: (sat.in_view[s], s)):
+            if free[station] > 0:
+                start_transfer(now, k, sat, station)
+                return
+
+    while events:
+        now, kind, key, payload = heapq.heappop(events)
+        n_events += 1
+
+        if kind == _DETECTION:
+            k = int(sat_block[key])
+            sat = sat_state(k)
+            sat.queue.append([float(volume_gb[key]), key])
+            if sat.link is None and sat.in_view:
+                try_any_station(now, k, sat)
+
+        elif kind == _PASS_START:
+            station, k, stop = payload
+            sat = sat_state(k)
+            sat.in_view[station] = stop
+            waiting[station].append(k)
+            seq += 1
+            heapq.heappush(events, (stop, _PASS_END, seq, (station, k)))
+            if sat.link is None and sat.queue:
+                assign(now, station)
+
+        elif kind == _PASS_END:
+            station, k = payload
+            sat = sats[k]
+            sat.in_view.pop(station, None)
+            waiting[station].remove(k)
+            if sat.link == station:
+                stop_transfer(now, sat)
+                if sat.in_view:
+                    try_any_station(now, k, sat)
+                assign(now, station)
+
+        else:  # _TRANSFER_DONE
+            k, token = payload
+            sat = sats[k]
+            if token != sat.token:
+                continue
+            station = stop_transfer(now, sat)
+            _, i = sat.queue.popleft()
+            t_delivered[i] = now
+            delivered_by[i] = station
+            if sat.queue and station in sat.in_view:
+                start_transfer(now, k, sat, station)
+            else:
+                assign(now, station)
+
+    return DownlinkSimResult(
+        t_detect=t_detect,
+        sat_block=sat_block,
+        volume_gb=np.array(volume_gb),
+        t_delivered=t_delivered,
+        station=delivered_by,
+        busy_s=busy,
+        n_events=n_events,
+    )
+
+
+def sample_detections(eez_passes: AccessTable, n: int, delay_s: float = 0.0,
+                      seed: Optional[int] = None):
+    """
+    n synthetic detections: a pass drawn with probability proportional to
+    its duration, a uniform time inside it, plus a processing delay.
+    Returns (t_detect, sat_block) sorted by time.
+    """
+    rng = np.random.default_rng(seed)
+    dur = eez_passes.stop_s - eez_passes.start_s
+    if len(dur) == 0 or n == 0:
+        return np.zeros(0), np.zeros(0, dtype=np.int64)
+    cum = np.cumsum(dur)
+    j = np.searchsorted(cum, rng.uniform(0.0, cum[-1], n), side="right")
+    j = np.minimum(j, len(dur) - 1)
+    t = eez_passes.start_s[j] + rng.uniform(0.0, 1.0, n) * dur[j] + delay_s
+    order = np.argsort(t, kind="stable")
+    return t[order], eez_passes.block_id[j][order].astype(np.int64)
@@ -0,0 +1,120 @@
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from parsers import _load_blocks
+from scenario import Scenario
+
+# Filename families exported from the STK scenario.
+_WALKER_EEZ = re.compile(r"^Acess_(EEZ_\w+)-To-Satellite-Walker(\d+)\.csv$")
+_WALKER_GS = re.compile(r"^Acess_GS_(\w+)-To-Satellite-Walker(\d+)\.csv$")
+_BASELINE_EEZ = re.compile(r"^Acces_(EEZ_\w+)_All Satellite\.csv$")
+_BASELINE_GS = re.compile(r"^Acces_GS_(\w+)_All Satellite\.csv$")
+_SHIP = re.compile(r"^Access_Ship\w*\.csv$")
+
+BASELINE = "baseline"
+
+
+@dataclass
+class Export:
+    """One STK export file and what it holds."""
+
+    path: Path
+    kind: str  # "eez", "gs" or "ship"
+    constellation: Optional[str]  # "baseline", "walker12", ...; None for ships
+    target: str  # EEZ name, station name or ship file stem
+
+
+def classify_export(path) -> Optional[Export]:
+    """Classify an export by filename; None for files we do not read."""
+    path = Path(path)
+    name = path.name
+
+    m = _WALKER_EEZ.match(name)
+    if m:
+        return Export(path, "eez", f"walker{m.group(2)}", m.group(1))
+    m = _WALKER_GS.match(name)
+    if m:
+        return Export(path, "gs", f"walker{m.group(2)}", m.group(1))
+    m = _BASELINE_EEZ.match(name)
+    if m:
+        return Export(path, "eez", BASELINE, m.group(1))
+    m = _BASELINE_GS.match(name)
+    if m:
+        return Export(path, "gs", BASELINE, m.group(1))
+    if _SHIP.match(name):
+        return Export(path, "ship", None, path.stem)
+    return None
+
+
+def discover_exports(data_dir) -> List[Export]:
+    """Every recognised export in data_dir, sorted by filename."""
+    exports = []
+    for path in sorted(Path(data_dir).glob("*.csv")):
+        export = classify_export(path)
+        if export is not None:
+            exports.append(export)
+    return exports
+
+
+@dataclass
+class ScenarioBundle:
+    """All constellations found in one export directory."""
+
+    data_dir: Path
+    exports: List[Export]
+    scenarios: Dict[str, Scenario] = field(default_factory=dict)
+
+    def __getitem__(self, constellation: str) -> Scenario:
+        return self.scenarios[constellation]
+
+    def __iter__(self):
+        return iter(self.scenarios.items())
+
+
+def load_scenario_dir(data_dir, max_workers: Optional[int] = None) -> ScenarioBundle:
+    """
+    Discover and parse every export in data_dir concurrently.
+
+    Files are parsed in a process pool (through the on-disk parse cache),
+    so wall time tracks the largest file rather than the sum of all files.
+    Each constellation gets a Scenario whose memo is already filled;
+    ship exports are shared by all of them. max_workers=1 parses in
+    process.
+    """
+    data_dir = Path(data_dir)
+    exports = discover_exports(data_dir)
+    paths = [e.path for e in exports]
+
+    if max_workers is None:
+        max_workers = min(len(paths), os.cpu_count() or 1)
+    if max_workers <= 1 or len(paths) <= 1:
+        tables = [_load_blocks(p) for p in paths]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            tables = list(pool.map(_load_blocks, paths))
+    parsed = dict(zip(paths, tables))
+
+    bundle = ScenarioBundle(data_dir, exports)
+    constellations = sorted({e.constellation for e in exports if e.constellation})
+    for label in constellations:
+        members = [e for e in exports if e.constellation == label]
+        if label == BASELINE:
+            n_sats = max(parsed[e.path].n_blocks for e in members)
+            scenario = Scenario.baseline(data_dir, n_sats)
+        else:
+            scenario = Scenario.walker(data_dir, int(label[len("walker"):]))
+        for e in members:
+            if e.kind == "eez":
+                scenario.eez_files[e.target] = e.path.name
+            else:
+                scenario.gs_files[e.target] = e.path.name
+        for e in exports:
+            if e.constellation in (label, None):
+                scenario.preload(e.path, parsed[e.path])
+        bundle.scenarios[label] = scenario
+
+    return bundle
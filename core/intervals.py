@@ -0,0 +1,181 @@
+from typing import Iterable, Optional
+
+import numpy as np
+
+from access_table import AccessTable
+
+
+def merge_union(start_s, stop_s):
+    """
+    Merge intervals (any order) into sorted, disjoint coverage intervals.
+
+    Intervals that touch (next start == running stop) are merged, matching
+    the "gap > 0" rule of the revisit scripts.
+    """
+    start_s = np.asarray(start_s, dtype=np.float64)
+    stop_s = np.asarray(stop_s, dtype=np.float64)
+    if len(start_s) == 0:
+        return start_s, stop_s
+
+    order = np.argsort(start_s, kind="stable")
+    s = start_s[order]
+    e = np.maximum.accumulate(stop_s[order])
+
+    new = np.empty(len(s), dtype=bool)
+    new[0] = True
+    new[1:] = s[1:] > e[:-1]
+    first = np.flatnonzero(new)
+    last = np.append(first[1:] - 1, len(s) - 1)
+    return s[first], e[last]
+
+
+class IntervalSet:
+    """
+    Disjoint, sorted set of closed time intervals [start_s, stop_s].
+
+    The constructor normalises any input (any order, overlapping or
+    touching intervals are merged), so both start_s and stop_s are always
+    strictly increasing and every query is a binary search. Set operations
+    return new IntervalSets; intersection and difference drop zero-length
+    pieces, i.e. they work on covered time, not on single instants.
+    """
+
+    __slots__ = ("start_s", "stop_s")
+
+    def __init__(self, start_s=(), stop_s=(), normalized: bool = False):
+        start_s = np.asarray(start_s, dtype=np.float64)
+        stop_s = np.asarray(stop_s, dtype=np.float64)
+        if len(start_s) != len(stop_s):
+            raise ValueError("start_s and stop_s must have the same length")
+        if np.any(stop_s < start_s):
+            raise ValueError("Interval stops before it starts")
+        if not normalized:
+            start_s, stop_s = merge_union(start_s, stop_s)
+        self.start_s = start_s
+        self.stop_s = stop_s
+
+    @classmethod
+    def from_table(cls, table: AccessTable, block_id: Optional[int] = None) -> "IntervalSet":
+        """Coverage of all passes in a table, or of one block (satellite)."""
+        if block_id is None:
+            return cls(table.start_s, table.stop_s)
+        return cls(*table.block_arrays(block_id))
+
+    @classmethod
+    def from_dicts(cls, rows: Iterable[dict]) -> "IntervalSet":
+        """From the scripts' {"start_s", "stop_s", ...} dicts."""
+        rows = list(rows)
+        return cls([r["start_s"] for r in rows], [r["stop_s"] for r in rows])
+
+    def _new(self, start_s, stop_s) -> "IntervalSet":
+        return IntervalSet(start_s, stop_s, normalized=True)
+
+    # ---------- basics ----------
+
+    def __len__(self):
+        return len(self.start_s)
+
+    def __iter__(self):
+        return zip(self.start_s.tolist(), self.stop_s.tolist())
+
+    def __eq__(self, other):
+        if not isinstance(other, IntervalSet):
+            return NotImplemented
+        return np.array_equal(self.start_s, other.start_s) and np.array_equal(
+            self.stop_s, other.stop_s
+        )
+
+    def __repr__(self):
+        return f"IntervalSet({len(self)} intervals, {self.measure():.1f} s)"
+
+    @property
+    def span(self):
+        """(first start, last stop), or None when empty."""
+        if len(self) == 0:
+            return None
+        return float(self.start_s[0]), float(self.stop_s[-1])
+
+    def measure(self) -> float:
+        """Total covered time (seconds)."""
+        return float((self.stop_s - self.start_s).sum())
+
+    def gaps(self) -> np.ndarray:
+        """Positive gaps between consecutive intervals (revisit times)."""
+        return self.start_s[1:] - self.stop_s[:-1]
+
+    def contains(self, t) -> np.ndarray:
+        """Whether each time lies in some interval (closed ends)."""
+        return self.first_overlap(t, t) >= 0
+
+    # ---------- queries ----------
+
+    def first_overlap(self, t0, t1) -> np.ndarray:
+        """
+        Index of the first interval with start_s <= t1 and stop_s >= t0
+        (the scripts' overlap test), vectorised; -1 where none.
+        """
+        t0 = np.asarray(t0, dtype=np.float64)
+        t1 = np.asarray(t1, dtype=np.float64)
+        if len(self) == 0:
+            return np.full(np.broadcast(t0, t1).shape, -1, dtype=np.int64)
+        i = np.searchsorted(self.stop_s, t0, side="left")
+        j = np.minimum(i, len(self) - 1)
+        return np.where((i < len(self)) & (self.start_s[j] <= t1), i, -1)
+
+    def clip(self, t0: float, t1: float) -> "IntervalSet":
+        """The parts of the set inside [t0, t1]."""
+        lo = np.searchsorted(self.stop_s, t0, side="left")
+        hi = np.searchsorted(self.start_s, t1, side="right")
+        start = np.maximum(self.start_s[lo:hi], t0)
+        stop = np.minimum(self.stop_s[lo:hi], t1)
+        return self._new(start, stop)
+
+    # ---------- set algebra ----------
+
+    def union(self, other: "IntervalSet") -> "IntervalSet":
+        # Concatenate and re-merge: O((n + m) log(n + m)) in general. The
+        # inputs are two sorted runs, which numpy's stable sort handles
+        # well in practice, but no linear bound is promised here.
+        return IntervalSet(
+            np.concatenate([self.start_s, other.start_s]),
+            np.concatenate([self.stop_s, other.stop_s]),
+        )
+
+    def intersection(self, other: "IntervalSet") -> "IntervalSet":
+        # For each interval of self, the intervals of other that overlap
+        # it form one contiguous range [lo, hi).
+        lo = np.searchsorted(other.stop_s, self.start_s, side="left")
+        hi = np.searchsorted(other.start_s, self.stop_s, side="right")
+        counts = np.maximum(hi - lo, 0)
+        ia = np.repeat(np.arange(len(self)), counts)
+        ib = np.repeat(lo, counts) + (
+            np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        )
+        start = np.maximum(self.start_s[ia], other.start_s[ib])
+        stop = np.minimum(self.stop_s[ia], other.stop_s[ib])
+        keep = stop > start
+        return self._new(start[keep], stop[keep])
+
+    def complement(self, t0: float, t1: float) -> "IntervalSet":
+        """Uncovered time within the horizon [t0, t1]."""
+        if t1 <= t0:
+            return IntervalSet()
+        # Zero-length intervals cover no time; keeping them would split
+        # the result into touching pieces.
+        keep = self.stop_s > self.start_s
+        start = np.concatenate([[t0], self.stop_s[keep]])
+        stop = np.concatenate([self.start_s[keep], [t1]])
+        start = np.maximum(start, t0)
+        stop = np.minimum(stop, t1)
+        keep = stop > start
+        return self._new(start[keep], stop[keep])
+
+    def difference(self, other: "IntervalSet") -> "IntervalSet":
+        if len(self) == 0:
+            return self
+        t0, t1 = self.span
+        return self.intersection(other.complement(t0, t1))
+
+    __or__ = union
+    __and__ = intersection
+    __sub__ = difference
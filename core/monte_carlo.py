@@ -0,0 +1,141 @@
+from dataclasses import dataclass
+from typing import Iterable, List, Optional
+
+import numpy as np
+
+from access_table import AccessTable
+
+
+def seed_streams(seed: Optional[int], n: int) -> List[np.random.Generator]:
+    """n independent, reproducible generators spawned from one seed."""
+    return [np.random.default_rng(s) for s in np.random.SeedSequence(seed).spawn(n)]
+
+
+def candidate_passes(passes: AccessTable, t_in: float, t_out: float,
+                     sats: Optional[Iterable[int]] = None):
+    """
+    Passes overlapping a ship's window in the order a deterministic run
+    would try them: by imaging start max(start_s, t_in), ties to the
+    lowest satellite (PassIndex.earliest_overlap). Returns (t_image,
+    sat_block) arrays.
+    """
+    table = passes.overlapping(t_in, t_out)
+    block = table.block_id
+    keep = np.ones(len(table), dtype=bool)
+    if sats is not None:
+        keep = np.isin(block, list(sats))
+    t_image = np.maximum(table.start_s[keep], t_in)
+    block = block[keep]
+    order = np.lexsort((table.start_s[keep], block, t_image))
+    return t_image[order], block[order]
+
+
+@dataclass
+class DetectionTrials:
+    """
+    Outcome of n Monte Carlo trials for one ship.
+
+    pass_idx[i] is the candidate pass that first detected the ship in
+    trial i (-1 when every pass missed); p_first is the exact probability
+    of each candidate being first, for checking the sampled frequencies.
+    """
+
+    t_image: np.ndarray  # candidate passes
+    sat_block: np.ndarray
+    pd: np.ndarray
+    p_first: np.ndarray
+    pass_idx: np.ndarray  # per trial
+
+    @property
+    def n_trials(self) -> int:
+        return len(self.pass_idx)
+
+    @property
+    def detected(self) -> np.ndarray:
+        return self.pass_idx >= 0
+
+    @property
+    def miss_rate(self) -> float:
+        return float(np.mean(~self.detected)) if self.n_trials else float("nan")
+
+    def times(self, delay_s: float = 0.0) -> np.ndarray:
+        """Detection report time per trial (NaN on a miss)."""
+        t = np.append(self.t_image + delay_s, np.nan)
+        return t[self.pass_idx]
+
+    def counts(self) -> np.ndarray:
+        """Trials won by each candidate pass, then misses."""
+        n = len(self.t_image)
+        return np.bincount(np.where(self.pass_idx < 0, n, self.pass_idx), minlength=n + 1)
+
+
+def first_detection_probs(pd) -> np.ndarray:
+    """P(pass j is the first to detect) = pd[j] * prod(1 - pd[:j])."""
+    pd = np.clip(np.asarray(pd, dtype=np.float64), 0.0, 1.0)
+    survive = np.concatenate([[1.0], np.cumprod(1.0 - pd)])
+    return survive[:-1] * pd
+
+
+def weighted_percentile(values, weights, q: float) -> Optional[float]:
+    """
+    Smallest value whose cumulative weight reaches q percent of the total
+    (None if the weights sum to zero). values need not be sorted: a
+    delivery through the detecting satellite can come later for an
+    earlier detection.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    weights = np.asarray(weights, dtype=np.float64)
+    total = weights.sum()
+    if total <= 0:
+        return None
+    order = np.argsort(values, kind="stable")
+    i = np.searchsorted(np.cumsum(weights[order]), q / 100.0 * total, side="left")
+    return float(values[order][min(i, len(values) - 1)])
+
+
+def sample_first_detection(pd, n_trials: int, rng: np.random.Generator,
+                           chunk: int = 1 << 20) -> np.ndarray:
+    """
+    Index of the first successful Bernoulli(pd[j]) draw in each of
+    n_trials independent sequences, -1 if all fail.
+
+    Passes are tried in order, each one independently, so the first
+    success follows P(j) = pd[j] * prod(1 - pd[:j]); one uniform per trial
+    is inverted against that cumulative distribution instead of drawing
+    every pass, which keeps a trial O(log passes).
+    """
+    pd = np.clip(np.asarray(pd, dtype=np.float64), 0.0, 1.0)
+    out = np.empty(n_trials, dtype=np.int64)
+    if len(pd) == 0:
+        out.fill(-1)
+        return out
+    survive = np.concatenate([[1.0], np.cumprod(1.0 - pd)])
+    cdf = 1.0 - survive[1:]  # P(detected by pass j)
+    for lo in range(0, n_trials, chunk):
+        hi = min(lo + chunk, n_trials)
+        u = rng.random(hi - lo)
+        j = np.searchsorted(cdf, u, side="right")
+        out[lo:hi] = np.where(j < len(pd), j, -1)
+    return out
+
+
+def detection_trials(passes: AccessTable, t_in: float, t_out: float, pd,
+                     n_trials: int, rng: np.random.Generator,
+                     sats: Optional[Iterable[int]] = None) -> DetectionTrials:
+    """
+    Monte Carlo detection of a ship in the EEZ over [t_in, t_out].
+
+    Every overlapping pass gets one independent detection attempt with
+    probability pd (a scalar, or one value per candidate pass); a miss
+    leaves the ship to the next pass. With pd = 1 every trial reproduces
+    the deterministic first-overlapping-pass detection.
+    """
+    t_image, block = candidate_passes(passes, t_in, t_out, sats)
+    pd = np.clip(np.broadcast_to(np.asarray(pd, dtype=np.float64), t_image.shape), 0.0, 1.0)
+    return DetectionTrials(
+        t_image=t_image,
+        sat_block=block,
+        pd=pd,
+        p_first=first_detection_probs(pd),
+        pass_idx=sample_first_detection(pd, n_trials, rng),
+    )
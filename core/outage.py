@@ -0,0 +1,159 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from access_table import AccessTable
+from constants import DETECT_LATENCY_THRESHOLD_S
+from intervals import IntervalSet
+from revisit import detection_latency_distribution, gap_stats
+
+
+class CoverageTimeline:
+    """
+    Number of satellites in view of a target as a step function.
+
+    The time axis is cut at every pass start and stop; count[j] is the
+    number of passes covering [edges[j], edges[j+1]). Each satellite keeps
+    the list of segments its passes cover, so taking a satellite out (or
+    putting it back) only touches those segments. With active=False the
+    timeline starts empty and satellites are brought in with add().
+    """
+
+    def __init__(self, table: AccessTable, active: bool = True):
+        self.n_sats = table.n_blocks
+        self.edges = np.unique(np.concatenate([table.start_s, table.stop_s]))
+        a = np.searchsorted(self.edges, table.start_s)
+        b = np.searchsorted(self.edges, table.stop_s)
+
+        # Expand each pass into the segment indices a, a+1, ..., b-1.
+        counts = b - a
+        seg = np.repeat(a, counts) + (
+            np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        )
+        sat = np.repeat(table.block_id, counts)
+        order = np.argsort(sat, kind="stable")
+        bounds = np.searchsorted(sat[order], np.arange(self.n_sats + 1))
+        self._segments = [
+            seg[order[bounds[k]:bounds[k + 1]]] for k in range(self.n_sats)
+        ]
+
+        n_segments = max(len(self.edges) - 1, 0)
+        if active:
+            self.count = np.bincount(seg, minlength=n_segments)
+            self.removed = set()
+        else:
+            self.count = np.zeros(n_segments, dtype=np.int64)
+            self.removed = set(range(self.n_sats))
+
+    def remove(self, sat_block: int):
+        """Take a satellite's passes out of the timeline."""
+        if sat_block in self.removed:
+            raise ValueError(f"Satellite {sat_block + 1} is already removed")
+        np.subtract.at(self.count, self._segments[sat_block], 1)
+        self.removed.add(sat_block)
+
+    def add(self, sat_block: int):
+        """Put a removed satellite's passes back."""
+        if sat_block not in self.removed:
+            raise ValueError(f"Satellite {sat_block + 1} is not removed")
+        np.add.at(self.count, self._segments[sat_block], 1)
+        self.removed.discard(sat_block)
+
+    def coverage(self) -> IntervalSet:
+        """Time with at least one satellite in view."""
+        covered = self.count > 0
+        if not covered.any():
+            return IntervalSet()
+        d = np.diff(covered.astype(np.int8), prepend=0, append=0)
+        first = np.flatnonzero(d == 1)
+        last = np.flatnonzero(d == -1)
+        return IntervalSet(self.edges[first], self.edges[last], normalized=True)
+
+
+def outage_stats(timeline: CoverageTimeline, t0: float, t1: float) -> Dict:
+    """Revisit and detection-latency summary of the timeline's current state."""
+    coverage = timeline.coverage()
+    stats = gap_stats(coverage.gaps())
+    latency = detection_latency_distribution(
+        coverage.start_s, coverage.stop_s, t0, t1
+    )
+    return {
+        "failed": tuple(sorted(k + 1 for k in timeline.removed)),
+        "coverage_fraction": coverage.clip(t0, t1).measure() / (t1 - t0) if t1 > t0 else 0.0,
+        "mean_revisit_s": stats.mean_s,
+        "p95_revisit_s": stats.percentile(95),
+        "max_revisit_s": stats.max_s,
+        "mean_detect_latency_s": latency.mean_s,
+        "p95_detect_latency_s": float(latency.percentile(95)),
+        "p_detect_over_10min": float(latency.sf(DETECT_LATENCY_THRESHOLD_S)),
+    }
+
+
+def _outages_from(timeline: CoverageTimeline, first: int, max_failed: int,
+                  t0: float, t1: float) -> List[Dict]:
+    # Every failure set whose lowest satellite is `first`.
+    out = []
+    timeline.remove(first)
+    out.append(outage_stats(timeline, t0, t1))
+    for n_more in range(1, max_failed):
+        for rest in combinations(range(first + 1, timeline.n_sats), n_more):
+            for k in rest:
+                timeline.remove(k)
+            out.append(outage_stats(timeline, t0, t1))
+            for k in rest:
+                timeline.add(k)
+    timeline.add(first)
+    return out
+
+
+def _outage_task(args):
+    return _outages_from(*args)
+
+
+def enumerate_outages(table: AccessTable, max_failed: int = 2,
+                      horizon: Optional[Tuple[float, float]] = None,
+                      max_workers: Optional[int] = None) -> List[Dict]:
+    """
+    Revisit and detection-latency stats for the full constellation and for
+    every set of up to max_failed failed satellites (N-1, N-2, ...).
+
+    Each row carries the absolute stats and their change against the full
+    constellation ("d_" columns). Work is split by lowest failed satellite
+    across a process pool; max_workers=1 runs in process. The latency
+    horizon defaults to the full constellation's coverage span so every
+    case is measured over the same entry times.
+    """
+    timeline = CoverageTimeline(table)
+    if horizon is None:
+        horizon = timeline.coverage().span or (0.0, 0.0)
+    t0, t1 = horizon
+    base = outage_stats(timeline, t0, t1)
+
+    tasks = [(timeline, k, max_failed, t0, t1) for k in range(timeline.n_sats)]
+    if max_workers is None:
+        max_workers = min(len(tasks), os.cpu_count() or 1)
+    if max_workers <= 1 or len(tasks) <= 1:
+        parts = [_outage_task(t) for t in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            parts = list(pool.map(_outage_task, tasks))
+
+    rows = [base] + [row for part in parts for row in part]
+    metrics = [key for key in base if key != "failed"]
+    deltas = [{"d_" + key: row[key] - base[key] for key in metrics} for row in rows]
+    for row, delta in zip(rows, deltas):
+        row["n_failed"] = len(row["failed"])
+        row.update(delta)
+    return rows
+
+
+def rank_outages(rows: List[Dict], key: str = "p95_revisit_s",
+                 n_failed: Optional[int] = None) -> List[Dict]:
+    """Outage cases sorted from most to least damaging on `key`."""
+    if n_failed is not None:
+        rows = [r for r in rows if r["n_failed"] == n_failed]
+    sign = -1.0 if key.endswith("coverage_fraction") else 1.0
+    return sorted(rows, key=lambda r: (-sign * r[key], r["failed"]))
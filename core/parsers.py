@@ -1,7 +1,24 @@
 import csv
-from datetime import datetime
+from datetime import date, datetime
 from pathlib import Path
-from constants import SCEN_START, TIME_FMT
+from typing import Optional
+
+import numpy as np
+
+from access_table import AccessTable
+from cache import get_default_cache
+from constants import SCEN_START, STORE_SUFFIX, STREAM_CHUNK_ROWS, TIME_FMT
+
+# Month abbreviations used by STK UTCG strings ("1 Jan 2026 ...").
+_MONTHS = {
+    "Jan": 1, "Feb": 2, "Mar": 3, "Apr": 4, "May": 5, "Jun": 6,
+    "Jul": 7, "Aug": 8, "Sep": 9, "Oct": 10, "Nov": 11, "Dec": 12,
+}
+
+# "1 Jan 2026" -> whole days since SCEN_START, filled on first sight.
+_DAY_OFFSETS = {}
+
+_US_PER_DAY = 86400 * 10**6
 
 
 def _to_seconds(t_str: str) -> float:
@@ -10,43 +27,262 @@ def _to_seconds(t_str: str) -> float:
     return (t - SCEN_START).total_seconds()
 
 
-# ---------- SHIP–EEZ PARSERS ----------
+def _day_offset(date_str: str) -> int:
+    """Days between SCEN_START and an STK date string like "1 Jan 2026"."""
+    days = _DAY_OFFSETS.get(date_str)
+    if days is None:
+        day, mon, year = date_str.split()
+        d = date(int(year), _MONTHS[mon], int(day))
+        days = d.toordinal() - SCEN_START.toordinal()
+        _DAY_OFFSETS[date_str] = days
+    return days
 
-def _parse_single_ship_file(path: Path, ship_id: str):
-    """Generic parser for single-ship Access_ShipX_EEZ_*.csv."""
+
+def _to_microseconds_batch(t_strs) -> np.ndarray:
+    """
+    Convert a column of STK UTCG strings to int64 microseconds from
+    scenario start.
+
+    The date part goes through the cached day-offset table (one lookup per
+    distinct day); the fixed-width "HH:MM:SS.fff" part is decoded from a
+    uint8 view of the column in one pass. Columns that do not follow the
+    fixed layout fall back to the per-row strptime path.
+    """
+    col = np.char.strip(np.asarray(t_strs, dtype=str))
+    if col.size == 0:
+        return np.zeros(0, dtype=np.int64)
+
+    parts = np.char.rpartition(col, " ")
+    dates, times = parts[:, 0], parts[:, 2]
+
+    uniq, inverse = np.unique(dates, return_inverse=True)
+    try:
+        day_us = np.array([_day_offset(d) for d in uniq], dtype=np.int64)
+    except (KeyError, ValueError):
+        return _to_microseconds_slow(col)
+    day_us = day_us[inverse.reshape(-1)] * _US_PER_DAY
+
+    raw = np.char.encode(times, "ascii")
+    width = raw.dtype.itemsize
+    if width < 9 or width > 15:
+        return _to_microseconds_slow(col)
+    buf = raw.view(np.uint8).reshape(-1, width)
+
+    if not (
+        np.all(buf[:, 2] == ord(":"))
+        and np.all(buf[:, 5] == ord(":"))
+        and np.all(buf[:, 8] == ord("."))
+    ):
+        return _to_microseconds_slow(col)
+
+    # Unused trailing bytes are NUL padding; they act as zero digits,
+    # which is how %f right-pads short fractions.
+    digits = buf.astype(np.int64) - ord("0")
+    digits[buf == 0] = 0
+    clock = np.delete(digits, [2, 5, 8], axis=1)
+    if np.any((clock < 0) | (clock > 9)):
+        return _to_microseconds_slow(col)
+
+    hh = clock[:, 0] * 10 + clock[:, 1]
+    mm = clock[:, 2] * 10 + clock[:, 3]
+    ss = clock[:, 4] * 10 + clock[:, 5]
+    frac = np.zeros(len(col), dtype=np.int64)
+    for k in range(6):
+        frac *= 10
+        if 6 + k < clock.shape[1]:
+            frac += clock[:, 6 + k]
+
+    return day_us + ((hh * 60 + mm) * 60 + ss) * 10**6 + frac
+
+
+def _to_microseconds_slow(col) -> np.ndarray:
+    """Per-row strptime fallback for _to_microseconds_batch."""
+    out = np.empty(len(col), dtype=np.int64)
+    for i, t_str in enumerate(col):
+        delta = datetime.strptime(str(t_str), TIME_FMT) - SCEN_START
+        out[i] = (delta.days * 86400 + delta.seconds) * 10**6 + delta.microseconds
+    return out
+
+
+def _to_seconds_batch(t_strs) -> np.ndarray:
+    """
+    Vectorized _to_seconds: a column of STK UTCG strings to float64 seconds
+    from scenario start. Values are bit-identical to _to_seconds, which also
+    divides exact integer microseconds by 10**6.
+    """
+    return _to_microseconds_batch(t_strs) / 1e6
+
+
+def _decode_rows(rows):
+    """
+    Batch-decode collected access rows ["Access", start, stop, duration].
+
+    Returns (start_s, stop_s, duration_s) as float64 arrays.
+    """
+    if not rows:
+        z = np.zeros(0)
+        return z, z, z
+    starts = _to_seconds_batch([r[1] for r in rows])
+    stops = _to_seconds_batch([r[2] for r in rows])
+    durs = np.array([float(r[3]) for r in rows], dtype=np.float64)
+    return starts, stops, durs
+
+
+# ---------- RAW BLOCK LOADER ----------
+
+def _is_block_header(row) -> bool:
+    return len(row) > 1 and row[0].strip('"') == "Access" and "Start Time" in row[1]
+
+
+def _walk_blocks(reader):
+    """
+    Walk the "Access / Start Time" blocks of an STK export.
+
+    Takes csv rows and yields (block_id, row) for every access row; block k
+    holds the rows between the k-th header and the following "Statistics"
+    line.
+    """
+    block_id = -1
+    in_header = False
+
+    for row in reader:
+        if not row:
+            continue
+        first = row[0].strip('"')
+
+        if _is_block_header(row):
+            block_id += 1
+            in_header = True
+            continue
+
+        if first == "Statistics":
+            in_header = False
+            continue
+
+        if in_header and block_id >= 0:
+            yield block_id, row
+
+
+def _iter_block_rows(path: Path):
+    """_walk_blocks over an export file."""
+    with path.open("r", newline="") as f:
+        yield from _walk_blocks(csv.reader(f))
+
+
+def count_blocks(path) -> int:
+    """Number of block headers in an export, including blocks with no passes."""
+    with Path(path).open("r", newline="") as f:
+        return sum(1 for row in csv.reader(f) if row and _is_block_header(row))
+
+
+def _read_blocks(path: Path) -> AccessTable:
+    """Read every block of an STK export into one AccessTable."""
+    rows = []
+    block_ids = []
+    for block_id, row in _iter_block_rows(path):
+        rows.append(row)
+        block_ids.append(block_id)
+
+    starts, stops, durs = _decode_rows(rows)
+    return AccessTable(block_ids, starts, stops, durs)
+
+
+def _stored_blocks(path: Path) -> Optional[AccessTable]:
+    """
+    An export's table without parsing the CSV: a .pstore file written by
+    core/access_store.py, or a parse-cache hit. None otherwise.
+    """
+    if path.suffix == STORE_SUFFIX:
+        from access_store import AccessStore
+
+        return AccessStore(path).to_table()
+
+    cache = get_default_cache()
+    if cache is not None:
+        hit = cache.get(path)
+        if hit is not None:
+            return AccessTable(
+                hit["block_id"],
+                hit["start_s"],
+                hit["stop_s"],
+                hit["duration_s"],
+                n_blocks=int(hit["n_blocks"]),
+                presorted=True,
+            )
+    return None
+
+
+def _load_blocks(path) -> AccessTable:
+    """
+    _read_blocks through the on-disk parse cache (see core/cache.py).
+
+    Binary .pstore files written by core/access_store.py are read directly.
+    """
     path = Path(path)
+    table = _stored_blocks(path)
+    if table is not None:
+        return table
+
+    cache = get_default_cache()
+    table = _read_blocks(path)
+    if cache is not None:
+        cache.put(
+            path,
+            {
+                "block_id": table.block_id,
+                "start_s": table.start_s,
+                "stop_s": table.stop_s,
+                "duration_s": table.duration_s,
+                "n_blocks": np.array(table.n_blocks),
+            },
+        )
+    return table
+
+
+# ---------- SHIP–EEZ PARSERS ----------
+
+def _single_ship_intervals(table: AccessTable, ship_id: str):
+    """Every row of a single-ship export, tagged with ship_id."""
+    return [
+        {
+            "ship_id": ship_id,
+            "start_s": e["start_s"],
+            "stop_s": e["stop_s"],
+            "duration_s": e["duration_s"],
+        }
+        for e in table
+    ]
+
+
+def _ship1_ship3_intervals(table: AccessTable):
+    """Block 0 → Ship1, block 1 → Ship3, later blocks → Ship_block_<k>."""
     intervals = []
+    for e in table:
+        block_id = e["block_id"]
+        if block_id == 0:
+            ship_id = "Ship1"
+        elif block_id == 1:
+            ship_id = "Ship3"
+        else:
+            ship_id = f"Ship_block_{block_id}"
 
-    with path.open("r", newline="") as f:
-        reader = csv.reader(f)
-        in_header = False
-        for row in reader:
-            if not row:
-                continue
-            first = row[0].strip('"')
-
-            if first == "Access" and "Start Time" in row[1]:
-                in_header = True
-                continue
-            if first == "Statistics":
-                in_header = False
-                continue
-            if in_header:
-                start_s = _to_seconds(row[1])
-                stop_s = _to_seconds(row[2])
-                dur_s = float(row[3])
-                intervals.append(
-                    {
-                        "ship_id": ship_id,
-                        "start_s": start_s,
-                        "stop_s": stop_s,
-                        "duration_s": dur_s,
-                    }
-                )
+        intervals.append(
+            {
+                "ship_id": ship_id,
+                "start_s": e["start_s"],
+                "stop_s": e["stop_s"],
+                "duration_s": e["duration_s"],
+            }
+        )
 
     return intervals
 
 
+def _parse_single_ship_file(path: Path, ship_id: str):
+    """Generic parser for single-ship Access_ShipX_EEZ_*.csv."""
+    return _single_ship_intervals(_load_blocks(path), ship_id)
+
+
 def parse_ship1_eez_west(path):
     """Access_Ship1_EEZ_West.csv → Ship1 interval in EEZ_West."""
     return _parse_single_ship_file(Path(path), "Ship1")
@@ -64,89 +300,88 @@ def parse_ship1_ship3_eez_west(path):
     Block 0: Ship1
     Block 1: Ship3
     """
+    return _ship1_ship3_intervals(_load_blocks(path))
+
+
+# ---------- EEZ–SAT & GS–SAT PARSER ----------
+
+def parse_blocked_access(path, n_blocks: int, t0: Optional[float] = None,
+                         t1: Optional[float] = None):
+    """
+    Parse EEZ–Satellite and GS–Satellite CSVs with stacked blocks.
+
+    Returns an AccessTable (block k = satellite k + 1) limited to the first
+    n_blocks blocks. Iterating it yields the per-pass dicts earlier versions
+    returned as a list.
+
+    With t0 and t1, only passes overlapping [t0, t1] are returned. An
+    export that is neither a store nor in the parse cache is then not
+    parsed in full: the block-index sidecar (core/block_index.py) seeks to
+    the rows that can overlap the window.
+    """
+    if t0 is None and t1 is None:
+        return _load_blocks(path).first_blocks(n_blocks)
+
+    t0 = -np.inf if t0 is None else t0
+    t1 = np.inf if t1 is None else t1
     path = Path(path)
-    intervals = []
-    block_id = -1
-    in_header = False
+    table = _stored_blocks(path)
+    if table is not None:
+        return table.first_blocks(n_blocks).overlapping(t0, t1)
 
-    with path.open("r", newline="") as f:
-        reader = csv.reader(f)
-        for row in reader:
-            if not row:
-                continue
-            first = row[0].strip('"')
-
-            if first == "Access" and "Start Time" in row[1]:
-                block_id += 1
-                in_header = True
-                continue
-
-            if first == "Statistics":
-                in_header = False
-                continue
-
-            if in_header:
-                start_s = _to_seconds(row[1])
-                stop_s = _to_seconds(row[2])
-                dur_s = float(row[3])
-
-                if block_id == 0:
-                    ship_id = "Ship1"
-                elif block_id == 1:
-                    ship_id = "Ship3"
-                else:
-                    ship_id = f"Ship_block_{block_id}"
-
-                intervals.append(
-                    {
-                        "ship_id": ship_id,
-                        "start_s": start_s,
-                        "stop_s": stop_s,
-                        "duration_s": dur_s,
-                    }
-                )
+    from block_index import load_window
 
-    return intervals
+    return load_window(path, t0, t1, range(n_blocks)).first_blocks(n_blocks)
 
 
-# ---------- EEZ–SAT & GS–SAT PARSER ----------
+def parse_block_access(path, block_id: int) -> AccessTable:
+    """
+    One satellite's passes (block_id 0-based) of a stacked export.
 
-def parse_blocked_access(path, n_blocks: int):
+    Read from a store or the parse cache when available, otherwise by
+    seeking straight to the block through the block-index sidecar.
     """
-    Parse EEZ–Satellite and GS–Satellite CSVs with stacked blocks.
+    path = Path(path)
+    table = _stored_blocks(path)
+    if table is not None:
+        return table.block(block_id)
+
+    from block_index import load_block
+
+    return load_block(path, block_id)
+
+
+def iter_blocked_access(path, n_blocks: Optional[int] = None,
+                        chunk_size: int = STREAM_CHUNK_ROWS):
+    """
+    Streaming parse_blocked_access for exports too large to hold in memory.
+
+    Yields (block_id, AccessTable) chunks of at most chunk_size passes, in
+    file order; a chunk never spans two blocks and its rows are not
+    re-sorted, so consumers see the export's own row order. n_blocks=None
+    streams every block. Only one chunk of raw rows is held at a time, and
+    the parse cache is bypassed.
     """
     path = Path(path)
-    entries = []
-    block_id = -1
-    in_header = False
+    rows = []
+    current = None
 
-    with path.open("r", newline="") as f:
-        reader = csv.reader(f)
-        for row in reader:
-            if not row:
-                continue
-            first = row[0].strip('"')
-
-            if first == "Access" and "Start Time" in row[1]:
-                block_id += 1
-                in_header = True
-                continue
-
-            if first == "Statistics":
-                in_header = False
-                continue
-
-            if in_header and 0 <= block_id < n_blocks:
-                start_s = _to_seconds(row[1])
-                stop_s = _to_seconds(row[2])
-                dur_s = float(row[3])
-                entries.append(
-                    {
-                        "block_id": block_id,
-                        "start_s": start_s,
-                        "stop_s": stop_s,
-                        "duration_s": dur_s,
-                    }
-                )
-
-    return entries
+    def flush():
+        starts, stops, durs = _decode_rows(rows)
+        return current, AccessTable(
+            np.full(len(rows), current), starts, stops, durs,
+            n_blocks=current + 1 if n_blocks is None else n_blocks,
+            presorted=True,
+        )
+
+    for block_id, row in _iter_block_rows(path):
+        if n_blocks is not None and block_id >= n_blocks:
+            break
+        if rows and (block_id != current or len(rows) >= chunk_size):
+            yield flush()
+            rows = []
+        current = block_id
+        rows.append(row)
+
+    if rows:
+        yield flush()
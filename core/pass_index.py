@@ -0,0 +1,123 @@
+from bisect import bisect_left
+from typing import Iterable, NamedTuple, Optional
+
+import numpy as np
+
+from access_table import AccessTable
+
+
+class Pass(NamedTuple):
+    sat_block: int  # 0-based block id (satellite index - 1)
+    start_s: float
+    stop_s: float
+
+
+class PassIndex:
+    """
+    Sorted pass index for one EEZ (or any stacked access export).
+
+    Per satellite it keeps the pass start times and the running maximum of
+    the stop times; both are sorted, so "first pass of sat k overlapping
+    [t0, t1]" and "next pass after t" are one bisect each. A global copy
+    sorted by (start, sat) answers "earliest pass of any satellite" in
+    O(log n).
+
+    Ties always go to the lowest satellite, matching the scripts' loops
+    over range(N_SATS) with a strict "<" comparison.
+    """
+
+    def __init__(self, table: AccessTable):
+        self.n_sats = table.n_blocks
+        self._start = []
+        self._stop = []
+        self._stop_max = []
+        for k in range(self.n_sats):
+            start, stop = table.block_arrays(k)
+            self._start.append(start.tolist())
+            self._stop.append(stop.tolist())
+            self._stop_max.append(
+                np.maximum.accumulate(stop).tolist() if len(stop) else []
+            )
+
+        order = np.lexsort((table.block_id, table.start_s))
+        self.g_start = table.start_s[order]
+        self.g_stop = table.stop_s[order]
+        self.g_block = table.block_id[order]
+        self._g_start = self.g_start.tolist()
+
+    def __len__(self):
+        return len(self.g_start)
+
+    def __repr__(self):
+        return f"PassIndex({len(self)} passes, {self.n_sats} sats)"
+
+    # ---------- per satellite ----------
+
+    def sat_passes(self, sat_block: int):
+        """(start_s, stop_s) lists of one satellite, sorted by start."""
+        return self._start[sat_block], self._stop[sat_block]
+
+    def first_overlap(self, sat_block: int, t0: float, t1: float) -> Optional[Pass]:
+        """First pass of a satellite with start_s <= t1 and stop_s >= t0."""
+        i = bisect_left(self._stop_max[sat_block], t0)
+        starts = self._start[sat_block]
+        if i < len(starts) and starts[i] <= t1:
+            return Pass(sat_block, starts[i], self._stop[sat_block][i])
+        return None
+
+    def first_start_in(self, sat_block: int, t0: float, t1: float) -> Optional[Pass]:
+        """First pass of a satellite with t0 <= start_s <= t1."""
+        starts = self._start[sat_block]
+        i = bisect_left(starts, t0)
+        if i < len(starts) and starts[i] <= t1:
+            return Pass(sat_block, starts[i], self._stop[sat_block][i])
+        return None
+
+    def next_pass_after(self, sat_block: int, t: float) -> Optional[Pass]:
+        """First pass of a satellite with start_s >= t."""
+        return self.first_start_in(sat_block, t, float("inf"))
+
+    # ---------- across satellites ----------
+
+    def earliest_start_in(self, t0: float, t1: float) -> Optional[Pass]:
+        """Earliest pass of any satellite with t0 <= start_s <= t1."""
+        i = bisect_left(self._g_start, t0)
+        if i < len(self._g_start) and self._g_start[i] <= t1:
+            return Pass(int(self.g_block[i]), self._g_start[i], float(self.g_stop[i]))
+        return None
+
+    def earliest_after(self, t: float) -> Optional[Pass]:
+        """Earliest pass of any satellite with start_s >= t."""
+        return self.earliest_start_in(t, float("inf"))
+
+    def earliest_start_in_many(self, t0, t1) -> np.ndarray:
+        """
+        Vectorised earliest_start_in over arrays of windows: positions into
+        g_start/g_stop/g_block, -1 where a window holds no pass start.
+        """
+        t0 = np.asarray(t0, dtype=np.float64)
+        t1 = np.asarray(t1, dtype=np.float64)
+        n = len(self.g_start)
+        if n == 0:
+            return np.full(t0.shape, -1, dtype=np.int64)
+        i = np.searchsorted(self.g_start, t0, side="left")
+        found = (i < n) & (self.g_start[np.minimum(i, n - 1)] <= t1)
+        return np.where(found, i, -1)
+
+    def earliest_overlap(self, t0: float, t1: float,
+                         sats: Optional[Iterable[int]] = None) -> Optional[Pass]:
+        """
+        Satellite whose first pass overlapping [t0, t1] begins imaging
+        soonest, i.e. minimises max(start_s, t0). Passes already in
+        progress at t0 all tie at t0 and go to the lowest satellite.
+        """
+        best = None
+        best_t = None
+        for k in range(self.n_sats) if sats is None else sats:
+            p = self.first_overlap(k, t0, t1)
+            if p is None:
+                continue
+            t = max(p.start_s, t0)
+            if best_t is None or t < best_t:
+                best, best_t = p, t
+        return best
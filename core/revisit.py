@@ -0,0 +1,386 @@
+from dataclasses import dataclass
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+
+from constants import PROFILE_STEP_S, REVISIT_BIN_WIDTH_S
+from intervals import IntervalSet
+
+# Percentiles reported by default (the revisit scripts' median and p95).
+DEFAULT_PERCENTILES = (50.0, 95.0)
+
+
+@dataclass
+class RevisitStats:
+    """Revisit gaps of one target and their summary statistics (seconds)."""
+
+    n_passes: int
+    gaps_s: np.ndarray
+    mean_s: float
+    max_s: float
+    percentiles_s: Dict[float, float]
+    hist_counts: np.ndarray
+    hist_edges: np.ndarray
+
+    @property
+    def n_gaps(self) -> int:
+        return len(self.gaps_s)
+
+    def percentile(self, p: float) -> float:
+        """Exact (linearly interpolated) p-th percentile of the gaps."""
+        p = float(p)
+        if p not in self.percentiles_s:
+            self.percentiles_s[p] = (
+                float(np.percentile(self.gaps_s, p)) if self.n_gaps else 0.0
+            )
+        return self.percentiles_s[p]
+
+
+def gap_histogram(gaps_s, bin_width_s: float = REVISIT_BIN_WIDTH_S,
+                  edges=None):
+    """
+    Fixed-width histogram of gaps: bins [0, w), [w, 2w), ... up to the
+    largest gap, unless explicit edges are given.
+    """
+    gaps_s = np.asarray(gaps_s, dtype=np.float64)
+    if edges is None:
+        top = gaps_s.max() if len(gaps_s) else 0.0
+        n_bins = max(int(np.floor(top / bin_width_s)) + 1, 1)
+        edges = np.arange(n_bins + 1) * bin_width_s
+    return np.histogram(gaps_s, bins=edges)
+
+
+def gap_stats(gaps_s, percentiles: Iterable[float] = DEFAULT_PERCENTILES,
+              bin_width_s: float = REVISIT_BIN_WIDTH_S, edges=None,
+              n_passes: int = 0) -> RevisitStats:
+    """Summary statistics of an array of revisit gaps."""
+    gaps_s = np.asarray(gaps_s, dtype=np.float64)
+    percentiles = [float(p) for p in percentiles]
+    if len(gaps_s):
+        mean = float(gaps_s.mean())
+        top = float(gaps_s.max())
+        values = np.percentile(gaps_s, percentiles).tolist() if percentiles else []
+    else:
+        mean = top = 0.0
+        values = [0.0] * len(percentiles)
+    counts, edges = gap_histogram(gaps_s, bin_width_s, edges)
+    return RevisitStats(
+        n_passes=n_passes,
+        gaps_s=gaps_s,
+        mean_s=mean,
+        max_s=top,
+        percentiles_s=dict(zip(percentiles, values)),
+        hist_counts=counts,
+        hist_edges=edges,
+    )
+
+
+def revisit_gaps(start_s, stop_s) -> np.ndarray:
+    """Positive gaps between the merged coverage intervals of the passes."""
+    return IntervalSet(start_s, stop_s).gaps()
+
+
+def revisit_stats(start_s, stop_s,
+                  percentiles: Iterable[float] = DEFAULT_PERCENTILES,
+                  bin_width_s: float = REVISIT_BIN_WIDTH_S,
+                  edges: Optional[np.ndarray] = None) -> RevisitStats:
+    """
+    Revisit statistics of a set of passes (any order, any satellites).
+
+    One sort plus a running max gives the coverage union; gaps, the
+    percentiles, mean, max and histogram are all computed on arrays.
+    """
+    return gap_stats(
+        revisit_gaps(start_s, stop_s),
+        percentiles,
+        bin_width_s,
+        edges,
+        n_passes=len(start_s),
+    )
+
+
+@dataclass
+class RevisitProfile:
+    """
+    Revisit statistics per time window, one array entry per window.
+
+    Each gap is counted in the window where it starts (where coverage was
+    lost). mean_gap_s is NaN and max_gap_s 0 for windows in which no gap
+    starts.
+    """
+
+    t_s: np.ndarray  # window start (seconds since SCEN_START, or time of day)
+    window_s: float
+    n_gaps: np.ndarray
+    mean_gap_s: np.ndarray
+    max_gap_s: np.ndarray
+    coverage_fraction: np.ndarray
+
+    def __len__(self):
+        return len(self.t_s)
+
+
+def _covered_before(coverage: IntervalSet, t) -> np.ndarray:
+    # Covered time in (-inf, t], for an array of times.
+    lengths = coverage.stop_s - coverage.start_s
+    cum = np.concatenate([[0.0], np.cumsum(lengths)])
+    i = np.searchsorted(coverage.start_s, t, side="right")
+    j = np.maximum(i - 1, 0)
+    partial = np.clip(t - coverage.start_s[j], 0.0, lengths[j]) if len(lengths) else 0.0
+    return np.where(i > 0, cum[j] + partial, 0.0)
+
+
+def _binned_gaps(coverage: IntervalSet, edges: np.ndarray):
+    # (count, sum, max) of the gaps starting in each [edges[b], edges[b+1]).
+    n_bins = len(edges) - 1
+    gaps = coverage.gaps()
+    b = np.searchsorted(edges, coverage.stop_s[:-1], side="right") - 1
+    keep = (b >= 0) & (b < n_bins)
+    b, gaps = b[keep], gaps[keep]
+    count = np.bincount(b, minlength=n_bins)
+    total = np.bincount(b, weights=gaps, minlength=n_bins)
+    top = np.zeros(n_bins)
+    np.maximum.at(top, b, gaps)
+    return count, total, top
+
+
+def _sliding_max(x: np.ndarray, k: int) -> np.ndarray:
+    """
+    Max of every k consecutive values in O(len(x)) (van Herk / Gil-Werman).
+
+    Cut x into blocks of k: a window spans at most two blocks, so its max
+    is the running max from its start to the end of its first block
+    combined with the running max from the start of the next block to its
+    end.
+    """
+    n = len(x)
+    m = -(-n // k) * k
+    blocks = np.full(m, -np.inf)
+    blocks[:n] = x
+    blocks = blocks.reshape(-1, k)
+    prefix = np.maximum.accumulate(blocks, axis=1).ravel()
+    suffix = np.maximum.accumulate(blocks[:, ::-1], axis=1)[:, ::-1].ravel()
+    return np.maximum(suffix[:n - k + 1], prefix[k - 1:n])
+
+
+def revisit_profile(start_s, stop_s, window_s: float,
+                    step_s: float = PROFILE_STEP_S,
+                    t0: Optional[float] = None,
+                    t1: Optional[float] = None) -> RevisitProfile:
+    """
+    Rolling-window revisit statistics, e.g. 1 h or 6 h windows every step_s.
+
+    Gaps are binned once by start time into step_s bins (one pass over
+    the gaps); each window then combines window_s / step_s consecutive
+    bins, through prefix sums and a block running max, so the sweep is
+    O(bins) whatever the window length. Windows lie inside [t0, t1], by
+    default the coverage span.
+    """
+    k = int(round(window_s / step_s))
+    if k < 1 or not np.isclose(k * step_s, window_s):
+        raise ValueError("window_s must be a whole number of step_s")
+
+    coverage = IntervalSet(start_s, stop_s)
+    span = coverage.span or (0.0, 0.0)
+    t0 = span[0] if t0 is None else float(t0)
+    t1 = span[1] if t1 is None else float(t1)
+    n_bins = max(int(np.floor((t1 - t0) / step_s + 1e-9)), 0)
+    edges = t0 + np.arange(n_bins + 1) * step_s
+
+    count, total, top = _binned_gaps(coverage, edges)
+    n_windows = max(n_bins - k + 1, 0)
+    cum_count = np.concatenate([[0], np.cumsum(count)])
+    cum_total = np.concatenate([[0.0], np.cumsum(total)])
+    n_gaps = cum_count[k:k + n_windows] - cum_count[:n_windows]
+    sums = cum_total[k:k + n_windows] - cum_total[:n_windows]
+    if n_windows:
+        max_gap = _sliding_max(top, k)
+    else:
+        max_gap = np.zeros(0)
+    covered = _covered_before(coverage, edges)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean_gap = np.where(n_gaps > 0, sums / n_gaps, np.nan)
+    return RevisitProfile(
+        t_s=edges[:n_windows],
+        window_s=float(window_s),
+        n_gaps=n_gaps,
+        mean_gap_s=mean_gap,
+        max_gap_s=max_gap,
+        coverage_fraction=(covered[k:k + n_windows] - covered[:n_windows]) / window_s,
+    )
+
+
+def time_of_day_profile(start_s, stop_s, bin_s: float = 3600.0,
+                        t0: Optional[float] = None,
+                        t1: Optional[float] = None) -> RevisitProfile:
+    """
+    Revisit statistics folded onto a 24 h clock (SCEN_START is midnight),
+    one row per bin_s slot of the day, pooled over every day in [t0, t1].
+    """
+    day = 86400.0
+    per_day = int(round(day / bin_s))
+    if not np.isclose(per_day * bin_s, day):
+        raise ValueError("bin_s must divide 24 h")
+
+    coverage = IntervalSet(start_s, stop_s)
+    span = coverage.span or (0.0, 0.0)
+    t0 = span[0] if t0 is None else float(t0)
+    t1 = span[1] if t1 is None else float(t1)
+    first_day = np.floor(t0 / day)
+    n_days = max(int(np.ceil(t1 / day) - first_day), 1)
+    edges = first_day * day + np.arange(n_days * per_day + 1) * bin_s
+
+    count, total, top = _binned_gaps(coverage.clip(t0, t1), edges)
+    covered = np.diff(_covered_before(coverage.clip(t0, t1), edges))
+    horizon = np.diff(np.clip(edges, t0, t1))
+
+    def fold(x, reduce):
+        return reduce(x.reshape(n_days, per_day), axis=0)
+
+    n_gaps = fold(count, np.sum)
+    sums = fold(total, np.sum)
+    seen = fold(horizon, np.sum)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean_gap = np.where(n_gaps > 0, sums / n_gaps, np.nan)
+        coverage_fraction = np.where(seen > 0, fold(covered, np.sum) / seen, np.nan)
+    return RevisitProfile(
+        t_s=np.arange(per_day) * bin_s,
+        window_s=float(bin_s),
+        n_gaps=n_gaps,
+        mean_gap_s=mean_gap,
+        max_gap_s=fold(top, np.max),
+        coverage_fraction=coverage_fraction,
+    )
+
+
+class LatencyDistribution:
+    """
+    Exact distribution of the detection latency L for an entry time drawn
+    uniformly from a horizon [t0, t1].
+
+    Within each waiting segment of the pass timeline, L falls linearly
+    from the time left to the segment's end, so each segment adds uniform
+    density on a latency range [lo, hi]. Entries that are covered
+    already have L = 0, and entries with no later opportunity are never
+    detected (L = inf). The CDF is therefore piecewise linear:
+
+        T * F(x) = zero + sum(max(x - lo, 0)) - sum(max(x - hi, 0))
+
+    With lo and hi sorted, each evaluation is two binary searches. Build
+    with detection_latency_distribution().
+    """
+
+    def __init__(self, lo, hi, zero_s: float, never_s: float):
+        self.lo = np.sort(np.asarray(lo, dtype=np.float64))
+        self.hi = np.sort(np.asarray(hi, dtype=np.float64))
+        self._lo_cum = np.concatenate([[0.0], np.cumsum(self.lo)])
+        self._hi_cum = np.concatenate([[0.0], np.cumsum(self.hi)])
+        self.zero_s = float(zero_s)
+        self.never_s = float(never_s)
+        self.horizon_s = float(self.zero_s + self.never_s + (self.hi - self.lo).sum())
+        # Sum over segments of the integral of L: sum (hi^2 - lo^2) / 2.
+        self._integral = float(((self.hi ** 2 - self.lo ** 2) / 2.0).sum())
+
+    @property
+    def p_never(self) -> float:
+        """Probability that the entry is never detected."""
+        return self.never_s / self.horizon_s if self.horizon_s else 0.0
+
+    @property
+    def mean_s(self) -> float:
+        """Mean latency of the detected entries."""
+        detected = self.horizon_s - self.never_s
+        return self._integral / detected if detected else 0.0
+
+    @property
+    def max_s(self) -> float:
+        """Largest latency over the horizon (inf if some entries are never detected)."""
+        if self.never_s > 0:
+            return float("inf")
+        return float(self.hi[-1]) if len(self.hi) else 0.0
+
+    def _measure(self, x) -> np.ndarray:
+        # F is flat beyond the largest latency; clipping also keeps inf finite.
+        top = self.hi[-1] if len(self.hi) else 0.0
+        x = np.minimum(np.asarray(x, dtype=np.float64), top)
+        k_lo = np.searchsorted(self.lo, x, side="left")
+        k_hi = np.searchsorted(self.hi, x, side="left")
+        return (
+            self.zero_s
+            + (k_lo * x - self._lo_cum[k_lo])
+            - (k_hi * x - self._hi_cum[k_hi])
+        )
+
+    def cdf(self, x):
+        """P(L <= x)."""
+        if not self.horizon_s:
+            return np.ones_like(np.asarray(x, dtype=np.float64))
+        return np.where(np.asarray(x) < 0, 0.0, self._measure(x) / self.horizon_s)
+
+    def sf(self, x):
+        """P(L > x), counting never-detected entries."""
+        return 1.0 - self.cdf(x)
+
+    def percentile(self, p):
+        """
+        Exact p-th percentile (p in [0, 100]) of L; inf where p falls in the
+        never-detected mass.
+        """
+        q = np.asarray(p, dtype=np.float64) / 100.0
+        knots = np.union1d(np.concatenate([self.lo, self.hi]), [0.0])
+        f = self.cdf(knots)
+        i = np.searchsorted(f, q, side="left")
+        inside = (i < len(knots)) | (self.never_s == 0)
+        i = np.clip(i, 1, len(knots) - 1) if len(knots) > 1 else np.zeros_like(i)
+        f0, f1 = f[i - 1], f[i]
+        x0, x1 = knots[i - 1], knots[i]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            x = np.where(f1 > f0, x0 + (q - f0) * (x1 - x0) / (f1 - f0), x0)
+        x = np.where(q <= f[0], knots[0], np.minimum(x, knots[-1]))
+        return np.where(inside, x, np.inf)
+
+
+def _waiting(seg_start, seg_end, t0: float, t1: float):
+    # Latency ranges [lo, hi] of the waiting segments clipped to [t0, t1].
+    a = np.maximum(seg_start, t0)
+    b = np.minimum(seg_end, t1)
+    keep = b > a
+    return seg_end[keep] - b[keep], seg_end[keep] - a[keep]
+
+
+def detection_latency_distribution(start_s, stop_s=None, t0: Optional[float] = None,
+                                   t1: Optional[float] = None) -> LatencyDistribution:
+    """
+    Detection-latency distribution of an EEZ for entries uniform on [t0, t1].
+
+    With stop_s (the default use), a vessel entering during coverage is
+    seen at once and otherwise waits for the next coverage start, as in the
+    Phase 4 overlap rule. The horizon defaults to the first coverage start
+    through the last coverage stop; for entries uniform over the whole
+    scenario pass Scenario.horizon, so the lead-in before the first pass
+    and the tail after the last one count.
+
+    Without stop_s, only pass starts count, as in the latency scripts'
+    "t_entry <= start" rule; the horizon defaults to first through last
+    pass start.
+    """
+    start_s = np.asarray(start_s, dtype=np.float64)
+    if len(start_s) == 0:
+        return LatencyDistribution([], [], 0.0, (t1 or 0.0) - (t0 or 0.0))
+
+    if stop_s is None:
+        cov_start = np.unique(start_s)
+        cov_stop = cov_start
+    else:
+        coverage = IntervalSet(start_s, stop_s)
+        cov_start, cov_stop = coverage.start_s, coverage.stop_s
+
+    t0 = cov_start[0] if t0 is None else float(t0)
+    t1 = cov_stop[-1] if t1 is None else float(t1)
+
+    seg_start = np.concatenate([[-np.inf], cov_stop[:-1]])
+    lo, hi = _waiting(seg_start, cov_start, t0, t1)
+    zero = np.clip(np.minimum(cov_stop, t1) - np.maximum(cov_start, t0), 0.0, None).sum()
+    never = max(t1 - max(cov_stop[-1], t0), 0.0)
+    return LatencyDistribution(lo, hi, zero, never)
@@ -0,0 +1,164 @@
+from pathlib import Path
+from typing import Dict, List
+
+from access_table import AccessTable
+from constants import SCEN_DURATION_S
+from downlink_index import DownlinkIndex
+from pass_index import PassIndex
+from parsers import _load_blocks, _ship1_ship3_intervals, _single_ship_intervals
+
+EEZ_NAMES = ("EEZ_West", "EEZ_East")
+
+# Ground stations in the order the delivery-latency scripts concatenate them.
+GS_NAMES = ("Ahmedabad", "Sriharikota")
+
+
+class Scenario:
+    """
+    One constellation's STK exports, parsed lazily and at most once.
+
+    Ship intervals, EEZ passes and ground-station passes are loaded on
+    first access and memoized, so analysis code can ask for them per ship
+    and per mode without reopening the CSVs. duration_s is the STK
+    analysis period, starting at SCEN_START.
+    """
+
+    def __init__(self, data_dir, n_sats: int, eez_files: Dict[str, str],
+                 gs_files: Dict[str, str], label: str = "",
+                 duration_s: float = SCEN_DURATION_S):
+        self.data_dir = Path(data_dir)
+        self.n_sats = n_sats
+        self.duration_s = float(duration_s)
+        self.eez_files = dict(eez_files)
+        self.gs_files = dict(gs_files)
+        self.label = label or f"{n_sats}-sat"
+        self._raw = {}
+        self._tables = {}
+        self._indexes = {}
+        self._downlinks = None
+        self._ships = {}
+
+    @classmethod
+    def baseline(cls, data_dir, n_sats: int = 6) -> "Scenario":
+        """6-sat reference constellation ("Acces_*_All Satellite.csv")."""
+        return cls(
+            data_dir,
+            n_sats,
+            eez_files={e: f"Acces_{e}_All Satellite.csv" for e in EEZ_NAMES},
+            gs_files={g: f"Acces_GS_{g}_All Satellite.csv" for g in GS_NAMES},
+            label=f"{n_sats}-sat",
+        )
+
+    @classmethod
+    def walker(cls, data_dir, n_sats: int) -> "Scenario":
+        """Walker constellation ("Acess_*-To-Satellite-Walker<N>.csv")."""
+        return cls(
+            data_dir,
+            n_sats,
+            eez_files={
+                e: f"Acess_{e}-To-Satellite-Walker{n_sats}.csv" for e in EEZ_NAMES
+            },
+            gs_files={
+                g: f"Acess_GS_{g}-To-Satellite-Walker{n_sats}.csv" for g in GS_NAMES
+            },
+            label=f"{n_sats}-sat",
+        )
+
+    def __repr__(self):
+        return f"Scenario({self.label!r}, {str(self.data_dir)!r})"
+
+    @property
+    def horizon(self):
+        """(0, duration_s): the scenario in seconds since SCEN_START."""
+        return 0.0, self.duration_s
+
+    # ---------- files ----------
+
+    def eez_file(self, eez_name: str) -> Path:
+        if eez_name not in self.eez_files:
+            raise ValueError(f"Unknown EEZ: {eez_name}")
+        return self.data_dir / self.eez_files[eez_name]
+
+    def gs_file(self, station: str) -> Path:
+        if station not in self.gs_files:
+            raise ValueError(f"Unknown ground station: {station}")
+        return self.data_dir / self.gs_files[station]
+
+    def preload(self, path, table: AccessTable):
+        """Seed the memo with an already parsed export (all blocks)."""
+        self._raw[Path(path)] = table
+
+    def _load(self, path: Path) -> AccessTable:
+        table = self._raw.get(path)
+        if table is None:
+            table = _load_blocks(path)
+            self._raw[path] = table
+        return table
+
+    def _blocked(self, path: Path) -> AccessTable:
+        table = self._tables.get(path)
+        if table is None:
+            table = self._load(path).first_blocks(self.n_sats)
+            self._tables[path] = table
+        return table
+
+    # ---------- passes ----------
+
+    def eez_passes(self, eez_name: str) -> AccessTable:
+        """All satellite passes over an EEZ."""
+        return self._blocked(self.eez_file(eez_name))
+
+    def eez_index(self, eez_name: str) -> PassIndex:
+        """Sorted per-satellite pass index of an EEZ, built once."""
+        index = self._indexes.get(eez_name)
+        if index is None:
+            index = PassIndex(self.eez_passes(eez_name))
+            self._indexes[eez_name] = index
+        return index
+
+    def gs_passes(self, station: str) -> AccessTable:
+        """All satellite passes over one ground station."""
+        return self._blocked(self.gs_file(station))
+
+    def all_gs_passes(self) -> Dict[str, AccessTable]:
+        """Station name -> passes, in GS_NAMES order."""
+        return {g: self.gs_passes(g) for g in self.gs_files}
+
+    def downlink_index(self) -> DownlinkIndex:
+        """All ground-station passes merged by start time, built once."""
+        if self._downlinks is None:
+            self._downlinks = DownlinkIndex(self.all_gs_passes())
+        return self._downlinks
+
+    # ---------- ships ----------
+
+    def ship_intervals(self, ship_id: str, eez_name: str) -> List[Dict]:
+        """
+        Map ships to EEZs and CSVs:
+
+          - Ship1 & Ship3 → EEZ_West
+          - Ship2         → EEZ_East
+        """
+        if ship_id in ["Ship1", "Ship3"] and eez_name != "EEZ_West":
+            raise ValueError(f"{ship_id} only defined for EEZ_West")
+
+        if ship_id == "Ship2" and eez_name != "EEZ_East":
+            raise ValueError("Ship2 only defined for EEZ_East")
+
+        if ship_id in self._ships:
+            return self._ships[ship_id]
+
+        if ship_id == "Ship1":
+            table = self._load(self.data_dir / "Access_Ship1_EEZ_West.csv")
+            ints = _single_ship_intervals(table, "Ship1")
+        elif ship_id == "Ship3":
+            table = self._load(self.data_dir / "Access_Ship1_Ship3_EEZ_West.csv")
+            ints = [x for x in _ship1_ship3_intervals(table) if x["ship_id"] == "Ship3"]
+        elif ship_id == "Ship2":
+            table = self._load(self.data_dir / "Access_Ship2_EEZ_East.csv")
+            ints = _single_ship_intervals(table, "Ship2")
+        else:
+            raise ValueError(f"Unknown ship_id: {ship_id}")
+
+        self._ships[ship_id] = ints
+        return ints
@@ -0,0 +1,203 @@
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from access_table import AccessTable
+from outage import CoverageTimeline
+
+# Objectives over the uncovered pieces of the horizon, worst EEZ counts.
+# time_avg_detect_latency_s is the wait averaged over every entry time in
+# the horizon, covered ones counting as zero. It is not the
+# mean_detect_latency_s of revisit.py / outage.py, which averages over
+# uncovered entry times only: that mean can drop when a satellite is
+# removed (a new short gap dilutes a long one), so it cannot bound a
+# search. Removing a satellite can only grow the uncovered set, so max
+# revisit and the time-averaged latency never improve when a satellite is
+# dropped; that makes "keep every undecided satellite" a valid bound. p95
+# revisit has no such property and is optimised greedily only.
+OBJECTIVES = ("max_revisit_s", "p95_revisit_s", "time_avg_detect_latency_s")
+MONOTONE = ("max_revisit_s", "time_avg_detect_latency_s")
+
+# Objective evaluations allowed per K in the branch-and-bound stage.
+DEFAULT_MAX_EVALS = 2000
+
+
+class SubsetObjective:
+    """
+    Coverage objective of a satellite subset across several EEZs.
+
+    Each EEZ keeps one CoverageTimeline; moving between subsets adds or
+    removes only the satellites that differ. Gaps are the uncovered pieces
+    of the full constellation's coverage span, so losing the first or last
+    pass counts as a longer gap rather than a shorter scenario.
+    """
+
+    def __init__(self, tables: Dict[str, AccessTable], metric: str = "max_revisit_s"):
+        if metric not in OBJECTIVES:
+            raise ValueError(f"Unknown objective: {metric}")
+        self.metric = metric
+        self.timelines = {name: CoverageTimeline(t) for name, t in tables.items()}
+        self.n_sats = max((tl.n_sats for tl in self.timelines.values()), default=0)
+        self.horizons = {
+            name: tl.coverage().span or (0.0, 0.0) for name, tl in self.timelines.items()
+        }
+        self.active = set(range(self.n_sats))
+        self.n_evals = 0
+
+    def _activate(self, subset):
+        subset = set(subset)
+        for k in self.active - subset:
+            for tl in self.timelines.values():
+                if k < tl.n_sats:
+                    tl.remove(k)
+        for k in subset - self.active:
+            for tl in self.timelines.values():
+                if k < tl.n_sats:
+                    tl.add(k)
+        self.active = subset
+
+    def eez_metrics(self, subset: Iterable[int]) -> Dict[str, Dict[str, float]]:
+        """All objectives per EEZ for a subset of 0-based satellite blocks."""
+        self._activate(subset)
+        out = {}
+        for name, tl in self.timelines.items():
+            t0, t1 = self.horizons[name]
+            holes = tl.coverage().complement(t0, t1)
+            gaps = holes.stop_s - holes.start_s
+            if len(gaps) == 0:
+                gaps = np.zeros(1)
+            out[name] = {
+                "max_revisit_s": float(gaps.max()),
+                "p95_revisit_s": float(np.percentile(gaps, 95)),
+                # Entry uniform on the horizon waits out the rest of its gap.
+                "time_avg_detect_latency_s": float((gaps ** 2).sum() / 2.0 / (t1 - t0))
+                if t1 > t0 else 0.0,
+            }
+        return out
+
+    def __call__(self, subset: Iterable[int]) -> float:
+        self.n_evals += 1
+        metrics = self.eez_metrics(subset)
+        return max((m[self.metric] for m in metrics.values()), default=0.0)
+
+
+def _greedy_backward(objective: SubsetObjective) -> Dict[int, Tuple[float, frozenset]]:
+    # Drop, one at a time, the satellite whose loss hurts least.
+    keep = set(range(objective.n_sats))
+    best = {len(keep): (objective(keep), frozenset(keep))}
+    while len(keep) > 1:
+        value, drop = min((objective(keep - {k}), k) for k in sorted(keep))
+        keep.discard(drop)
+        best[len(keep)] = (value, frozenset(keep))
+    return best
+
+
+def _greedy_forward(objective: SubsetObjective) -> Dict[int, Tuple[float, frozenset]]:
+    # Add, one at a time, the satellite that helps most.
+    keep = set()
+    best = {}
+    while len(keep) < objective.n_sats:
+        value, add = min(
+            (objective(keep | {k}), k)
+            for k in range(objective.n_sats) if k not in keep
+        )
+        keep.add(add)
+        best[len(keep)] = (value, frozenset(keep))
+    return best
+
+
+def _branch_and_bound(objective: SubsetObjective, k: int, incumbent: float,
+                      order: List[int], max_evals: int):
+    """
+    Best k-subset by depth-first search over which satellites to drop.
+
+    A node's bound is the objective with every undecided satellite kept;
+    with a monotone objective no completion can beat it. Returns
+    (value, subset or None, exact).
+    """
+    n_drop = objective.n_sats - k
+    best_value, best_subset = incumbent, None
+    start_evals = objective.n_evals
+    exhausted = False
+
+    def visit(i: int, dropped: frozenset):
+        nonlocal best_value, best_subset, exhausted
+        if exhausted:
+            return
+        if len(dropped) == n_drop:
+            keep = frozenset(range(objective.n_sats)) - dropped
+            value = objective(keep)
+            if value < best_value:
+                best_value, best_subset = value, keep
+            return
+        if objective.n_sats - i < n_drop - len(dropped):
+            return
+        if objective.n_evals - start_evals >= max_evals:
+            exhausted = True
+            return
+        bound = objective(frozenset(range(objective.n_sats)) - dropped)
+        if bound >= best_value:
+            return
+        sat = order[i]
+        visit(i + 1, dropped | {sat})
+        visit(i + 1, dropped)
+
+    visit(0, frozenset())
+    return best_value, best_subset, not exhausted
+
+
+def select_subsets(tables: Dict[str, AccessTable], metric: str = "max_revisit_s",
+                   ks: Optional[Iterable[int]] = None,
+                   max_evals: int = DEFAULT_MAX_EVALS) -> List[Dict]:
+    """
+    Best K-satellite subset for each K, minimising the worst-EEZ metric.
+
+    Forward and backward greedy passes give an incumbent for every K; for
+    monotone objectives a budgeted branch-and-bound then tries to improve
+    it and reports whether the search finished ("exact"). Rows are sorted
+    by K and flagged "pareto" when no smaller K does as well.
+    """
+    objective = SubsetObjective(tables, metric)
+    n = objective.n_sats
+    ks = sorted(set(range(1, n + 1) if ks is None else ks))
+
+    best = _greedy_backward(objective)
+    for k, cand in _greedy_forward(objective).items():
+        if cand[0] < best[k][0]:
+            best[k] = cand
+
+    exact = {k: False for k in ks}
+    exact[n] = True
+    if metric in MONOTONE:
+        # Try dropping the least useful satellites first.
+        full = frozenset(range(n))
+        damage = {s: objective(full - {s}) for s in range(n)}
+        order = sorted(range(n), key=lambda s: (damage[s], s))
+        for k in ks:
+            if k == n:
+                continue
+            value, subset, done = _branch_and_bound(
+                objective, k, best[k][0], order, max_evals
+            )
+            if subset is not None:
+                best[k] = (value, subset)
+            exact[k] = done
+
+    rows = []
+    running = np.inf
+    for k in ks:
+        value, subset = best[k]
+        row = {
+            "k": k,
+            "objective": metric,
+            "value": value,
+            "satellites": tuple(sorted(s + 1 for s in subset)),
+            "exact": exact[k],
+            "pareto": value < running,
+        }
+        for eez, metrics in objective.eez_metrics(subset).items():
+            for key, v in metrics.items():
+                row[f"{eez}_{key}"] = v
+        running = min(running, value)
+        rows.append(row)
+    return rows
@@ -0,0 +1,245 @@
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from access_table import AccessTable
+from constants import DOWNLINK_RATE_MBPS, ONBOARD_STORAGE_GB
+from intervals import IntervalSet
+
+# Event kinds; at equal times a contact closes before another opens and
+# a product that arrives as a contact opens can go out in it.
+_CONTACT_STOP, _CONTACT_START, _PRODUCT, _NONE = range(4)
+
+_EPS_GB = 1e-9
+
+
+@dataclass
+class StorageBudget:
+    """
+    Onboard data flow per satellite (index = 0-based block id).
+
+    Volumes in GB, times in seconds. Product arrays hold one entry per
+    imaging pass in (satellite, ready time) order; delivered_s is NaN for
+    products that were dropped or are still onboard at the end.
+    """
+
+    capacity_gb: float
+    peak_buffer_gb: np.ndarray
+    final_buffer_gb: np.ndarray
+    dropped: np.ndarray
+    dropped_gb: np.ndarray
+    dump_s: np.ndarray
+    n_dumps: np.ndarray
+    max_backlog_age_s: np.ndarray
+    product_sat: np.ndarray
+    ready_s: np.ndarray
+    accepted: np.ndarray
+    delivered_s: np.ndarray
+    ideal_s: np.ndarray
+
+    @property
+    def n_sats(self) -> int:
+        return len(self.peak_buffer_gb)
+
+    @property
+    def latency_s(self) -> np.ndarray:
+        return self.delivered_s - self.ready_s
+
+    @property
+    def inflation_s(self) -> np.ndarray:
+        """Delivery delay caused by the backlog and by contacts too short to finish."""
+        return self.delivered_s - self.ideal_s
+
+    def rows(self) -> List[Dict]:
+        """One summary dict per satellite (1-based "sat")."""
+        delivered = ~np.isnan(self.delivered_s)
+        rows = []
+        for k in range(self.n_sats):
+            mine = self.product_sat == k
+            done = mine & delivered
+            latency = self.latency_s[done]
+            inflation = self.inflation_s[done]
+            rows.append({
+                "sat": k + 1,
+                "products": int(mine.sum()),
+                "delivered": int(done.sum()),
+                "dropped": int(self.dropped[k]),
+                "dropped_gb": float(self.dropped_gb[k]),
+                "peak_buffer_gb": float(self.peak_buffer_gb[k]),
+                "final_buffer_gb": float(self.final_buffer_gb[k]),
+                "dump_s": float(self.dump_s[k]),
+                "mean_dump_s": float(self.dump_s[k] / self.n_dumps[k]) if self.n_dumps[k] else 0.0,
+                "max_backlog_age_s": float(self.max_backlog_age_s[k]),
+                "mean_delivery_latency_s": float(latency.mean()) if len(latency) else None,
+                "max_delivery_latency_s": float(latency.max()) if len(latency) else None,
+                "mean_latency_inflation_s": float(inflation.mean()) if len(inflation) else None,
+                "max_latency_inflation_s": float(inflation.max()) if len(inflation) else None,
+            })
+        return rows
+
+
+def _contacts(downlinks: Iterable[AccessTable], n_sats: int) -> List[IntervalSet]:
+    # A satellite dumps through one station at a time, so contacts are the
+    # union of its passes over all stations.
+    tables = list(downlinks)
+    out = []
+    for k in range(n_sats):
+        contact = IntervalSet()
+        for table in tables:
+            if k < table.n_blocks:
+                contact = contact | IntervalSet.from_table(table, k)
+        out.append(contact)
+    return out
+
+
+def storage_budget(imaging: Iterable[AccessTable], downlinks: Iterable[AccessTable],
+                   volume_gb: float, capacity_gb: float = ONBOARD_STORAGE_GB,
+                   link_rate_mbps: float = DOWNLINK_RATE_MBPS, delay_s: float = 0.0,
+                   n_sats: Optional[int] = None) -> StorageBudget:
+    """
+    Walk imaging and downlink passes in time order for every satellite.
+
+    Each imaging pass (every table in `imaging`, e.g. one per EEZ) leaves
+    a volume_gb product onboard delay_s after it ends; a product that does
+    not fit in the remaining capacity is dropped. During ground-station
+    contact the buffer drains FIFO at the link rate. All satellites are
+    stepped together, one event column at a time.
+    """
+    if volume_gb <= 0:
+        raise ValueError("volume_gb must be positive")
+    imaging = list(imaging)
+    downlinks = list(downlinks)
+    if n_sats is None:
+        n_sats = max((t.n_blocks for t in imaging + downlinks), default=0)
+    rate = link_rate_mbps / 8000.0
+    contacts = _contacts(downlinks, n_sats)
+
+    # Flat event list, sorted by (satellite, time, kind).
+    ev_sat, ev_t, ev_kind = [], [], []
+    for table in imaging:
+        ev_sat.append(table.block_id)
+        ev_t.append(table.stop_s + delay_s)
+        ev_kind.append(np.full(len(table), _PRODUCT))
+    for k, contact in enumerate(contacts):
+        for times, kind in ((contact.start_s, _CONTACT_START), (contact.stop_s, _CONTACT_STOP)):
+            ev_sat.append(np.full(len(times), k))
+            ev_t.append(times)
+            ev_kind.append(np.full(len(times), kind))
+    ev_sat = np.concatenate(ev_sat).astype(np.int64) if ev_sat else np.zeros(0, np.int64)
+    ev_t = np.concatenate(ev_t).astype(np.float64) if ev_t else np.zeros(0)
+    ev_kind = np.concatenate(ev_kind).astype(np.int64) if ev_kind else np.zeros(0, np.int64)
+    order = np.lexsort((ev_kind, ev_t, ev_sat))
+    ev_sat, ev_t, ev_kind = ev_sat[order], ev_t[order], ev_kind[order]
+
+    # Pad to an (n_sats, width) grid; padding repeats the row's last time.
+    per_sat = np.bincount(ev_sat, minlength=n_sats)
+    width = int(per_sat.max()) if n_sats else 0
+    first = np.cumsum(per_sat) - per_sat
+    col = np.arange(len(ev_sat)) - first[ev_sat]
+    last_t = np.zeros(n_sats)
+    has_events = per_sat > 0
+    last_t[has_events] = ev_t[(first + per_sat - 1)[has_events]]
+    T = np.repeat(last_t[:, None], width, axis=1)
+    K = np.full((n_sats, width), _NONE)
+    T[ev_sat, col] = ev_t
+    K[ev_sat, col] = ev_kind
+
+    buf = np.zeros(n_sats)
+    peak = np.zeros(n_sats)
+    dumped_total = np.zeros(n_sats)
+    in_contact = np.zeros(n_sats, dtype=bool)
+    used = np.zeros(n_sats, dtype=bool)
+    n_dumps = np.zeros(n_sats, dtype=np.int64)
+    dropped = np.zeros(n_sats, dtype=np.int64)
+    dropped_gb = np.zeros(n_sats)
+    t_prev = T[:, 0].copy() if width else np.zeros(n_sats)
+    D = np.zeros((n_sats, width))  # cumulative GB downlinked at T
+    fits = np.zeros((n_sats, width), dtype=bool)
+
+    for j in range(width):
+        t = T[:, j]
+        out = np.minimum(buf, np.where(in_contact, rate * (t - t_prev), 0.0))
+        buf -= out
+        dumped_total += out
+        used |= out > 0
+        D[:, j] = dumped_total
+        kind = K[:, j]
+
+        product = kind == _PRODUCT
+        ok = product & (buf + volume_gb <= capacity_gb + _EPS_GB)
+        buf += np.where(ok, volume_gb, 0.0)
+        fits[:, j] = ok
+        dropped += product & ~ok
+        dropped_gb += np.where(product & ~ok, volume_gb, 0.0)
+        np.maximum(peak, buf, out=peak)
+
+        stop = kind == _CONTACT_STOP
+        n_dumps += stop & used
+        used &= ~stop
+        in_contact = (in_contact & ~stop) | (kind == _CONTACT_START)
+        t_prev = t
+
+    # Per-product bookkeeping: FIFO delivery is the moment the cumulative
+    # downlinked volume reaches the cumulative accepted volume.
+    is_product = ev_kind == _PRODUCT
+    product_sat = ev_sat[is_product]
+    ready_s = ev_t[is_product]
+    accepted = fits[ev_sat, col][is_product]
+    delivered_s = np.full(len(ready_s), np.nan)
+    ideal_s = np.full(len(ready_s), np.nan)
+    backlog_age = np.zeros(n_sats)
+
+    p_first = np.searchsorted(product_sat, np.arange(n_sats + 1))
+    for k in range(n_sats):
+        lo, hi = p_first[k], p_first[k + 1]
+        row_t, row_d = T[k, :per_sat[k]], D[k, :per_sat[k]]
+        acc = accepted[lo:hi]
+        cum = np.cumsum(np.where(acc, volume_gb, 0.0))
+        need = cum[acc]
+
+        c = np.searchsorted(row_d, need - _EPS_GB, side="left")
+        done = c < len(row_d)
+        c = c[done]
+        when = row_t[c - 1] + (need[done] - row_d[c - 1]) / rate
+        idx = np.flatnonzero(acc)[done] + lo
+        delivered_s[idx] = np.minimum(when, row_t[c])
+
+        # Unconstrained delivery: the product alone, in the first contact
+        # still open when it is ready.
+        contact = contacts[k]
+        i = np.searchsorted(contact.stop_s, ready_s[lo:hi], side="right")
+        has = i < len(contact)
+        i = np.minimum(i, max(len(contact) - 1, 0))
+        if len(contact):
+            ideal_s[lo:hi] = np.where(
+                has, np.maximum(ready_s[lo:hi], contact.start_s[i]) + volume_gb / rate, np.nan
+            )
+
+        # Oldest data left onboard when each contact closes.
+        stops = row_t[K[k, :per_sat[k]] == _CONTACT_STOP]
+        d_at = row_d[K[k, :per_sat[k]] == _CONTACT_STOP]
+        if len(stops) and len(need):
+            oldest = np.searchsorted(need, d_at + _EPS_GB, side="right")
+            waiting = oldest < len(need)
+            ready_acc = ready_s[lo:hi][acc]
+            age = np.where(
+                waiting, stops - ready_acc[np.minimum(oldest, len(need) - 1)], 0.0
+            )
+            backlog_age[k] = float(np.maximum(age, 0.0).max())
+
+    return StorageBudget(
+        capacity_gb=capacity_gb,
+        peak_buffer_gb=peak,
+        final_buffer_gb=buf,
+        dropped=dropped,
+        dropped_gb=dropped_gb,
+        dump_s=dumped_total / rate,
+        n_dumps=n_dumps,
+        max_backlog_age_s=backlog_age,
+        product_sat=product_sat,
+        ready_s=ready_s,
+        accepted=accepted,
+        delivered_s=delivered_s,
+        ideal_s=ideal_s,
+    )
@@ -0,0 +1,113 @@
+from typing import Iterable, Optional, Tuple
+
+import numpy as np
+
+from access_table import AccessTable
+from intervals import merge_union
+from parsers import iter_blocked_access
+
+Chunk = Tuple[int, AccessTable]
+
+
+class CoverageUnion:
+    """
+    Running union of access intervals, fed chunk by chunk.
+
+    Memory is bounded by the number of merged coverage intervals (one per
+    revisit gap), not by the number of passes read. A chunk is merged only
+    with the union intervals inside its own time span; the union is kept
+    in a growable buffer, so a chunk that extends the end of the union (a
+    time-ordered block) costs O(chunk), and one reaching back in time (the
+    next block starting over) also shifts the intervals after it.
+    """
+
+    def __init__(self):
+        self._start = np.zeros(64)
+        self._stop = np.zeros(64)
+        self._n = 0
+        self.n_passes = 0
+
+    @property
+    def start_s(self) -> np.ndarray:
+        return self._start[:self._n]
+
+    @property
+    def stop_s(self) -> np.ndarray:
+        return self._stop[:self._n]
+
+    def add(self, start_s, stop_s):
+        self.n_passes += len(start_s)
+        s, e = merge_union(start_s, stop_s)
+        if len(s) == 0:
+            return self
+
+        # Union intervals touching [s[0], e[-1]] are the only ones that can
+        # change: from the first with stop >= s[0] to the last with
+        # start <= e[-1].
+        n = self._n
+        lo = int(np.searchsorted(self._stop[:n], s[0], side="left"))
+        hi = int(np.searchsorted(self._start[:n], e[-1], side="right"))
+        if hi > lo:
+            s, e = merge_union(np.concatenate([self._start[lo:hi], s]),
+                               np.concatenate([self._stop[lo:hi], e]))
+
+        new_n = lo + len(s) + (n - hi)
+        if new_n > len(self._start):
+            size = max(2 * len(self._start), new_n)
+            self._start = np.concatenate([self._start[:n], np.zeros(size - n)])
+            self._stop = np.concatenate([self._stop[:n], np.zeros(size - n)])
+        mid = lo + len(s)
+        if hi < n:
+            self._start[mid:new_n] = self._start[hi:n].copy()
+            self._stop[mid:new_n] = self._stop[hi:n].copy()
+        self._start[lo:mid] = s
+        self._stop[lo:mid] = e
+        self._n = new_n
+        return self
+
+    def update(self, chunks: Iterable[Chunk]):
+        """Fold (block_id, AccessTable) chunks into the union."""
+        for _, chunk in chunks:
+            self.add(chunk.start_s, chunk.stop_s)
+        return self
+
+    def gaps(self) -> np.ndarray:
+        """Positive gaps between consecutive coverage intervals (seconds)."""
+        return self.start_s[1:] - self.stop_s[:-1]
+
+
+def eez_coverage(scenario, eez_name: str, stream: bool = False) -> CoverageUnion:
+    """
+    Coverage union of an EEZ's passes over the scenario's n_sats satellites.
+
+    By default the passes come from scenario.eez_passes(), so the parse
+    cache and the scenario memo apply. stream=True is for exports too
+    large to hold in memory: the CSV is read chunk by chunk on every call.
+    """
+    if stream:
+        return CoverageUnion().update(
+            iter_blocked_access(scenario.eez_file(eez_name), n_blocks=scenario.n_sats)
+        )
+    table = scenario.eez_passes(eez_name)
+    return CoverageUnion().add(table.start_s, table.stop_s)
+
+
+def earliest_start_after(chunks: Iterable[Chunk], t: float,
+                         block_id: Optional[int] = None) -> Optional[dict]:
+    """
+    First pass (as a dict) with start_s >= t, optionally for one block.
+
+    Ties keep the pass seen first in stream order, like min() over the
+    concatenated pass lists.
+    """
+    best = None
+    for b, chunk in chunks:
+        if block_id is not None and b != block_id:
+            continue
+        idx = np.flatnonzero(chunk.start_s >= t)
+        if len(idx) == 0:
+            continue
+        i = idx[np.argmin(chunk.start_s[idx])]
+        if best is None or chunk.start_s[i] < best["start_s"]:
+            best = chunk[i]
+    return best
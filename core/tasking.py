@@ -0,0 +1,201 @@
+import heapq
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, List, NamedTuple, Optional
+
+import numpy as np
+
+from access_table import AccessTable
+
+POLICIES = ("priority", "deadline", "fifo")
+
+
+class Target(NamedTuple):
+    name: str
+    eez: str
+    t_in: float  # imaging window, seconds since SCEN_START
+    t_out: float
+    priority: float = 0.0  # higher is served first under "priority"
+    sats: Optional[FrozenSet[int]] = None  # 0-based blocks allowed to image it
+
+
+def patrol_targets(eez: str, n_sectors: int, t0: float, t1: float,
+                   period_s: float, priority: float = 0.0) -> List[Target]:
+    """One target per sector per revisit period: each sector wants an image every period_s."""
+    out = []
+    for k, start in enumerate(np.arange(t0, t1, period_s).tolist()):
+        stop = min(start + period_s, t1)
+        for s in range(n_sectors):
+            out.append(Target(f"{eez}_S{s + 1}_{k + 1}", eez, start, stop, priority))
+    return out
+
+
+@dataclass
+class TaskingResult:
+    """
+    One imaging slot per target, in input order; unscheduled targets have
+    slot_start_s NaN and sat_block -1.
+    """
+
+    targets: List[Target]
+    dwell_s: float
+    slot_start_s: np.ndarray
+    sat_block: np.ndarray
+
+    @property
+    def scheduled(self) -> np.ndarray:
+        return self.sat_block >= 0
+
+    @property
+    def slot_stop_s(self) -> np.ndarray:
+        return self.slot_start_s + self.dwell_s
+
+    def detect_s(self, processing_delay_s: float = 0.0) -> np.ndarray:
+        """Detection report times: end of the imaging slot plus processing."""
+        return self.slot_stop_s + processing_delay_s
+
+    def by_name(self) -> Dict[str, Dict]:
+        out = {}
+        for i, t in enumerate(self.targets):
+            out[t.name] = {
+                "eez": t.eez,
+                "slot_start_s": float(self.slot_start_s[i]),
+                "sat": int(self.sat_block[i]) + 1 if self.sat_block[i] >= 0 else None,
+            }
+        return out
+
+
+def schedule_imaging(passes: Dict[str, AccessTable], targets: List[Target],
+                     dwell_s: float, policy: str = "priority") -> TaskingResult:
+    """
+    Assign dwell_s imaging slots on the EEZ passes to competing targets.
+
+    A satellite images one target at a time and a slot must fit inside
+    both the target's window and a pass over the target's EEZ (a satellite
+    over two EEZs at once serves both from one timeline). Time is swept
+    with an event heap; whenever a satellite's sensor is free it takes the
+    best ready target of the EEZs in view:
+
+      priority  highest priority, then earliest t_out
+      deadline  earliest t_out, then highest priority
+      fifo      earliest t_in, then highest priority
+
+    Targets that can no longer fit a slot before t_out are dropped; a
+    target with `sats` set is only offered to those satellites.
+    """
+    if policy not in POLICIES:
+        raise ValueError(f"Unknown policy: {policy}")
+    if dwell_s <= 0:
+        raise ValueError("dwell_s must be positive")
+
+    eez_names = sorted(passes)
+    eez_code = {name: e for e, name in enumerate(eez_names)}
+    for t in targets:
+        if t.eez not in eez_code:
+            raise KeyError(f"No passes for EEZ: {t.eez}")
+
+    n = len(targets)
+    t_in = np.array([t.t_in for t in targets], dtype=np.float64)
+    t_out = np.array([t.t_out for t in targets], dtype=np.float64)
+    prio = np.array([t.priority for t in targets], dtype=np.float64)
+    code = np.array([eez_code[t.eez] for t in targets], dtype=np.int64)
+    allowed = [t.sats for t in targets]
+    if policy == "priority":
+        keys = list(zip((-prio).tolist(), t_out.tolist()))
+    elif policy == "deadline":
+        keys = list(zip(t_out.tolist(), (-prio).tolist()))
+    else:
+        keys = list(zip(t_in.tolist(), (-prio).tolist()))
+
+    # Release queue per EEZ, ordered by window start.
+    release = []
+    for e in range(len(eez_names)):
+        idx = np.flatnonzero(code == e)
+        release.append(idx[np.argsort(t_in[idx], kind="stable")].tolist())
+    next_release = [0] * len(eez_names)
+    ready = [[] for _ in eez_names]
+
+    slot_start = np.full(n, np.nan)
+    sat_of = np.full(n, -1, dtype=np.int64)
+    busy_until = {}
+    in_view = {}  # sat -> {eez code: pass stop}
+
+    # Events: (time, kind, sat, eez code, stop). Pass starts come before
+    # sensor checks at the same time so the new pass is already in view.
+    _PASS, _CHECK = 0, 1
+    events = []
+    for name in eez_names:
+        table = passes[name]
+        e = eez_code[name]
+        for k, start, stop in zip(table.block_id.tolist(), table.start_s.tolist(),
+                                  table.stop_s.tolist()):
+            if stop - start >= dwell_s:
+                events.append((start, _PASS, k, e, stop))
+    heapq.heapify(events)
+
+    def release_until(e, now):
+        q, i = release[e], next_release[e]
+        while i < len(q) and t_in[q[i]] <= now:
+            j = q[i]
+            heapq.heappush(ready[e], (*keys[j], j))
+            i += 1
+        next_release[e] = i
+
+    def best_ready(e, now, k):
+        # Best entry of the EEZ's ready heap that satellite k can still fit
+        # a slot for; entries reserved for other satellites are put back.
+        heap = ready[e]
+        skipped = []
+        found = None
+        while heap:
+            j = heap[0][-1]
+            if sat_of[j] >= 0 or t_out[j] < now + dwell_s:
+                heapq.heappop(heap)
+            elif allowed[j] is not None and k not in allowed[j]:
+                skipped.append(heapq.heappop(heap))
+            else:
+                found = heap[0]
+                break
+        for entry in skipped:
+            heapq.heappush(heap, entry)
+        return found
+
+    while events:
+        now, kind, k, e, stop = heapq.heappop(events)
+        view = in_view.setdefault(k, {})
+        if kind == _PASS:
+            view[e] = max(view.get(e, stop), stop)
+        if busy_until.get(k, -np.inf) > now:
+            continue
+
+        for ez in [ez for ez, s in view.items() if s < now + dwell_s]:
+            del view[ez]
+        if not view:
+            continue
+
+        best = None
+        for ez in view:
+            release_until(ez, now)
+            top = best_ready(ez, now, k)
+            if top is not None and (best is None or top < best[0]):
+                best = (top, ez)
+
+        if best is not None:
+            top, ez = best
+            j = top[-1]  # left in the heap; sat_of marks it as taken
+            slot_start[j] = now
+            sat_of[j] = k
+            busy_until[k] = now + dwell_s
+            heapq.heappush(events, (now + dwell_s, _CHECK, k, -1, 0.0))
+        else:
+            # Idle: look again when the next target of an EEZ in view opens.
+            wake = [
+                t_in[release[ez][next_release[ez]]]
+                for ez, s in view.items()
+                if next_release[ez] < len(release[ez])
+                and t_in[release[ez][next_release[ez]]] + dwell_s <= s
+            ]
+            if wake:
+                heapq.heappush(events, (float(min(wake)), _CHECK, k, -1, 0.0))
+
+    return TaskingResult(targets=list(targets), dwell_s=dwell_s,
+                         slot_start_s=slot_start, sat_block=sat_of)
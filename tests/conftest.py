@@ -0,0 +1,33 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# core/ modules import each other flat ("from access_table import ..."),
+# the same way the analysis scripts put core/ on the path.
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "core"))
+
+EXPORT_HEADER = '"Access","Start Time (UTCG)","Stop Time (UTCG)","Duration (sec)"'
+
+
+@pytest.fixture
+def write_export():
+    """
+    Writer of small stacked STK exports: blocks is a list of per-satellite
+    [(start, stop), ...] with times as "D Mon YYYY HH:MM:SS.fff" or, for
+    short, "HH:MM:SS.fff" on 1 Jan 2026.
+    """
+    def utcg(t):
+        return t if " " in t else f"1 Jan 2026 {t}"
+
+    def write(path, blocks):
+        lines = []
+        for rows in blocks:
+            lines.append(EXPORT_HEADER)
+            for i, (start, stop) in enumerate(rows, 1):
+                lines.append(f"{i},{utcg(start)},{utcg(stop)},0.000")
+            lines += ["", "Statistics", '"Min Duration",1,x,x,0', ""]
+        path.write_text("\n".join(lines) + "\n")
+        return path
+
+    return write
@@ -0,0 +1,57 @@
+"""
+.pstore conversion of small hand-written STK exports.
+
+Passes are stored in the order the export lists them, so a block out of
+start order must be rejected whether the disorder falls inside one
+streamed chunk or across two.
+"""
+from functools import partial
+
+import numpy as np
+import pytest
+
+import access_store
+from access_store import AccessStore, convert_to_store
+from parsers import iter_blocked_access
+
+ORDERED = [
+    [("00:00:01.000", "00:00:05.000"), ("00:01:00.000", "00:01:30.500")],
+    [("00:00:02.250", "00:00:03.000")],
+    [],  # trailing satellite without passes
+]
+
+
+def test_ordered_export_round_trips(tmp_path, write_export):
+    store = AccessStore(convert_to_store(write_export(tmp_path / "a.csv", ORDERED)))
+    assert store.n_blocks == 3
+    assert len(store) == 3
+    start_ms, stop_ms = store.block_times(0)
+    assert start_ms.tolist() == [1000, 60000]
+    assert stop_ms.tolist() == [5000, 90500]
+    assert len(store.block(2)) == 0
+
+
+def test_chunks_keep_file_order(tmp_path, write_export):
+    path = write_export(tmp_path / "a.csv", [[("00:01:00.000", "00:01:10.000"),
+                                              ("00:00:01.000", "00:00:05.000")]])
+    [(block_id, chunk)] = list(iter_blocked_access(path))
+    assert block_id == 0
+    assert chunk.start_s.tolist() == [60.0, 1.0]
+
+
+@pytest.mark.parametrize("chunk_size", [100, 1])
+def test_unordered_block_raises(tmp_path, monkeypatch, write_export, chunk_size):
+    monkeypatch.setattr(access_store, "iter_blocked_access",
+                        partial(iter_blocked_access, chunk_size=chunk_size))
+    blocks = [ORDERED[0], [("00:05:00.000", "00:06:00.000"),
+                           ("00:02:00.000", "00:03:00.000")]]
+    path = write_export(tmp_path / "a.csv", blocks)
+    with pytest.raises(ValueError, match="block 1 is not time-ordered"):
+        convert_to_store(path, tmp_path / "a.pstore")
+
+
+def test_store_matches_parsed_windows(tmp_path, write_export):
+    store = AccessStore(convert_to_store(write_export(tmp_path / "a.csv", ORDERED)))
+    rec = store.window(0, 10.0, 70.0)
+    assert rec["start_ms"].tolist() == [60000]
+    assert np.array_equal(store.to_table().block_id, np.array([0, 0, 1]))
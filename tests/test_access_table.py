@@ -0,0 +1,51 @@
+"""AccessTable indexing and concatenation keep the columnar invariants."""
+import numpy as np
+import pytest
+
+from access_table import AccessTable
+
+
+def table(rows, n_blocks=None):
+    block, start, stop = np.array(rows, dtype=float).T
+    return AccessTable(block, start, stop, stop - start, n_blocks=n_blocks)
+
+
+A = table([(0, 10, 20), (0, 50, 60), (1, 5, 15), (2, 30, 40)], n_blocks=4)
+B = table([(1, 5, 8), (0, 0, 3), (3, 70, 80)])
+
+
+def test_add_returns_sorted_table():
+    ab = A + B
+    assert isinstance(ab, AccessTable)
+    assert ab.n_blocks == 4
+    assert list(zip(ab.block_id.tolist(), ab.start_s.tolist(), ab.stop_s.tolist())) == [
+        (0, 0.0, 3.0), (0, 10.0, 20.0), (0, 50.0, 60.0),
+        (1, 5.0, 15.0), (1, 5.0, 8.0),  # equal keys keep operand order
+        (2, 30.0, 40.0), (3, 70.0, 80.0),
+    ]
+    assert len(ab.block(1)) == 2
+
+
+def test_add_rejects_other_types():
+    with pytest.raises(TypeError):
+        A + [{"block_id": 0, "start_s": 0.0, "stop_s": 1.0, "duration_s": 1.0}]
+
+
+def test_int_index_gives_dict():
+    assert A[1] == {"block_id": 0, "start_s": 50.0, "stop_s": 60.0, "duration_s": 10.0}
+    assert A[-1]["block_id"] == 2
+
+
+@pytest.mark.parametrize("sl", [slice(None), slice(1, 3), slice(0, 4, 2), slice(3, 1), slice(-2, None)])
+def test_slice_gives_table(sl):
+    part = A[sl]
+    assert isinstance(part, AccessTable)
+    assert part.n_blocks == A.n_blocks
+    assert list(part) == list(A)[sl]
+    for k in range(A.n_blocks):
+        assert list(part.block(k)) == [r for r in list(A)[sl] if r["block_id"] == k]
+
+
+def test_reversed_slice_rejected():
+    with pytest.raises(ValueError):
+        A[::-1]
@@ -0,0 +1,85 @@
+"""
+Block-index sidecars and the seek-based parse path against a full parse.
+
+Exports include a satellite without passes in the middle and one at the
+end: both must count as blocks, as they do for count_blocks and stores.
+"""
+import os
+
+import numpy as np
+import pytest
+
+from block_index import BlockIndex, get_block_index, index_path_for, load_block, load_window
+from cache import ParseCache, get_default_cache, set_default_cache
+from parsers import _read_blocks, count_blocks, parse_block_access, parse_blocked_access
+
+BLOCKS = [
+    [(f"{h:02d}:00:00.000", f"{h:02d}:10:00.000") for h in range(0, 24, 2)],
+    [],
+    [(f"{h:02d}:30:00.000", f"{h:02d}:45:30.250") for h in range(1, 24, 3)],
+    [],  # trailing satellite without passes
+]
+
+
+@pytest.fixture
+def export(tmp_path, write_export):
+    return write_export(tmp_path / "a.csv", BLOCKS)
+
+
+@pytest.fixture(params=["no-cache", "cache"])
+def parse_cache(request, tmp_path):
+    old = get_default_cache()
+    set_default_cache(ParseCache(tmp_path / "cache") if request.param == "cache" else None)
+    yield request.param
+    set_default_cache(old)
+
+
+def same_table(a, b):
+    return (np.array_equal(a.block_id, b.block_id)
+            and np.array_equal(a.start_s, b.start_s)
+            and np.array_equal(a.stop_s, b.stop_s))
+
+
+def test_index_counts_every_header(export):
+    index = BlockIndex.build(export, stride=2)
+    assert index.n_blocks == count_blocks(export) == 4
+    assert index.n_rows.tolist() == [12, 0, 8, 0]
+
+
+def test_load_block_matches_full_parse(export):
+    full = _read_blocks(export)
+    index = BlockIndex.build(export, stride=3)
+    for k in range(index.n_blocks):
+        assert same_table(load_block(export, k, index), full.first_blocks(4).block(k))
+
+
+@pytest.mark.parametrize("t0, t1", [(0.0, 3600.0), (5000.0, 5400.0), (30000.0, 90000.0),
+                                    (600.0, 600.0), (-10.0, -1.0)])
+def test_load_window_matches_full_parse(export, t0, t1):
+    full = _read_blocks(export)
+    index = BlockIndex.build(export, stride=2)
+    assert same_table(load_window(export, t0, t1, index=index), full.overlapping(t0, t1))
+
+
+def test_parse_path_uses_window_and_block(export, parse_cache):
+    full = _read_blocks(export)
+    if parse_cache == "cache":
+        parse_blocked_access(export, 4)  # warm the cache
+    win = parse_blocked_access(export, 3, 7000.0, 20000.0)
+    assert win.n_blocks == 3
+    assert same_table(win, full.first_blocks(3).overlapping(7000.0, 20000.0))
+    assert same_table(parse_block_access(export, 2), full.block(2))
+    assert len(parse_block_access(export, 3)) == 0
+    # Only the uncached path needs the sidecar.
+    assert index_path_for(export).exists() == (parse_cache == "no-cache")
+
+
+def test_stale_sidecar_is_rebuilt(tmp_path, write_export):
+    path = write_export(tmp_path / "a.csv", BLOCKS)
+    assert get_block_index(path).n_blocks == 4
+    write_export(path, BLOCKS[:2])
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    index = get_block_index(path)
+    assert index.n_blocks == 2
+    assert not index.is_stale(path)
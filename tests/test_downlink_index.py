@@ -0,0 +1,92 @@
+"""
+DownlinkIndex queries against the scripts' min() over concatenated
+ground-station passes.
+
+Both stations draw whole-second pass starts from a short horizon, so the
+same start time shows up at both stations and on several satellites.
+min() keeps the first candidate it meets: Ahmedabad before Sriharikota,
+and within a station the lower satellite, then the earlier pass.
+"""
+import numpy as np
+import pytest
+
+from access_table import AccessTable
+from downlink_index import DownlinkIndex
+
+N_SATS = 5
+STATIONS = ("Ahmedabad", "Sriharikota")
+
+
+def random_table(rng, n_sats=N_SATS, max_passes=5, horizon=150):
+    block_id, start, stop = [], [], []
+    for k in range(n_sats):
+        n = int(rng.integers(0, max_passes + 1))
+        s = np.sort(rng.integers(0, horizon, n)).astype(float)
+        block_id += [k] * n
+        start += s.tolist()
+        stop += (s + rng.integers(1, 12, n)).tolist()
+    start = np.array(start)
+    stop = np.array(stop)
+    return AccessTable(block_id, start, stop, stop - start, n_blocks=n_sats)
+
+
+def delivery_loop(tables, t, sat_block=None, stations=STATIONS):
+    """Scripts: min start_s over the stations' passes (one satellite or all)."""
+    passes = []
+    for name in STATIONS:
+        if name not in stations:
+            continue
+        table = tables[name] if sat_block is None else tables[name].block(sat_block)
+        passes += [dict(p, station=name) for p in table]
+    candidates = [p for p in passes if p["start_s"] >= t]
+    if not candidates:
+        return None
+    p = min(candidates, key=lambda p: p["start_s"])
+    return p["station"], int(p["block_id"]), p["start_s"], p["stop_s"]
+
+
+def as_tuple(dl):
+    return None if dl is None else tuple(dl)
+
+
+@pytest.fixture(params=range(40))
+def tables(request):
+    rng = np.random.default_rng(request.param)
+    return {name: random_table(rng) for name in STATIONS}
+
+
+@pytest.mark.parametrize("stations", [None, ["Ahmedabad"], ["Sriharikota"]])
+def test_earliest_after_matches_delivery_loop(tables, stations):
+    index = DownlinkIndex(tables)
+    wanted = STATIONS if stations is None else stations
+    for t in np.arange(-5.0, 170.0, 2.5).tolist():
+        assert (as_tuple(index.earliest_after(t, stations=stations))
+                == delivery_loop(tables, t, stations=wanted))
+        for k in range(N_SATS):
+            assert (as_tuple(index.earliest_after(t, sat_block=k, stations=stations))
+                    == delivery_loop(tables, t, sat_block=k, stations=wanted))
+
+
+def test_many_matches_single_queries(tables):
+    index = DownlinkIndex(tables)
+    t = np.arange(-5.0, 170.0, 2.5)
+    sats = np.arange(len(t)) % (N_SATS + 1)  # includes one out-of-range block
+    for pos, (ti, k) in zip(index.earliest_after_many(t, sats).tolist(),
+                            zip(t.tolist(), sats.tolist())):
+        dl = index.earliest_after(ti, sat_block=k)
+        if pos < 0:
+            assert dl is None
+        else:
+            assert (dl.start_s, dl.sat_block) == (index.g_start[pos], index.g_block[pos])
+            assert dl.station == STATIONS[index.g_rank[pos]]
+
+
+def test_equal_starts_prefer_station_order_then_lowest_satellite():
+    amd = AccessTable([1, 2], [40.0, 40.0], [45.0, 48.0], [5.0, 8.0], n_blocks=3)
+    sri = AccessTable([0, 2], [40.0, 30.0], [41.0, 35.0], [1.0, 5.0], n_blocks=3)
+    index = DownlinkIndex({"Ahmedabad": amd, "Sriharikota": sri})
+    assert as_tuple(index.earliest_after(31.0)) == ("Ahmedabad", 1, 40.0, 45.0)
+    assert as_tuple(index.earliest_after(31.0, sat_block=2)) == ("Ahmedabad", 2, 40.0, 48.0)
+    assert as_tuple(index.earliest_after(31.0, stations=["Sriharikota"])) == (
+        "Sriharikota", 0, 40.0, 41.0)
+    assert index.earliest_after(0.0, sat_block=3) is None
@@ -0,0 +1,180 @@
+"""
+IntervalSet against a brute-force point-membership oracle.
+
+Random cases use integer endpoints in [0, HORIZON], so every half-integer
+probe lies strictly inside or strictly outside each interval: membership
+there is exact for covered time (where zero-length pieces do not count),
+and each uncovered unit holds exactly one probe.
+"""
+import numpy as np
+import pytest
+
+from intervals import IntervalSet
+
+HORIZON = 40
+N_CASES = 300
+PROBES = np.arange(-1.5, HORIZON + 2.0, 1.0)  # half-integers
+POINTS = np.arange(-2.0, HORIZON + 2.5, 0.5)  # endpoints and half-integers
+
+
+def random_pairs(rng, max_n=8):
+    """Unsorted, possibly overlapping / touching / zero-length intervals."""
+    n = int(rng.integers(0, max_n + 1))
+    start = rng.integers(0, HORIZON + 1, n)
+    length = rng.integers(0, 8, n) * (rng.random(n) > 0.2)  # ~20% zero-length
+    stop = np.minimum(start + length, HORIZON)
+    return start.astype(float), stop.astype(float)
+
+
+def covers(start, stop, t):
+    """Closed-interval membership of each time in t."""
+    t = np.asarray(t, dtype=float)[:, None]
+    return ((start[None, :] <= t) & (t <= stop[None, :])).any(axis=1)
+
+
+def case(seed):
+    rng = np.random.default_rng(seed)
+    a = random_pairs(rng)
+    b = random_pairs(rng)
+    return a, b, IntervalSet(*a), IntervalSet(*b)
+
+
+def assert_normalized(s):
+    assert np.all(s.stop_s >= s.start_s)
+    assert np.all(np.diff(s.start_s) > 0)
+    assert np.all(s.start_s[1:] > s.stop_s[:-1])  # disjoint and not touching
+
+
+@pytest.mark.parametrize("seed", range(N_CASES))
+def test_constructor_normalizes(seed):
+    (a_start, a_stop), _, a, _ = case(seed)
+    assert_normalized(a)
+    # Closed membership, including zero-length intervals and endpoints.
+    assert np.array_equal(a.contains(POINTS), covers(a_start, a_stop, POINTS))
+    # Input order does not matter.
+    order = np.random.default_rng(seed).permutation(len(a_start))
+    assert IntervalSet(a_start[order], a_stop[order]) == a
+
+
+@pytest.mark.parametrize("seed", range(N_CASES))
+def test_union(seed):
+    (a_start, a_stop), (b_start, b_stop), a, b = case(seed)
+    u = a | b
+    assert_normalized(u)
+    expected = covers(a_start, a_stop, POINTS) | covers(b_start, b_stop, POINTS)
+    assert np.array_equal(u.contains(POINTS), expected)
+    assert u == b | a
+
+
+@pytest.mark.parametrize("seed", range(N_CASES))
+def test_intersection(seed):
+    (a_start, a_stop), (b_start, b_stop), a, b = case(seed)
+    i = a & b
+    assert_normalized(i)
+    assert np.all(i.stop_s > i.start_s)  # zero-length pieces dropped
+    expected = covers(a_start, a_stop, PROBES) & covers(b_start, b_stop, PROBES)
+    assert np.array_equal(i.contains(PROBES), expected)
+    assert i.measure() == expected.sum()
+
+
+@pytest.mark.parametrize("seed", range(N_CASES))
+def test_difference(seed):
+    (a_start, a_stop), (b_start, b_stop), a, b = case(seed)
+    d = a - b
+    assert_normalized(d)
+    expected = covers(a_start, a_stop, PROBES) & ~covers(b_start, b_stop, PROBES)
+    assert np.array_equal(d.contains(PROBES), expected)
+    assert d.measure() == expected.sum()
+
+
+@pytest.mark.parametrize("seed", range(N_CASES))
+def test_complement_within_horizon(seed):
+    (a_start, a_stop), _, a, _ = case(seed)
+    rng = np.random.default_rng(seed + 10**6)
+    t0, t1 = sorted(rng.integers(-2, HORIZON + 3, 2).astype(float))
+    c = a.complement(t0, t1)
+    assert_normalized(c)
+    assert np.all(c.stop_s > c.start_s)
+    assert np.all(c.start_s >= t0) and np.all(c.stop_s <= t1)
+    inside = (PROBES > t0) & (PROBES < t1)
+    expected = inside & ~covers(a_start, a_stop, PROBES)
+    assert np.array_equal(c.contains(PROBES) & inside, expected)
+    assert c.measure() == expected.sum()
+
+
+@pytest.mark.parametrize("seed", range(N_CASES))
+def test_first_overlap(seed):
+    _, _, a, _ = case(seed)
+    rng = np.random.default_rng(seed + 2 * 10**6)
+    q0 = rng.integers(-2, HORIZON + 3, 20).astype(float)
+    q1 = q0 + rng.integers(0, 6, 20)
+    got = a.first_overlap(q0, q1)
+    for t0, t1, g in zip(q0, q1, got):
+        hits = np.flatnonzero((a.start_s <= t1) & (a.stop_s >= t0))
+        assert g == (hits[0] if len(hits) else -1)
+
+
+@pytest.mark.parametrize("seed", range(N_CASES))
+def test_gaps(seed):
+    (a_start, a_stop), _, a, _ = case(seed)
+    # Runs of k uncovered points between two covered ones on the
+    # half-second grid are gaps of (k + 1) / 2 seconds.
+    covered = covers(a_start, a_stop, POINTS)
+    expected = []
+    run = None
+    for c in covered:
+        if c:
+            if run:
+                expected.append((run + 1) / 2.0)
+            run = 0
+        elif run is not None:
+            run += 1
+    assert np.array_equal(a.gaps(), expected)
+    assert np.all(a.gaps() > 0)
+
+
+def test_empty_sets():
+    e = IntervalSet()
+    x = IntervalSet([1.0, 5.0], [2.0, 8.0])
+    assert len(e) == 0 and e.span is None and e.measure() == 0.0
+    assert len(e.gaps()) == 0
+    assert (e | x) == x and (x | e) == x
+    assert len(e & x) == 0 and len(x & e) == 0
+    assert len(e - x) == 0 and (x - e) == x
+    assert e.complement(0.0, 10.0) == IntervalSet([0.0], [10.0])
+    assert IntervalSet([4.0], [4.0]).complement(0.0, 10.0) == IntervalSet([0.0], [10.0])
+    assert len(x.complement(3.0, 3.0)) == 0
+    assert e.first_overlap(0.0, 10.0) == -1
+    assert not e.contains(1.0)
+
+
+def test_touching_endpoints_merge():
+    s = IntervalSet([0.0, 2.0, 5.0], [2.0, 4.0, 6.0])
+    assert s == IntervalSet([0.0, 5.0], [4.0, 6.0])
+    assert np.array_equal(s.gaps(), [1.0])
+    # Touching sets share only an instant: no covered time in common.
+    assert len(IntervalSet([0.0], [2.0]) & IntervalSet([2.0], [3.0])) == 0
+    assert IntervalSet([0.0], [2.0]).first_overlap(2.0, 3.0) == 0
+
+
+def test_zero_length_intervals():
+    s = IntervalSet([3.0], [3.0])
+    assert len(s) == 1 and s.measure() == 0.0
+    assert s.contains(3.0) and not s.contains(3.5)
+    assert len(s & IntervalSet([0.0], [10.0])) == 0
+    assert (IntervalSet([0.0], [10.0]) - s) == IntervalSet([0.0], [10.0])
+    # Absorbed by an interval that contains it.
+    assert (s | IntervalSet([1.0], [4.0])) == IntervalSet([1.0], [4.0])
+
+
+def test_unsorted_input():
+    s = IntervalSet([7.0, 0.0, 3.0, 1.0], [9.0, 2.0, 4.0, 1.5])
+    assert s == IntervalSet([0.0, 3.0, 7.0], [2.0, 4.0, 9.0])
+    assert np.array_equal(s.gaps(), [1.0, 3.0])
+
+
+def test_invalid_input():
+    with pytest.raises(ValueError):
+        IntervalSet([2.0], [1.0])
+    with pytest.raises(ValueError):
+        IntervalSet([1.0, 2.0], [3.0])
@@ -0,0 +1,79 @@
+"""
+Batch UTCG decoding against the per-row strptime conversion.
+
+_to_seconds_batch promises values bit-identical to _to_seconds, so every
+comparison here is exact: short and full-width fractions, single- and
+two-digit days, several months and years, padding, and columns that
+break the fixed "HH:MM:SS.fff" layout and take the fallback path.
+"""
+import numpy as np
+import pytest
+
+from parsers import _decode_rows, _to_microseconds_batch, _to_seconds, _to_seconds_batch
+
+MONTHS = ["Jan", "Feb", "Mar", "Apr", "May", "Jun",
+          "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+DAYS_IN = [31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31]
+
+
+def random_utcg(rng, n):
+    out = []
+    for _ in range(n):
+        m = int(rng.integers(0, 12))
+        year = int(rng.choice([2025, 2026, 2027]))
+        day = int(rng.integers(1, DAYS_IN[m] + 1))
+        digits = int(rng.integers(1, 7))
+        frac = "".join(str(d) for d in rng.integers(0, 10, digits))
+        h, mi, s = rng.integers(0, 24), rng.integers(0, 60), rng.integers(0, 60)
+        out.append(f"{day} {MONTHS[m]} {year} {h:02d}:{mi:02d}:{s:02d}.{frac}")
+    return out
+
+
+def assert_bit_identical(t_strs):
+    expect = np.array([_to_seconds(t) for t in t_strs], dtype=np.float64)
+    got = _to_seconds_batch(t_strs)
+    assert got.dtype == np.float64
+    assert np.array_equal(got.view(np.int64), expect.view(np.int64))
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_random_columns_match_strptime(seed):
+    assert_bit_identical(random_utcg(np.random.default_rng(seed), 200))
+
+
+@pytest.mark.parametrize("t_strs", [
+    ["1 Jan 2026 00:00:00.000"],
+    ["1 Jan 2026 08:42:10.037", "1 Jan 2026 08:42:10.5", "1 Jan 2026 08:42:10.05"],
+    ["1 Jan 2026 23:59:59.999999", "2 Jan 2026 00:00:00.000001"],
+    ["9 Jan 2026 12:00:00.1", "10 Jan 2026 12:00:00.1", "31 Dec 2025 23:59:59.9"],
+    ["28 Feb 2026 06:00:00.000", "1 Mar 2026 06:00:00.000", "1 Jan 2027 00:00:00.000"],
+    ["  1 Jan 2026 00:43:03.955 ", "1 Jan 2026 00:52:40.751\t"],
+])
+def test_edge_columns_match_strptime(t_strs):
+    assert_bit_identical(t_strs)
+
+
+@pytest.mark.parametrize("t_strs", [
+    ["1 Jan 2026 8:42:10.037"],  # one-digit hour: not fixed width
+    ["1 Jan 2026 08:42:10.037", "1 Jan 2026 8:42:10.037"],
+])
+def test_fallback_columns_match_strptime(t_strs):
+    assert_bit_identical(t_strs)
+
+
+def test_microseconds_are_exact_integers():
+    t_strs = ["1 Jan 2026 00:00:00.000001", "3 Jan 2026 01:02:03.4", "1 Jan 2026 00:00:00.0"]
+    got = _to_microseconds_batch(t_strs)
+    assert got.tolist() == [1, (2 * 86400 + 3723) * 10**6 + 400000, 0]
+
+
+def test_empty_column():
+    assert len(_to_seconds_batch([])) == 0
+
+
+def test_decode_rows_durations():
+    rows = [["1", "1 Jan 2026 00:43:03.955", "1 Jan 2026 00:52:40.751", "576.796"]]
+    start, stop, dur = _decode_rows(rows)
+    assert start[0] == _to_seconds(rows[0][1])
+    assert stop[0] == _to_seconds(rows[0][2])
+    assert dur[0] == 576.796
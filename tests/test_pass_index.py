@@ -0,0 +1,104 @@
+"""
+PassIndex queries against the per-satellite loops they replaced.
+
+Pass times are whole seconds drawn from a short horizon, so equal starts
+across satellites are common; the loops keep the lowest satellite on a
+tie through their strict "<", and the index must pick the same one.
+"""
+import numpy as np
+import pytest
+
+from access_table import AccessTable
+from pass_index import PassIndex
+
+N_SATS = 7
+
+
+def random_table(rng, n_sats=N_SATS, max_passes=6, horizon=200):
+    block_id, start, stop = [], [], []
+    for k in range(n_sats):
+        n = int(rng.integers(0, max_passes + 1))
+        s = np.sort(rng.integers(0, horizon, n)).astype(float)
+        block_id += [k] * n
+        start += s.tolist()
+        stop += (s + rng.integers(0, 25, n)).tolist()
+    start = np.array(start)
+    stop = np.array(stop)
+    return AccessTable(block_id, start, stop, stop - start, n_blocks=n_sats)
+
+
+def latency_loop(table, t_in, t_out):
+    """Latency scripts: earliest pass start of any satellite inside the window."""
+    best_sat, best_t = None, None
+    for k in range(table.n_blocks):
+        starts = [p["start_s"] for p in table.block(k) if t_in <= p["start_s"] <= t_out]
+        if not starts:
+            continue
+        start = min(starts)
+        if best_t is None or start < best_t:
+            best_sat, best_t = k, start
+    return best_sat, best_t
+
+
+def detect_loop(table, t_in, t_out, sats=None):
+    """Phase 4 detection: first overlapping pass per sat, soonest imaging wins."""
+    best_sat, best_start, best_t = None, None, None
+    for k in range(table.n_blocks) if sats is None else sats:
+        passes = [p for p in table.block(k) if p["start_s"] <= t_out and p["stop_s"] >= t_in]
+        if not passes:
+            continue
+        first_pass = min(passes, key=lambda p: p["start_s"])
+        t_detect = max(first_pass["start_s"], t_in)
+        if best_t is None or t_detect < best_t:
+            best_sat, best_start, best_t = k, first_pass["start_s"], t_detect
+    return best_sat, best_start
+
+
+def as_pair(p):
+    return (None, None) if p is None else (p.sat_block, p.start_s)
+
+
+def windows(rng, n=60, horizon=220):
+    t_in = rng.integers(-10, horizon, n).astype(float)
+    return zip(t_in.tolist(), (t_in + rng.integers(0, 60, n)).tolist())
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_earliest_start_in_matches_latency_loop(seed):
+    rng = np.random.default_rng(seed)
+    table = random_table(rng)
+    index = PassIndex(table)
+    for t_in, t_out in windows(rng):
+        assert as_pair(index.earliest_start_in(t_in, t_out)) == latency_loop(table, t_in, t_out)
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_earliest_overlap_matches_detect_loop(seed):
+    rng = np.random.default_rng(seed)
+    table = random_table(rng)
+    index = PassIndex(table)
+    tracking = range(0, N_SATS, 3)
+    for t_in, t_out in windows(rng):
+        assert as_pair(index.earliest_overlap(t_in, t_out)) == detect_loop(table, t_in, t_out)
+        assert (as_pair(index.earliest_overlap(t_in, t_out, sats=tracking))
+                == detect_loop(table, t_in, t_out, sats=tracking))
+
+
+def test_equal_starts_go_to_lowest_satellite():
+    table = AccessTable([0, 1, 1, 2], [50.0, 30.0, 80.0, 30.0], [60.0, 40.0, 90.0, 45.0],
+                        [10.0, 10.0, 10.0, 15.0], n_blocks=3)
+    index = PassIndex(table)
+    assert as_pair(index.earliest_start_in(20.0, 100.0)) == (1, 30.0)
+    # Both in progress at t_in=35: imaging starts at t_in for either.
+    assert as_pair(index.earliest_overlap(35.0, 100.0)) == (1, 30.0)
+    assert as_pair(index.earliest_overlap(35.0, 100.0, sats=[2, 0])) == (2, 30.0)
+
+
+def test_many_matches_single_queries():
+    rng = np.random.default_rng(3)
+    index = PassIndex(random_table(rng))
+    t_in, t_out = map(np.array, zip(*windows(rng)))
+    pos = index.earliest_start_in_many(t_in, t_out)
+    for i, a, b in zip(pos.tolist(), t_in.tolist(), t_out.tolist()):
+        expect = (None, None) if i < 0 else (index.g_block[i], index.g_start[i])
+        assert as_pair(index.earliest_start_in(a, b)) == expect
@@ -0,0 +1,51 @@
+"""
+Detection-latency distribution against a fine grid of entry times, and
+the rolling-window max against numpy's sliding windows.
+
+Entries are uniform over the horizon: covered entries wait 0, uncovered
+ones wait for the next coverage start, and entries after the last pass
+are never detected.
+"""
+import numpy as np
+import pytest
+
+from revisit import _sliding_max, detection_latency_distribution
+
+START = np.array([100.0, 400.0, 700.0])
+STOP = np.array([150.0, 420.0, 760.0])
+
+
+def grid_latency(t0, t1, n=200_000):
+    t = t0 + (np.arange(n) + 0.5) * (t1 - t0) / n
+    i = np.searchsorted(STOP, t, side="left")
+    nxt = np.append(START, np.inf)[i]
+    return np.where(nxt <= t, 0.0, nxt - t)
+
+
+@pytest.mark.parametrize("t0, t1", [(0.0, 1000.0), (100.0, 760.0), (300.0, 900.0)])
+def test_distribution_matches_grid(t0, t1):
+    dist = detection_latency_distribution(START, STOP, t0, t1)
+    lat = grid_latency(t0, t1)
+    detected = np.isfinite(lat)
+    assert dist.p_never == pytest.approx(np.mean(~detected), abs=1e-4)
+    assert dist.mean_s == pytest.approx(lat[detected].mean(), rel=1e-4)
+    for x in (0.0, 50.0, 120.0, 250.0):
+        assert float(dist.sf(x)) == pytest.approx(np.mean(lat > x), abs=1e-4)
+
+
+def test_scenario_horizon_counts_lead_in_and_tail():
+    span = detection_latency_distribution(START, STOP)
+    full = detection_latency_distribution(START, STOP, 0.0, 1000.0)
+    assert span.horizon_s == pytest.approx(660.0)
+    assert full.horizon_s == pytest.approx(1000.0)
+    assert full.p_never == pytest.approx(0.24)
+    assert float(full.sf(60.0)) > float(span.sf(60.0))
+
+
+@pytest.mark.parametrize("seed", range(50))
+def test_sliding_max_matches_window_view(seed):
+    rng = np.random.default_rng(seed)
+    x = rng.integers(0, 50, int(rng.integers(1, 60))).astype(float)
+    for k in range(1, len(x) + 1):
+        expect = np.lib.stride_tricks.sliding_window_view(x, k).max(axis=1)
+        assert np.array_equal(_sliding_max(x, k), expect)
@@ -0,0 +1,57 @@
+"""
+CoverageUnion fed chunk by chunk against one merge of all intervals.
+
+Chunks arrive the way iter_blocked_access yields them: block by block,
+each block in time order, so every new block reaches back into the union
+built so far.
+"""
+import numpy as np
+import pytest
+
+from intervals import merge_union
+from streaming import CoverageUnion
+
+
+def random_blocks(rng, n_blocks=5, max_passes=12, horizon=500):
+    blocks = []
+    for _ in range(n_blocks):
+        n = int(rng.integers(0, max_passes + 1))
+        start = np.sort(rng.integers(0, horizon, n)).astype(float)
+        stop = start + rng.integers(0, 30, n)
+        blocks.append((start, stop))
+    return blocks
+
+
+@pytest.mark.parametrize("seed", range(200))
+def test_chunked_union_matches_single_merge(seed):
+    rng = np.random.default_rng(seed)
+    blocks = random_blocks(rng)
+    chunk = int(rng.integers(1, 5))
+
+    union = CoverageUnion()
+    for start, stop in blocks:
+        for lo in range(0, len(start), chunk):
+            union.add(start[lo:lo + chunk], stop[lo:lo + chunk])
+
+    start = np.concatenate([b[0] for b in blocks])
+    stop = np.concatenate([b[1] for b in blocks])
+    exp_start, exp_stop = merge_union(start, stop)
+    assert np.array_equal(union.start_s, exp_start)
+    assert np.array_equal(union.stop_s, exp_stop)
+    assert union.n_passes == len(start)
+
+
+def test_touching_chunks_merge():
+    union = CoverageUnion().add([0.0], [10.0]).add([10.0], [20.0]).add([30.0], [40.0])
+    assert union.start_s.tolist() == [0.0, 30.0]
+    assert union.stop_s.tolist() == [20.0, 40.0]
+    assert union.gaps().tolist() == [10.0]
+
+
+def test_chunk_bridging_union_intervals():
+    union = CoverageUnion()
+    for t in range(0, 100, 10):
+        union.add([float(t)], [t + 2.0])
+    union.add([5.0, 41.0], [35.0, 45.0])
+    assert union.start_s.tolist() == [0.0, 5.0, 40.0, 50.0, 60.0, 70.0, 80.0, 90.0]
+    assert union.stop_s.tolist() == [2.0, 35.0, 45.0, 52.0, 62.0, 72.0, 82.0, 92.0]